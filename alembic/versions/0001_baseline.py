@@ -0,0 +1,81 @@
+"""baseline: tables created by init_db (create_all) before migrations were introduced
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("public_id", sa.String(36)),
+        sa.Column("email", sa.String(255)),
+        sa.Column("name", sa.String(255)),
+        sa.Column("nickname", sa.String(255)),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_user_id", "user", ["id"])
+    op.create_index("ix_user_public_id", "user", ["public_id"], unique=True)
+    op.create_index("ix_user_email", "user", ["email"], unique=True)
+
+    op.create_table(
+        "destination",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(100)),
+        sa.Column("country", sa.String(100)),
+        sa.Column("description", sa.String(255)),
+        sa.Column("latitude", sa.Float()),
+        sa.Column("longitude", sa.Float()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+    )
+    for column in ("id", "name", "country", "description", "latitude", "longitude"):
+        op.create_index(f"ix_destination_{column}", "destination", [column])
+
+    op.create_table(
+        "tag",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(100)),
+        sa.Column("label", sa.String(100)),
+    )
+    for column in ("id", "name", "label"):
+        op.create_index(f"ix_tag_{column}", "tag", [column])
+
+    op.create_table(
+        "destination_tag",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("destination_id", sa.Integer(), sa.ForeignKey("destination.id")),
+        sa.Column("tag_id", sa.Integer(), sa.ForeignKey("tag.id")),
+        sa.Column("score", sa.Integer()),
+    )
+    op.create_index("ix_destination_tag_id", "destination_tag", ["id"])
+
+    for table in ("survey_call_count", "plan_call_count"):
+        op.create_table(
+            table,
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("count", sa.Integer()),
+        )
+        op.create_index(f"ix_{table}_id", table, ["id"])
+
+
+def downgrade() -> None:
+    for table in ("plan_call_count", "survey_call_count", "destination_tag", "tag", "destination", "user"):
+        op.drop_table(table)
@@ -0,0 +1,56 @@
+"""plan_cache, catalog_version tables and user.password
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:10:00
+
+init_db(create_all) 로 이미 만들어진 테이블은 건너뜁니다.
+(create_all 은 기존 테이블에 컬럼을 추가하지 않으므로 user.password 는 여기서 추가)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if "plan_cache" not in tables:
+        op.create_table(
+            "plan_cache",
+            sa.Column("key", sa.String(64), primary_key=True),
+            sa.Column("destination", sa.String(255)),
+            sa.Column("schedule", sa.String(255)),
+            sa.Column("payload", sa.LargeBinary(length=2 ** 24)),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("expires_at", sa.DateTime()),
+        )
+        op.create_index("ix_plan_cache_expires_at", "plan_cache", ["expires_at"])
+
+    if "catalog_version" not in tables:
+        op.create_table(
+            "catalog_version",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("version", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+
+    if "password" not in {column["name"] for column in inspector.get_columns("user")}:
+        with op.batch_alter_table("user") as batch:
+            batch.add_column(sa.Column("password", sa.String(255), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("user") as batch:
+        batch.drop_column("password")
+    op.drop_table("catalog_version")
+    op.drop_table("plan_cache")
@@ -0,0 +1,72 @@
+"""recommendation query indexes: covering (tag_id, destination_id, score), unique (destination_id, tag_id), drop unused
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:20:00
+
+- destination_tag: 추천 쿼리의 WHERE tag_id IN (...) 를 인덱스만으로 처리하는 커버링 인덱스와
+  적재 upsert 키인 (destination_id, tag_id) 유니크 인덱스 추가
+  (유니크 인덱스를 만들기 전에 같은 쌍의 중복 행은 id 가 가장 큰 행만 남깁니다)
+- PK 와 중복되는 id 인덱스, 조회 조건으로 쓰이지 않는 destination 의 country / description /
+  latitude / longitude, tag.label 인덱스 삭제 (위치 검색은 메모리 격자 인덱스 사용)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DROPPED_INDEXES = [
+    ("destination", "ix_destination_id", ["id"]),
+    ("destination", "ix_destination_country", ["country"]),
+    ("destination", "ix_destination_description", ["description"]),
+    ("destination", "ix_destination_latitude", ["latitude"]),
+    ("destination", "ix_destination_longitude", ["longitude"]),
+    ("tag", "ix_tag_id", ["id"]),
+    ("tag", "ix_tag_label", ["label"]),
+    ("destination_tag", "ix_destination_tag_id", ["id"]),
+]
+
+
+def upgrade() -> None:
+    # MySQL 은 같은 테이블을 서브쿼리에서 바로 참조할 수 없어 파생 테이블로 한 번 감쌉니다.
+    op.execute(
+        """
+        DELETE FROM destination_tag
+        WHERE id NOT IN (
+            SELECT keep_id FROM (
+                SELECT MAX(id) AS keep_id FROM destination_tag GROUP BY destination_id, tag_id
+            ) AS keep
+        )
+        """
+    )
+    inspector = sa.inspect(op.get_bind())
+    existing = {
+        table: {index["name"] for index in inspector.get_indexes(table)}
+        for table in {table for table, _, _ in DROPPED_INDEXES}
+    }
+    # 현재 모델로 create_all 된 DB 에는 새 인덱스가 이미 있을 수 있음
+    if "uq_destination_tag_destination_id_tag_id" not in existing["destination_tag"]:
+        op.create_index(
+            "uq_destination_tag_destination_id_tag_id", "destination_tag", ["destination_id", "tag_id"], unique=True
+        )
+    if "ix_destination_tag_tag_id_destination_id_score" not in existing["destination_tag"]:
+        op.create_index(
+            "ix_destination_tag_tag_id_destination_id_score", "destination_tag", ["tag_id", "destination_id", "score"]
+        )
+    for table, name, _ in DROPPED_INDEXES:
+        if name in existing[table]:
+            op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    for table, name, columns in DROPPED_INDEXES:
+        op.create_index(name, table, columns)
+    op.drop_index("ix_destination_tag_tag_id_destination_id_score", table_name="destination_tag")
+    op.drop_index("uq_destination_tag_destination_id_tag_id", table_name="destination_tag")
@@ -0,0 +1,68 @@
+"""reset destination.deleted_at written by the old default
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 14:00:00
+
+예전 모델은 destination.deleted_at 에 default=datetime.now 를 두어 ORM 으로 만든 모든 여행지가
+생성 시각에 삭제된 것으로 기록되어 있습니다. 추천은 deleted_at IS NULL 인 여행지만 쓰므로
+deleted_at 이 created_at 과 1초 이내인 행(= 생성과 동시에 기본값으로 채워진 행)을 NULL 로 되돌립니다.
+(MySQL DATETIME 은 초 단위라 두 값이 같거나 1초 차이로 저장됨)
+
+적재 CLI(app.db.ingest)로 처음부터 삭제 상태로 들어온 행도 같은 조건에 걸리므로,
+그런 행이 있었다면 마이그레이션 후 같은 파일로 적재를 다시 실행하면 삭제 상태가 복원됩니다.
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFAULT_WRITE_TOLERANCE = timedelta(seconds=1)
+BATCH_SIZE = 500
+
+destination = sa.table(
+    "destination",
+    sa.column("id", sa.Integer),
+    sa.column("created_at", sa.DateTime),
+    sa.column("deleted_at", sa.DateTime),
+)
+catalog_version = sa.table(
+    "catalog_version",
+    sa.column("id", sa.Integer),
+    sa.column("version", sa.Integer),
+    sa.column("updated_at", sa.DateTime),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(destination.c.id, destination.c.created_at, destination.c.deleted_at)
+        .where(destination.c.deleted_at.is_not(None), destination.c.created_at.is_not(None))
+    ).all()
+    ids = [row.id for row in rows if abs(row.deleted_at - row.created_at) <= DEFAULT_WRITE_TOLERANCE]
+    for i in range(0, len(ids), BATCH_SIZE):
+        bind.execute(
+            destination.update().where(destination.c.id.in_(ids[i:i + BATCH_SIZE])).values(deleted_at=None)
+        )
+    if ids:
+        # 이미 떠 있는 다른 워커도 점수 행렬 / 설문 조회 테이블을 다시 읽도록 알림
+        bind.execute(
+            catalog_version.update()
+            .where(catalog_version.c.id == 1)
+            .values(version=catalog_version.c.version + 1, updated_at=datetime.now())
+        )
+    print(f"Reset deleted_at on {len(ids)} destination rows")
+
+
+def downgrade() -> None:
+    # 어떤 행이 기본값으로 채워져 있었는지는 남기지 않으므로 되돌리지 않음
+    pass
@@ -0,0 +1,130 @@
+import json
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.orm import Session
+from app.core.auth import auth_cache_stats, require_admin_token
+from app.core.concurrency import concurrency_stats
+from app.core.config import settings
+from app.core.plan_cache import plan_cache
+from app.core.profiling import request_profiler
+from app.core.rate_limit import rate_limit_stats
+from app.core.survey_model import BUILTIN_VERSION, QUESTION_TAG_MAP, QUESTION_WEIGHTS, survey_model
+from app.db.session import get_db, get_pool_status
+from app.models.survey import SurveyModel
+from app.schemas.admin import ProfilingSettings, SurveyModelActivate, SurveyModelConfig
+
+# 모든 관리자 API 는 X-Admin-Token 헤더가 필요합니다.
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+def _profiling_status() -> dict:
+    return {
+        "sample_rate": request_profiler.sample_rate,
+        "signed_header_enabled": bool(settings.PROFILING_SECRET),
+        "profiles": [session.summary() for session in reversed(request_profiler.profiles)],
+    }
+
+@router.get("/profiling")
+def get_profiling():
+    """현재 샘플링 비율과 보관 중인 프로파일 목록 (최신순)"""
+    return _profiling_status()
+
+@router.put("/profiling")
+def update_profiling(body: ProfilingSettings):
+    """샘플링 비율 변경 (이 워커 프로세스에만 적용)"""
+    request_profiler.sample_rate = body.sample_rate
+    return _profiling_status()
+
+@router.get("/profiling/{profile_id}")
+def download_profile(profile_id: str, format: str = "speedscope"):
+    """
+    프로파일 다운로드
+    - format=speedscope → https://www.speedscope.app 에서 열기
+    - format=pstats     → python -m pstats <파일> / snakeviz
+    """
+    session = request_profiler.get(profile_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "speedscope":
+        return JSONResponse(
+            session.to_speedscope(),
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.speedscope.json"'},
+        )
+    if format == "pstats":
+        return Response(
+            session.to_pstats(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.pstats"'},
+        )
+    raise HTTPException(status_code=400, detail="format must be speedscope or pstats")
+
+@router.get("/db/pool")
+def get_db_pool():
+    """동기/비동기 엔진의 커넥션 풀 사용량과 checkout 대기 시간 (이 워커 프로세스 기준)"""
+    return get_pool_status()
+
+@router.get("/concurrency")
+def get_concurrency():
+    """라우트 그룹별 현재 동시 처리 제한 / 처리 중 / 거절 수 (이 워커 프로세스 기준)"""
+    return concurrency_stats()
+
+@router.get("/rate-limits")
+def get_rate_limits():
+    """라우트별 요청 한도 설정과 통과 / 429 거절 수 (이 워커 프로세스 기준)"""
+    return rate_limit_stats()
+
+@router.get("/auth-cache")
+def get_auth_cache_stats():
+    """토큰 검증 / 사용자 조회 캐시 적중률과 크기 (이 워커 프로세스 기준)"""
+    return auth_cache_stats()
+
+@router.get("/plan-cache")
+def get_plan_cache_stats():
+    """여행 계획 캐시 적중률 / 메모리 항목 수 / 진행 중인 생성 수 (이 워커 프로세스 기준)"""
+    return plan_cache.stats()
+
+def _survey_model_status(db: Session) -> dict:
+    return {
+        # 이 워커가 사용 중인 버전 (다른 워커는 CATALOG_POLL_SECONDS 안에 반영)
+        "serving_version": survey_model.current.version,
+        "active_version": survey_model.active_version(db),
+        "versions": survey_model.versions(db),
+    }
+
+@router.get("/survey-model")
+def get_survey_model(db: Session = Depends(get_db)):
+    """설문 채점 모델 버전 목록 (최신순)"""
+    return _survey_model_status(db)
+
+@router.get("/survey-model/{version}")
+def get_survey_model_version(version: int, db: Session = Depends(get_db)):
+    """버전 하나의 설정 (0 은 기본 모델)"""
+    if version == BUILTIN_VERSION:
+        return {"version": version, "tag_map": QUESTION_TAG_MAP, "weights": QUESTION_WEIGHTS}
+    row = db.get(SurveyModel, version)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Survey model version not found")
+    return {
+        "version": row.id,
+        "description": row.description,
+        "active": row.active,
+        "tag_map": json.loads(row.tag_map),
+        "weights": json.loads(row.weights),
+    }
+
+@router.post("/survey-model", status_code=201)
+def publish_survey_model(body: SurveyModelConfig, db: Session = Depends(get_db)):
+    """새 버전 저장 (activate=true 면 바로 활성화, 재시작 없이 적용)"""
+    try:
+        version = survey_model.publish(db, body.tag_map, body.weights, body.description, body.activate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"version": version, **_survey_model_status(db)}
+
+@router.put("/survey-model/active")
+def activate_survey_model(body: SurveyModelActivate, db: Session = Depends(get_db)):
+    """저장된 버전 활성화 (이전 버전으로 되돌릴 때도 사용)"""
+    try:
+        survey_model.activate(db, body.version)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return _survey_model_status(db)
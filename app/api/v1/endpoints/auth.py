@@ -1,43 +1,45 @@
-from fastapi import APIRouter, HTTPException, Request, Body, Response
+from fastapi import APIRouter, HTTPException, Body, Response, Depends
 from jose import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
-import os
+from app.core.auth import SECRET_KEY, ALGORITHM, get_token_payload, get_current_user, soft_delete_user
+from app.core.oauth import verify_google_id_token
+from app.db.session import get_async_db
+from app.models.user import User
 
-SECRET_KEY = os.getenv("SECRET_KEY", "default_secret_key")
 router = APIRouter()
 
 @router.post("/google/decode")
-def google_decode_credential(
+async def google_decode_credential(
     response: Response,
     credential: str = Body(..., embed=True)
 ):
     try:
-        payload = jwt.get_unverified_claims(credential)
+        payload = await verify_google_id_token(credential)
         email = payload.get("email")
         name = payload.get("name")
         if not email or not name:
             raise HTTPException(status_code=400, detail="Invalid credential payload")
         token = create_jwt(email=email, name=name)
         return {"access_token": token}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid credential: {str(e)}")
 
 @router.get("/me")
-def get_me(request: Request):
-    auth_header = request.headers.get("Authorization") or request.headers.get("authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    token = auth_header.split(" ", 1)[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-        email = payload.get("email")
-        name = payload.get("name")
-        if not email or not name:
-            raise HTTPException(status_code=401, detail="Invalid token payload")
-        return {"email": email, "name": name}
-    except Exception as e:
-        print("JWT decode error:", e)
-        raise HTTPException(status_code=401, detail="Invalid token")
+async def get_me(payload: dict = Depends(get_token_payload)):
+    email = payload.get("email")
+    name = payload.get("name")
+    if not email or not name:
+        raise HTTPException(status_code=401, detail="Invalid token payload")
+    return {"email": email, "name": name}
+
+@router.delete("/me", status_code=204)
+async def withdraw(user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    """회원 탈퇴 (soft delete) — 이후 이 사용자의 토큰은 get_current_user 인증에서 401"""
+    await soft_delete_user(db, user)
+    return Response(status_code=204)
 
 def create_jwt(email: str, name: str):
     from datetime import datetime, timedelta
@@ -49,5 +51,5 @@ def create_jwt(email: str, name: str):
         "iat": int(now.timestamp()),
         "exp": int((now + timedelta(hours=24)).timestamp())
     }
-    token = jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+    token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
     return token
\ No newline at end of file
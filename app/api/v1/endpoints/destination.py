@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.recommender import recommendation_engine
+from app.core.warmup import wait_until_ready
+from app.db.session import get_async_db
+from app.schemas.destination import NearbyResult
+
+router = APIRouter()
+
+@router.get("/nearby", response_model=NearbyResult, dependencies=[Depends(wait_until_ready)])
+async def get_nearby_destinations(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius: float = Query(10.0, gt=0, le=settings.GEO_MAX_RADIUS_KM, description="반경 (km)"),
+    k: int = Query(10, ge=1, le=settings.GEO_MAX_RESULTS),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """(lat, lng) 에서 radius km 이내 여행지를 가까운 순으로 최대 k 개"""
+    # 점수 행렬 스냅샷에 함께 만들어진 위경도 격자 인덱스 사용 (로드된 뒤에는 DB 조회 없음)
+    matrix = await db.run_sync(recommendation_engine.get)
+    rows, distances = matrix.geo.nearest(lat, lng, radius, k)
+    return NearbyResult(destinations=[
+        {
+            **matrix.destinations[row],
+            "id": int(matrix.dest_ids[row]),
+            "distance_km": round(float(distance), 3),
+        }
+        for row, distance in zip(rows.tolist(), distances.tolist())
+    ])
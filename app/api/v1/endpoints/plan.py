@@ -1,41 +1,129 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.schemas.plan import PlanRequest
-from app.core.plan import create_travel_plan
-from app.models.plan_call_count import PlanCallCount
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
+from app.schemas.plan import PlanRequest, PlanJobStatus
+from app.core.plan import InvalidPlanResponse, build_plan_prompt, parse_plan_text, reask_plan, stream_travel_plan_text
+from app.core.plan_cache import plan_cache
+from app.core.plan_stream import PlanDayParser
+from app.core.plan_jobs import QueueFull, plan_job_runner
+from app.core.counter import plan_call_counter
+from app.core.config import settings
+from app.core.http_cache import body_etag, cached_json_response
 
 
+import asyncio
 import json
+import orjson
 
 router = APIRouter()
 
 @router.post("/plan")
-def recommend_plan(request: PlanRequest, db: Session = Depends(get_db)):
+async def recommend_plan(request: PlanRequest, refresh: bool = False):
 
+    plan_call_counter.increment()
 
-    call_count = db.query(PlanCallCount).first()
-    if not call_count:
-        call_count = PlanCallCount(count=1)
-        db.add(call_count)
-    else:
-        call_count.count += 1
-    db.commit()
-
+    # Gemini 호출을 비동기로 기다리므로 스레드풀 워커를 점유하지 않습니다.
+    # 같은 (여행지, 일정) 요청은 캐시에서 반환하고, refresh=true 면 새로 생성합니다.
     try:
-        plan_data = create_travel_plan(
+        plan_data = await plan_cache.get_plan(
             destination=request.destination,
-            schedule=request.schedule
+            schedule=request.schedule,
+            bypass=refresh
         )
         return plan_data
 
-    except json.JSONDecodeError:
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="여행 계획 생성 시간이 초과되었습니다.")
+    except InvalidPlanResponse:
         raise HTTPException(status_code=500, detail="API로부터 유효한 JSON 응답을 받지 못했습니다.")
     except Exception as e:
         # 서비스 계층에서 발생한 예외를 여기서 처리합니다.
         raise HTTPException(status_code=500, detail=f"여행 계획 생성 중 오류 발생: {str(e)}")
 
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/plan/stream")
+async def recommend_plan_stream(request: PlanRequest, refresh: bool = False):
+    """
+    여행 계획을 Server-Sent Events 로 스트리밍
+    - event: day   → 완성된 plan[i] 하루치 객체 (완성되는 즉시 전송)
+    - event: reset → 지금까지 보낸 day 를 버릴 것 (응답이 검증에 실패해 다시 요청함)
+                     이후 다시 받은 계획의 day 들이 처음부터 다시 전송됩니다.
+    - event: done  → 검증된 전체 여행 계획
+    - event: error → { "detail": ... }
+    """
+    plan_call_counter.increment()
+
+    cached = None if refresh else await plan_cache.lookup(request.destination, request.schedule)
+
+    async def events():
+        if cached is not None:
+            for day in cached.get("plan", []):
+                yield _sse("day", day)
+            yield _sse("done", cached)
+            return
+
+        parser = PlanDayParser()
+        try:
+            async for text in stream_travel_plan_text(request.destination, request.schedule):
+                for day in parser.feed(text):
+                    yield _sse("day", day)
+            # 끝까지 받은 텍스트를 고쳐 읽고, 그래도 쓸 수 없으면 한 번 다시 요청
+            try:
+                plan_data = parse_plan_text(parser.text)
+            except InvalidPlanResponse as e:
+                if not settings.PLAN_REASK_ON_INVALID:
+                    raise
+                # 이미 보낸 day 는 검증되지 않은 응답에서 나온 것이므로 먼저 버리게 함
+                yield _sse("reset", {"detail": "응답이 올바르지 않아 여행 계획을 다시 생성합니다."})
+                prompt = build_plan_prompt(request.destination, request.schedule)
+                plan_data = await reask_plan(prompt, parser.text, e)
+                for day in plan_data["plan"]:
+                    yield _sse("day", day)
+        except asyncio.TimeoutError:
+            yield _sse("error", {"detail": "여행 계획 생성 시간이 초과되었습니다."})
+            return
+        except InvalidPlanResponse:
+            yield _sse("error", {"detail": "API로부터 유효한 JSON 응답을 받지 못했습니다."})
+            return
+        except Exception as e:
+            print(f"Error in recommend_plan_stream: {e}")
+            yield _sse("error", {"detail": f"여행 계획 생성 중 오류 발생: {str(e)}"})
+            return
+
+        await plan_cache.remember(request.destination, request.schedule, plan_data)
+        yield _sse("done", plan_data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.post("/jobs", response_model=PlanJobStatus, status_code=202)
+async def create_plan_job(request: PlanRequest, refresh: bool = False):
+    """여행 계획 생성을 작업 큐에 등록하고 job_id 를 바로 반환"""
+    plan_call_counter.increment()
+    try:
+        job = await plan_job_runner.submit(request.destination, request.schedule, refresh)
+    except QueueFull:
+        raise HTTPException(
+            status_code=429,
+            detail="대기 중인 여행 계획 요청이 너무 많습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "5"},
+        )
+    return PlanJobStatus(job_id=job.id, status=job.status)
+
+@router.get("/jobs/{job_id}", response_model=PlanJobStatus)
+async def get_plan_job(job_id: str):
+    job = await plan_job_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="존재하지 않는 작업입니다.")
+    return PlanJobStatus(job_id=job.id, status=job.status, result=job.result, error=job.error)
+
 @router.get("/create/count")
-def get_plan_create_count(db: Session = Depends(get_db)):
-    call_count = db.query(PlanCallCount).first()
-    return {"count": call_count.count if call_count else 0}
\ No newline at end of file
+async def get_plan_create_count(request: Request, db: AsyncSession = Depends(get_async_db)):
+    body = orjson.dumps({"count": await db.run_sync(plan_call_counter.total)})
+    return cached_json_response(request, body, body_etag(body), settings.COUNT_CACHE_SECONDS)
\ No newline at end of file
@@ -1,34 +1,101 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.survey import build_profile, run_recommendation
-from app.db.session import get_db
-from app.schemas.survey import SurveySubmit, SurveyResult
-from app.models.survey_call_count import SurveyCallCount
+from app.core.config import settings
+from app.core.counter import survey_call_counter
+from app.core.http_cache import body_etag, cached_json_response
+from app.core.recommender import recommendation_engine
+from app.core.survey import build_profile, build_profile_matrix, run_recommendation, serialize_result
+from app.core.survey_model import survey_model
+from app.core.survey_table import recommendation_table
+from app.core.warmup import wait_until_ready
+from app.db.session import get_db, get_async_db
+from app.schemas.survey import SurveyAnswers, SurveySubmit, SurveyResult, SurveyBatchSubmit
 
 router = APIRouter()
 
-@router.post("/submit", response_model=SurveyResult)
-def survey_submit(survey: SurveySubmit, db: Session = Depends(get_db)):
+@router.post("/submit", response_model=SurveyResult, dependencies=[Depends(wait_until_ready)])
+async def survey_submit(survey: SurveySubmit, db: AsyncSession = Depends(get_async_db)):
 
-    # 1) 호출 횟수 증가
-    call_count = db.query(SurveyCallCount).first()
-    if not call_count:
-        call_count = SurveyCallCount(count=1)
-        db.add(call_count)
-    else:
-        call_count.count += 1
-    db.commit()
+    # 1) 호출 횟수 증가 (메모리에 모았다가 백그라운드에서 DB 반영)
+    survey_call_counter.increment()
 
-    # 1) 설문 → profile 생성
-    profile = build_profile(survey.dict())
+    # 2) 미리 계산된 결과가 있으면 DB 조회 없이 그대로 반환 (위치 필터가 있으면 직접 계산)
+    #    채점 모델은 요청 시작 시점의 스냅샷 하나를 끝까지 사용
+    model = survey_model.current
+    answers = survey.answers()
+    near = survey.near.as_tuple() if survey.near is not None else None
+    if near is None:
+        payload = recommendation_table.lookup(answers, model)
+        if payload is not None:
+            return Response(content=payload, media_type="application/json")
 
-    # 2) DB 조회 + 점수 계산 → 추천 리스트
-    recs = run_recommendation(profile, db)
+    # 3) 설문 → profile 생성
+    profile = build_profile(answers, model)
 
-    # 3) 결과 반환
-    return SurveyResult(recommendations=recs)
+    # 4) DB 조회 + 점수 계산 → 추천 리스트 (동기 추천 로직을 비동기 세션 위에서 실행)
+    recs = await db.run_sync(lambda session: run_recommendation(profile, session, near=near))
+
+    # 5) 결과 반환 (response_model 로 다시 검증 / 직렬화하지 않고 orjson bytes 로 바로 응답)
+    return Response(content=serialize_result(recs, model.version), media_type="application/json")
+
+@router.get("/result", response_model=SurveyResult, dependencies=[Depends(wait_until_ready)])
+async def survey_result(request: Request, survey: SurveyAnswers = Depends(), db: AsyncSession = Depends(get_async_db)):
+    """
+    /submit 의 캐시 가능한 GET 버전 (?q1=A&...&q7=D, 위치 필터 없음)
+    - 결과는 응답과 현재 추천 데이터 / 채점 모델로만 정해지므로 ETag + Cache-Control 로 CDN / 브라우저 캐시 허용
+    - If-None-Match 가 같으면 304 (미리 계산된 결과가 있으면 계산 없이 바로)
+    """
+    survey_call_counter.increment()
+
+    model = survey_model.current
+    answers = survey.answers()
+    entry = recommendation_table.lookup_entry(answers, model)
+    if entry is None:
+        profile = build_profile(answers, model)
+        recs = await db.run_sync(lambda session: run_recommendation(profile, session))
+        body = serialize_result(recs, model.version)
+        entry = (body_etag(body), body)
+
+    etag, body = entry
+    return cached_json_response(request, body, etag, settings.SURVEY_RESULT_CACHE_SECONDS)
+
+@router.post("/submit/batch", dependencies=[Depends(wait_until_ready)])
+def survey_submit_batch(batch: SurveyBatchSubmit, db: Session = Depends(get_db)):
+    """
+    여러 설문 응답을 한 번에 채점해 NDJSON 으로 스트리밍
+    각 줄: { "index": i, "recommendations": [...], "model_version": v }
+    """
+    if len(batch.surveys) > settings.SURVEY_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"한 번에 최대 {settings.SURVEY_BATCH_MAX_SIZE}개의 설문만 처리할 수 있습니다."
+        )
+
+    # 점수 행렬은 응답 스트리밍 전에 확보 (스트리밍 중에는 세션이 닫혀 있음)
+    matrix = recommendation_engine.get(db)
+    model = survey_model.current
+    answers_list = [survey.answers() for survey in batch.surveys]
+    chunk_size = matrix.chunk_rows
+
+    def generate():
+        for start in range(0, len(answers_list), chunk_size):
+            chunk = answers_list[start:start + chunk_size]
+            profiles = build_profile_matrix(chunk, matrix.tag_index, model)
+            for offset, recs in enumerate(matrix.top_n_many(profiles, 3, chunk_size)):
+                near = batch.surveys[start + offset].near
+                if near is not None:
+                    # 위치 필터가 있는 설문만 반경 안의 여행지로 다시 계산
+                    recs = matrix.top_n(profiles[offset], 3, matrix.rows_near(near.as_tuple()))
+                line = {"index": start + offset, "recommendations": recs, "model_version": model.version}
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 @router.get("/submit/count")
-def get_survey_submit_count(db: Session = Depends(get_db)):
-    call_count = db.query(SurveyCallCount).first()
-    return {"count": call_count.count if call_count else 0}
\ No newline at end of file
+async def get_survey_submit_count(request: Request, db: AsyncSession = Depends(get_async_db)):
+    body = orjson.dumps({"count": await db.run_sync(survey_call_counter.total)})
+    return cached_json_response(request, body, body_etag(body), settings.COUNT_CACHE_SECONDS)
\ No newline at end of file
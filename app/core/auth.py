@@ -1,25 +1,42 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
 from app.models.user import User
 from app.schemas.user import TokenData
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.password import password_hasher
+import hashlib
+import hmac
+import time
 import os
 
-# 비밀번호 해싱 설정
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 비밀번호 해싱 설정 (work factor 는 BCRYPT_ROUNDS 로 환경별 설정)
+pwd_context = password_hasher.context
 
 # JWT 설정
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# HTTP Bearer 토큰 스키마
-security = HTTPBearer()
+# HTTP Bearer 토큰 스키마 (헤더가 없을 때 403 대신 401 을 주기 위해 직접 처리)
+security = HTTPBearer(auto_error=False)
+
+
+def _token_key(token: str) -> str:
+    """토큰 원문 대신 sha256 digest 를 캐시 키로 사용"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+# 검증이 끝난 JWT payload LRU (토큰의 exp 가 지나면 캐시에서도 만료)
+token_cache = TTLCache(settings.AUTH_TOKEN_CACHE_SIZE, ttl_seconds=300)
+# 이메일 → User 짧은 TTL 캐시 (인증 요청마다 User 조회를 하지 않기 위함)
+user_cache = TTLCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL_SECONDS)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """비밀번호 검증"""
@@ -40,44 +57,114 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[TokenData]:
-    """토큰 검증 및 디코딩"""
+def decode_token(token: str) -> Optional[dict]:
+    """토큰 서명/만료 검증 후 payload 반환 (검증된 토큰은 token_cache 에서 바로 반환)"""
+    key = _token_key(token)
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            return None
-        token_data = TokenData(email=email)
-        return token_data
     except JWTError:
         return None
+    exp = payload.get("exp")
+    token_cache.set(key, payload, ttl=exp - time.time() if isinstance(exp, (int, float)) else None)
+    return payload
+
+def verify_token(token: str) -> Optional[TokenData]:
+    """토큰 검증 및 디코딩"""
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    email: str = payload.get("sub")
+    if email is None:
+        return None
+    token_data = TokenData(email=email)
+    return token_data
+
+def get_token_payload(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+) -> dict:
+    """Authorization: Bearer 토큰을 검증해 payload 반환하는 공통 인증 의존성"""
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    payload = decode_token(credentials.credentials)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """관리자 API 의존성 — X-Admin-Token 이 ADMIN_TOKEN 과 같아야 함 (설정되지 않았으면 404)"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), settings.ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+async def get_current_user(
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
-    """현재 인증된 사용자 조회"""
+    """현재 인증된 사용자 조회 (user_cache 에 있으면 DB 조회 생략, 조회는 비동기 세션)"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
-    token_data = verify_token(credentials.credentials)
-    if token_data is None:
+
+    email = payload.get("sub")
+    if email is None:
         raise credentials_exception
-    
-    user = db.query(User).filter(User.email == token_data.email, User.deleted_at.is_(None)).first()
+
+    user = user_cache.get(email)
+    if user is not None:
+        return user
+
+    result = await db.execute(select(User).where(User.email == email, User.deleted_at.is_(None)))
+    user = result.scalars().first()
     if user is None:
         raise credentials_exception
-    
+
+    # 이후 이 세션의 commit 으로 속성이 만료되지 않도록 분리한 뒤 캐시
+    db.expunge(user)
+    user_cache.set(email, user)
     return user
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    """사용자 인증"""
-    user = db.query(User).filter(User.email == email, User.deleted_at.is_(None)).first()
+async def soft_delete_user(db: AsyncSession, user: User) -> None:
+    """
+    사용자 탈퇴(soft delete) 처리 후 캐시에서도 제거
+    user_cache 는 워커 프로세스마다 따로 있어 이 프로세스의 캐시만 비워지며,
+    다른 워커는 최대 AUTH_USER_CACHE_TTL_SECONDS 동안 탈퇴 전 User 로 인증할 수 있습니다.
+    """
+    user = await db.merge(user)
+    user.deleted_at = datetime.utcnow()
+    await db.commit()
+    user_cache.invalidate(user.email)
+
+def auth_cache_stats() -> Dict[str, Dict[str, float]]:
+    return {"token_cache": token_cache.stats(), "user_cache": user_cache.stats()}
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """사용자 인증 (조회/저장은 비동기 세션, bcrypt 검증은 프로세스 풀에서 실행해 이벤트 루프를 막지 않음)"""
+    result = await db.execute(select(User).where(User.email == email, User.deleted_at.is_(None)))
+    user = result.scalars().first()
     if not user:
         return None
-    if not verify_password(password, user.password):
+    # Google 로그인 전용 계정은 비밀번호가 없으므로 비밀번호 로그인 불가
+    if not user.password:
+        return None
+    valid, new_hash = await password_hasher.verify(password, user.password)
+    if not valid:
         return None
+    # BCRYPT_ROUNDS 가 바뀐 뒤 처음 로그인하면 새 설정으로 다시 해싱해 저장
+    if new_hash:
+        user.password = new_hash
+        await db.commit()
     return user 
\ No newline at end of file
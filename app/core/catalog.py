@@ -0,0 +1,111 @@
+import threading
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.recommender import recommendation_engine
+from app.core.survey_model import survey_model
+from app.core.survey_table import recommendation_table
+from app.db.session import SessionLocal
+from app.models.catalog_version import CatalogVersion
+
+CATALOG_ROW_ID = 1
+
+
+def get_catalog_version(db: Session) -> int:
+    version = db.execute(select(CatalogVersion.version).where(CatalogVersion.id == CATALOG_ROW_ID)).scalar()
+    return int(version or 0)
+
+
+def bump_catalog_version(db: Session) -> int:
+    """데이터가 바뀌었음을 알림 (다른 프로세스의 CatalogWatcher 가 감지)"""
+    table = CatalogVersion.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == CATALOG_ROW_ID)
+        .values(version=table.c.version + 1, updated_at=datetime.now())
+    )
+    if db.execute(stmt).rowcount == 0:
+        try:
+            db.execute(table.insert().values(id=CATALOG_ROW_ID, version=1, updated_at=datetime.now()))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            db.execute(stmt)
+            db.commit()
+    else:
+        db.commit()
+    return get_catalog_version(db)
+
+
+def invalidate_recommendation_caches() -> None:
+    """이 프로세스의 점수 행렬 / 설문 조회 테이블을 버림 (다음 요청에서 다시 로드)"""
+    recommendation_engine.invalidate()
+    recommendation_table.invalidate()
+
+
+class CatalogWatcher:
+    """
+    백그라운드 스레드에서 CATALOG_POLL_SECONDS 마다 catalog_version 과 활성화된 설문 채점 모델 버전을 확인하고,
+    바뀌었으면 점수 행렬 / 채점 모델을 새로 읽어 교체한 뒤 설문 조회 테이블을 다시 생성
+    (교체 전까지는 기존 스냅샷으로 계속 응답)
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._seen: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="catalog-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+
+    def check(self) -> bool:
+        """버전이 바뀌었으면 갱신하고 True"""
+        db = SessionLocal()
+        try:
+            catalog_changed = self._check_catalog(db)
+            model_changed = survey_model.refresh(db)
+        finally:
+            db.close()
+        if not (catalog_changed or model_changed):
+            return False
+        recommendation_table.rebuild_in_background()
+        return True
+
+    def _check_catalog(self, db: Session) -> bool:
+        version = get_catalog_version(db)
+        if self._seen is None or version == self._seen:
+            # 처음 확인한 버전은 기동 시 로드한 데이터와 같다고 봅니다.
+            self._seen = version
+            return False
+        if recommendation_engine.loaded:
+            recommendation_engine.refresh(db)
+        self._seen = version
+        return True
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Error in CatalogWatcher: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+
+catalog_watcher = CatalogWatcher(settings.CATALOG_POLL_SECONDS)
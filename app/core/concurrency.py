@@ -0,0 +1,200 @@
+import json
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from app.core.config import settings
+
+# 경로 접두사 → 제한 그룹 (여기 없는 경로는 제한하지 않음)
+ROUTE_GROUPS = {
+    "/api/v1/survey": "survey",
+    "/api/v1/plan": "plan",
+    "/api/v1/auth": "auth",
+}
+
+
+def _alpha(window: int) -> float:
+    """샘플 window 개 정도를 평균하는 EWMA 계수"""
+    return 2 / (window + 1)
+
+
+class AdaptiveLimiter:
+    """
+    지연 시간 기반 AIMD 동시 처리 제한
+    - 최근 지연(짧은 EWMA)이 평소 지연(긴 EWMA)의 CONCURRENCY_LATENCY_TOLERANCE 배를 넘고 그 차이가
+      CONCURRENCY_LATENCY_SLACK_MS 이상인 샘플이 CONCURRENCY_CONGESTED_SAMPLES 번 이어지거나, 5xx/예외면
+      제한을 CONCURRENCY_BACKOFF_RATIO 배로 줄임
+      (CONCURRENCY_DECREASE_INTERVAL_SECONDS 와 평소 지연 중 긴 시간 동안 최대 한 번 — 혼잡할 때 늘어나는
+      최근 지연을 기준으로 하면 정작 줄여야 할 때 감소가 늦어짐)
+    - 수 ms 짜리 라우트의 흔들림은 배수로는 쉽게 1.5배를 넘으므로 절대 차이(slack)도 함께 보고,
+      같은 그룹의 느린 요청 하나(로그인 bcrypt 등)로는 줄이지 않도록 혼잡이 이어질 때만 줄임
+    - 혼잡하지 않고 제한을 절반 이상 쓰고 있으면 요청마다 1/limit 만큼 늘림 (지연 한 번마다 약 +1)
+    - 평소 지연을 최소값이 아닌 긴 EWMA 로 잡아 캐시 적중 / Gemini 호출처럼 지연이 섞인 그룹에서도 동작하고,
+      지속적인 변화는 결국 새 평소 지연으로 받아들입니다.
+    - 처음 CONCURRENCY_WARMUP_SAMPLES 개는 평소 지연을 잡는 구간으로,
+      제한할 근거가 없으므로 max_limit 까지 받고 그동안 본 최대 동시 처리 수를 시작 제한으로 삼습니다.
+      두 EWMA 는 윈도가 찰 때까지 단순 평균으로 계산해 첫 요청(콜드 캐시 / 캐시 적중) 하나에 끌려가지 않게 합니다.
+    - 처리 중인 요청이 제한에 닿으면 대기열 없이 바로 거절
+    """
+
+    def __init__(self, name: str, initial_limit: int, min_limit: int, max_limit: int,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.inflight = 0
+        self.short_latency: Optional[float] = None
+        self.long_latency: Optional[float] = None
+        self.samples = 0
+        self.congested_streak = 0     # 연속으로 혼잡 판정된 샘플 수
+        self.accepted = 0
+        self.shed = 0
+        self.decreases = 0
+        self._last_decrease = float("-inf")
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @property
+    def warming_up(self) -> bool:
+        return self.samples < settings.CONCURRENCY_WARMUP_SAMPLES
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            # 워밍업 동안은 평소 지연을 모르므로 제한할 근거가 없어 max_limit 까지 받음
+            limit = self.max_limit if self.warming_up else int(self.limit)
+            if self.inflight >= limit:
+                self.shed += 1
+                return False
+            self.inflight += 1
+            self.accepted += 1
+            return True
+
+    def release(self, latency: float, failed: bool = False) -> None:
+        now = self._clock()
+        with self._lock:
+            inflight = self.inflight
+            self.inflight -= 1
+            self.samples += 1
+
+            if self.long_latency is None:
+                self.short_latency = self.long_latency = latency
+            else:
+                # 샘플이 윈도보다 적은 동안은 1/n (단순 평균), 이후에는 EWMA
+                self.short_latency += (latency - self.short_latency) * max(
+                    _alpha(settings.CONCURRENCY_SHORT_WINDOW), 1 / self.samples)
+                self.long_latency += (latency - self.long_latency) * max(
+                    _alpha(settings.CONCURRENCY_LONG_WINDOW), 1 / self.samples)
+
+            if self.warming_up:
+                # 워밍업이 끝나면 그동안 실제로 본 최대 동시 처리 수(와 초기 제한 중 큰 값)에서 시작
+                self.limit = min(self.max_limit, max(self.limit, inflight))
+                return
+
+            if (
+                self.short_latency > self.long_latency * settings.CONCURRENCY_LATENCY_TOLERANCE
+                and self.short_latency - self.long_latency >= settings.CONCURRENCY_LATENCY_SLACK_MS / 1000
+            ):
+                self.congested_streak += 1
+            else:
+                self.congested_streak = 0
+            # 지연이 튄 요청 하나는 짧은 EWMA 를 잠깐 올릴 뿐이므로 혼잡이 이어질 때만 줄임
+            congested = self.congested_streak >= settings.CONCURRENCY_CONGESTED_SAMPLES
+            if failed or congested:
+                # 동시에 끝난 느린 요청들이 한꺼번에 제한을 깎지 않도록 감소 사이에 최소 간격을 둠
+                interval = max(settings.CONCURRENCY_DECREASE_INTERVAL_SECONDS, self.long_latency)
+                if now - self._last_decrease >= interval:
+                    self.limit = max(self.min_limit, self.limit * settings.CONCURRENCY_BACKOFF_RATIO)
+                    self._last_decrease = now
+                    self.decreases += 1
+            elif inflight * 2 >= self.limit:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "limit": int(self.limit),
+            "inflight": self.inflight,
+            "short_latency_ms": round((self.short_latency or 0.0) * 1000, 3),
+            "long_latency_ms": round((self.long_latency or 0.0) * 1000, 3),
+            "accepted": self.accepted,
+            "shed": self.shed,
+            "decreases": self.decreases,
+            "warming_up": self.warming_up,
+        }
+
+
+def _group_limits() -> Dict[str, int]:
+    return {
+        "survey": settings.CONCURRENCY_SURVEY_MAX_LIMIT,
+        "plan": settings.CONCURRENCY_PLAN_MAX_LIMIT,
+        "auth": settings.CONCURRENCY_AUTH_MAX_LIMIT,
+    }
+
+
+limiters: Dict[str, AdaptiveLimiter] = {
+    name: AdaptiveLimiter(name, settings.CONCURRENCY_INITIAL_LIMIT, settings.CONCURRENCY_MIN_LIMIT, max_limit)
+    for name, max_limit in _group_limits().items()
+}
+
+
+def concurrency_stats() -> Dict[str, Dict[str, float]]:
+    return {name: limiter.stats() for name, limiter in limiters.items()}
+
+
+def route_group(path: str) -> Optional[str]:
+    for prefix, group in ROUTE_GROUPS.items():
+        if path == prefix or path.startswith(prefix + "/"):
+            return group
+    return None
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    라우트 그룹(survey / plan / auth)별 적응형 동시 처리 제한
+    제한을 넘는 요청은 스레드풀 / DB 커넥션을 기다리며 쌓이지 않도록 바로 503 + Retry-After 로 거절합니다.
+    (스트리밍 응답은 본문 전송이 끝날 때까지 한 자리를 차지)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.CONCURRENCY_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        group = route_group(scope["path"])
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = limiters[group]
+        if not limiter.try_acquire():
+            await self._reject(send, group)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            limiter.release(time.perf_counter() - started, failed=status >= 500)
+
+    async def _reject(self, send, group: str) -> None:
+        body = json.dumps({"detail": f"서버가 혼잡합니다. 잠시 후 다시 시도해 주세요. ({group})"}, ensure_ascii=False).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.CONCURRENCY_RETRY_AFTER_SECONDS).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
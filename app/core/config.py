@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "GalaeMalae"
@@ -13,6 +13,132 @@ class Settings(BaseSettings):
     
     # 데이터베이스 설정
     DATABASE_URL: str = "sqlite:///./sql_app.db"
+    # 설정 시 app.db.session 의 MySQL 접속 URL 대신 사용 (테스트/벤치마크용 sqlite 등)
+    SQLALCHEMY_DATABASE_URL: Optional[str] = None
+    ASYNC_SQLALCHEMY_DATABASE_URL: Optional[str] = None
+
+    # 커넥션 풀 설정 (동기/비동기 엔진 공통)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800     # MySQL wait_timeout 보다 짧게
+    DB_POOL_PRE_PING: bool = True
+
+    # /metrics (Prometheus, X-Admin-Token 필요) 요청 지연 시간 / SQL / Gemini 계측
+    METRICS_ENABLED: bool = True
+
+    # 요청 프로파일링 (서명된 X-Profile 헤더 또는 관리자 API 로 설정한 샘플링 비율)
+    PROFILING_SECRET: Optional[str] = None  # X-Profile 헤더 HMAC 키, 없으면 헤더로는 프로파일링 불가
+    PROFILING_SAMPLE_RATE: float = 0.0      # 0 이면 샘플링 끔, 0.01 이면 요청 1%
+    PROFILING_INTERVAL_MS: float = 5.0      # 스택 샘플 간격
+    PROFILING_RING_SIZE: int = 50           # 메모리에 보관할 최근 프로파일 수
+
+    # 관리자 API (/api/v1/admin) 와 /metrics 의 X-Admin-Token, 없으면 둘 다 비활성화
+    ADMIN_TOKEN: Optional[str] = None
+
+    # 기동 워밍업 설정 (완료 전까지 /ready 는 503)
+    WARMUP_POOL_CONNECTIONS: int = 5        # 미리 열어 둘 커넥션 수
+    WARMUP_RETRY_SECONDS: float = 5.0
+    WARMUP_WAIT_SECONDS: float = 10.0       # 워밍업 중에 들어온 추천 요청이 기다리는 최대 시간 (넘으면 503)
+
+    # 추천 설정 ("memory": 메모리 점수 행렬, "sql": DB 에서 점수 계산)
+    RECOMMENDATION_MODE: str = "memory"
+    RECOMMEND_CHUNK_BYTES: int = 64 * 1024 * 1024   # 배치 채점에서 한 번에 만드는 (n, D) 중간 행렬의 최대 크기
+
+    # 여행지 데이터 적재 (python -m app.db.ingest) / 변경 감지
+    INGEST_BATCH_SIZE: int = 5000           # 트랜잭션 하나에 넣을 행 수
+    CATALOG_POLL_SECONDS: float = 10.0      # catalog_version 확인 주기 (바뀌면 추천 캐시 갱신)
+
+    # 위치 기반 검색 (여행지 위경도 격자 인덱스)
+    GEO_CELL_DEGREES: float = 0.1           # 격자 한 칸 크기 (약 11km)
+    GEO_MAX_RADIUS_KM: float = 500.0
+    GEO_MAX_RESULTS: int = 100
+
+    # 설문 응답 전체 조합의 추천 결과를 미리 계산해 두고 조회
+    SURVEY_TABLE_ENABLED: bool = True
+    # 배치 채점 요청 한 번에 받을 수 있는 최대 설문 수
+    SURVEY_BATCH_MAX_SIZE: int = 10000
+    SURVEY_RESULT_CACHE_SECONDS: int = 300    # GET /survey/result 의 Cache-Control max-age (CDN / 브라우저)
+    COUNT_CACHE_SECONDS: int = 5              # 호출 횟수 조회의 Cache-Control max-age
+
+    # 호출 횟수 카운터 설정 (메모리에 모았다가 주기적으로 DB에 반영)
+    COUNTER_FLUSH_INTERVAL_SECONDS: float = 5.0
+    COUNTER_SHARDS: int = 16
+
+    # Gemini 여행 계획 생성 설정
+    GEMINI_MODEL_NAME: str = "gemini-1.5-flash"
+    PLAN_MAX_CONCURRENCY: int = 8          # 동시에 진행할 수 있는 Gemini 호출 수
+    PLAN_TIMEOUT_SECONDS: float = 30.0     # 호출 1회당 데드라인
+    PLAN_MAX_RETRIES: int = 2              # 일시적 오류 시 재시도 횟수
+    PLAN_RETRY_BACKOFF_SECONDS: float = 0.5
+    PLAN_STRUCTURED_OUTPUT: bool = True    # response_schema 로 TravelPlan 형식의 JSON 만 생성하도록 요청
+    PLAN_REASK_ON_INVALID: bool = True     # 고쳐 읽어도 쓸 수 없는 응답이면 이유를 알려주고 한 번 다시 요청
+
+    # 여행 계획 캐시 설정 (메모리 LRU/TTL + DB plan_cache 테이블)
+    PLAN_CACHE_MAX_ENTRIES: int = 1024
+    PLAN_CACHE_TTL_SECONDS: float = 60 * 60
+    PLAN_CACHE_DB_TTL_SECONDS: float = 7 * 24 * 60 * 60
+
+    # 여행 계획 작업 큐 설정 ("memory": 프로세스 메모리, "sqlite": 워커 간 공유 파일 큐)
+    PLAN_JOB_BACKEND: str = "memory"
+    PLAN_JOB_SQLITE_PATH: str = "./plan_jobs.db"
+    PLAN_JOB_QUEUE_SIZE: int = 100         # 대기 작업이 이 수를 넘으면 429
+    PLAN_JOB_WORKERS: int = 4
+    PLAN_JOB_RETENTION_SECONDS: float = 60 * 60
+    PLAN_JOB_STALE_SECONDS: float = 5 * 60
+
+    # 외부 HTTP 호출 설정 (Google OAuth 등)
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    GOOGLE_JWKS_URL: str = "https://www.googleapis.com/oauth2/v3/certs"
+
+    # Google OAuth 설정 (GOOGLE_CLIENT_ID 가 없으면 Google 로그인은 503)
+    GOOGLE_CLIENT_ID: Optional[str] = None
+    GOOGLE_CLIENT_SECRET: Optional[str] = None
+    GOOGLE_REDIRECT_URI: str = "http://localhost:8000/api/v1/auth/google/callback"
+
+    # 인증 캐시 설정
+    AUTH_TOKEN_CACHE_SIZE: int = 10000      # 검증된 토큰 LRU 크기
+    AUTH_USER_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_TTL_SECONDS: float = 30.0   # 탈퇴 시 다른 워커의 캐시는 이 시간이 지나야 비워짐
+
+    # 비밀번호 해싱 설정
+    BCRYPT_ROUNDS: int = 12                 # 환경별 work factor (변경 시 로그인할 때 다시 해싱)
+    PASSWORD_HASH_WORKERS: int = 2          # 해싱 전용 프로세스 수
+    PASSWORD_HASH_MAX_PENDING: int = 64     # 풀에 동시에 넣을 수 있는 작업 수
+
+    # 적응형 동시 처리 제한 (라우트 그룹 survey / plan / auth 별, 지연 시간 기반 AIMD)
+    CONCURRENCY_LIMIT_ENABLED: bool = True
+    CONCURRENCY_INITIAL_LIMIT: int = 20            # 워밍업 동안 본 최대 동시 처리 수가 더 크면 그 값에서 시작
+    CONCURRENCY_MIN_LIMIT: int = 8
+    CONCURRENCY_SURVEY_MAX_LIMIT: int = 200
+    CONCURRENCY_PLAN_MAX_LIMIT: int = 64
+    CONCURRENCY_AUTH_MAX_LIMIT: int = 100
+    CONCURRENCY_LATENCY_TOLERANCE: float = 1.5     # 최근 지연 / 평소 지연 이 이 값을 넘고
+    CONCURRENCY_LATENCY_SLACK_MS: float = 50.0     # 최근 지연 - 평소 지연 이 이 값도 넘어야 혼잡 (ms 단위 흔들림 무시)
+    CONCURRENCY_SHORT_WINDOW: int = 10             # 최근 지연 EWMA 샘플 수
+    CONCURRENCY_CONGESTED_SAMPLES: int = 5         # 위 조건이 이만큼 연속된 샘플에서 이어져야 혼잡 (튀는 요청 하나는 무시)
+    CONCURRENCY_LONG_WINDOW: int = 500             # 평소 지연 EWMA 샘플 수
+    CONCURRENCY_WARMUP_SAMPLES: int = 50           # 평소 지연이 잡히기 전(처음 이만큼)은 max_limit 까지 받고 제한을 줄이지 않음
+    CONCURRENCY_DECREASE_INTERVAL_SECONDS: float = 1.0  # 제한 감소 최소 간격
+    CONCURRENCY_BACKOFF_RATIO: float = 0.9
+    CONCURRENCY_RETRY_AFTER_SECONDS: int = 1
+
+    # 클라이언트별 토큰 버킷 요청 한도 (JWT sub, 토큰이 없으면 IP 기준)
+    RATE_LIMIT_ENABLED: bool = True
+    # "METHOD 경로" → "<최대 요청 수>/<초>" (Gemini 를 호출하는 라우트, 라우트마다 버킷이 따로)
+    RATE_LIMIT_ROUTES: Dict[str, str] = {
+        "POST /api/v1/plan/plan": "20/60",
+        "POST /api/v1/plan/plan/stream": "20/60",
+        "POST /api/v1/plan/jobs": "20/60",
+    }
+    RATE_LIMIT_BACKEND: str = "memory"              # memory | sqlite (여러 워커 프로세스가 한도를 공유)
+    RATE_LIMIT_SQLITE_PATH: str = "./rate_limit.db"
+    RATE_LIMIT_SQLITE_RETENTION_SECONDS: float = 60 * 60
+    RATE_LIMIT_MAX_BUCKETS: int = 100000            # memory 백엔드가 보관하는 최대 버킷 수 (LRU)
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False    # 프록시 뒤에서는 X-Forwarded-For 첫 주소를 IP 로 사용
     
     class Config:
         case_sensitive = True
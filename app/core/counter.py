@@ -0,0 +1,145 @@
+import itertools
+import os
+import threading
+from typing import List, Optional, Type
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import Base, SessionLocal
+from app.models.plan_call_count import PlanCallCount
+from app.models.survey_call_count import SurveyCallCount
+
+
+class BufferedCounter:
+    """
+    호출 횟수를 메모리에 모았다가 주기적으로 DB에 더하는 카운터
+    - increment(): 락 없이 itertools.count 의 next() 한 번 (GIL 아래에서 원자적)
+    - flush(): 모인 증가분을 UPDATE ... SET count = count + :n 으로 한 번에 반영
+    - 워커마다 다른 shard 행(id)에 더하므로 워커끼리 같은 행을 두고 경합하지 않음
+    """
+
+    def __init__(self, model: Type[Base], shard_id: Optional[int] = None):
+        self.model = model
+        self._shard_id = shard_id
+        self._ticks = itertools.count()
+        # next(self._ticks) 는 지금까지의 increment + 읽기 횟수를 돌려주므로
+        # 읽기 횟수와 이미 DB에 반영한 횟수를 빼서 미반영 증가분을 구합니다.
+        self._reads = 0
+        self._flushed = 0
+        self._read_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    @property
+    def shard_id(self) -> int:
+        """고정 shard 가 없으면 프로세스(pid) 기준으로 결정 (fork 이후에도 워커별로 달라짐)"""
+        return self._shard_id or (os.getpid() % settings.COUNTER_SHARDS) + 1
+
+    def increment(self) -> None:
+        next(self._ticks)
+
+    def _total_increments(self) -> int:
+        with self._read_lock:
+            total = next(self._ticks) - self._reads
+            self._reads += 1
+            return total
+
+    @property
+    def pending(self) -> int:
+        """아직 DB에 반영되지 않은 증가분"""
+        return self._total_increments() - self._flushed
+
+    def flush(self, db: Session) -> int:
+        """미반영 증가분을 이 프로세스의 shard 행에 원자적으로 더함"""
+        with self._flush_lock:
+            total = self._total_increments()
+            delta = total - self._flushed
+            if delta <= 0:
+                return 0
+
+            table = self.model.__table__
+            shard_id = self.shard_id
+            result = db.execute(
+                update(table)
+                .where(table.c.id == shard_id)
+                .values(count=table.c.count + delta)
+            )
+            if result.rowcount == 0:
+                try:
+                    db.execute(table.insert().values(id=shard_id, count=delta))
+                    db.commit()
+                except IntegrityError:
+                    # 다른 워커가 같은 shard 행을 먼저 만든 경우
+                    db.rollback()
+                    db.execute(
+                        update(table)
+                        .where(table.c.id == shard_id)
+                        .values(count=table.c.count + delta)
+                    )
+                    db.commit()
+            else:
+                db.commit()
+
+            self._flushed = total
+            return delta
+
+    def total(self, db: Session) -> int:
+        """모든 shard 행의 합 + 이 프로세스의 미반영 증가분"""
+        table = self.model.__table__
+        # flush 도중(DB 반영 후 _flushed 갱신 전)에 읽으면 증가분이 두 번 더해지므로 함께 잠금
+        with self._flush_lock:
+            stored = db.execute(select(func.coalesce(func.sum(table.c.count), 0))).scalar()
+            return int(stored) + self.pending
+
+
+survey_call_counter = BufferedCounter(SurveyCallCount)
+plan_call_counter = BufferedCounter(PlanCallCount)
+
+COUNTERS: List[BufferedCounter] = [survey_call_counter, plan_call_counter]
+
+
+def flush_counters() -> None:
+    """모든 카운터의 미반영 증가분을 DB에 반영"""
+    db = SessionLocal()
+    try:
+        for counter in COUNTERS:
+            try:
+                counter.flush(db)
+            except Exception as e:
+                db.rollback()
+                print(f"Error in flush_counters ({counter.model.__tablename__}): {e}")
+    finally:
+        db.close()
+
+
+class CounterFlusher:
+    """백그라운드 스레드에서 COUNTER_FLUSH_INTERVAL_SECONDS 마다 flush_counters() 실행"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="counter-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """스레드를 멈추고 남은 증가분을 마지막으로 한 번 더 반영"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+        flush_counters()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            flush_counters()
+
+
+counter_flusher = CounterFlusher(settings.COUNTER_FLUSH_INTERVAL_SECONDS)
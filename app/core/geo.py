@@ -0,0 +1,139 @@
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi / 180 * EARTH_RADIUS_KM
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> Tuple[float, float, Optional[List[Tuple[float, float]]]]:
+    """
+    반경 radius_km 원을 감싸는 위경도 범위 → (최소 위도, 최대 위도, 경도 구간 목록)
+    경도 구간은 날짜변경선을 넘으면 두 구간, 극점 근처이거나 반경이 경도 전체를 덮으면 None (경도 제한 없음)
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    lat_lo, lat_hi = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    max_abs_lat = max(abs(lat_lo), abs(lat_hi))
+    if max_abs_lat >= 89.9:
+        return lat_lo, lat_hi, None
+    dlng = radius_km / (KM_PER_DEGREE * math.cos(math.radians(max_abs_lat)))
+    if dlng >= 180:
+        return lat_lo, lat_hi, None
+    lo, hi = lng - dlng, lng + dlng
+    if lo < -180:
+        return lat_lo, lat_hi, [(-180.0, hi), (lo + 360, 180.0)]
+    if hi >= 180:
+        return lat_lo, lat_hi, [(lo, 180.0), (-180.0, hi - 360)]
+    return lat_lo, lat_hi, [(lo, hi)]
+
+
+def haversine_threshold(radius_km: float) -> float:
+    """
+    haversine 식의 a = sin²(Δφ/2) + cos φ1·cos φ2·sin²(Δλ/2) 가 이 값 이하이면 거리 ≤ radius_km
+    (SQL 에서 asin / sqrt 없이 sin / cos 만으로 반경을 판정하기 위함)
+    """
+    half_angle = min(radius_km / EARTH_RADIUS_KM / 2, math.pi / 2)
+    return math.sin(half_angle) ** 2
+
+
+@dataclass(frozen=True)
+class GeoIndex:
+    """
+    위경도 격자(cell_degrees 간격) 인덱스
+    - 좌표를 (위도 칸, 경도 칸) 정수 키로 정렬해 두고, 반경 검색 시 위도 칸마다
+      경도 칸 범위를 searchsorted 로 잘라 후보만 haversine 거리 계산
+    - rows 는 ScoreMatrix 의 행 번호 (좌표가 없는 여행지는 인덱스에서 제외)
+    """
+    cell_degrees: float
+    n_cols: int
+    keys: np.ndarray       # (M,) 격자 키, 오름차순
+    rows: np.ndarray       # (M,) ScoreMatrix 행 번호
+    lat: np.ndarray        # (M,) 위도 (라디안)
+    lng: np.ndarray        # (M,) 경도 (라디안)
+    cos_lat: np.ndarray    # (M,) cos(위도)
+
+    @classmethod
+    def build(cls, latitudes: np.ndarray, longitudes: np.ndarray, cell_degrees: float) -> "GeoIndex":
+        valid = (
+            np.isfinite(latitudes) & np.isfinite(longitudes)
+            & (np.abs(latitudes) <= 90) & (np.abs(longitudes) <= 180)
+        )
+        rows = np.flatnonzero(valid)
+        lat_deg, lng_deg = latitudes[rows], longitudes[rows]
+        n_cols = int(math.ceil(360 / cell_degrees))
+        keys = cls._cell_row(lat_deg, cell_degrees) * n_cols + cls._cell_col(lng_deg, cell_degrees, n_cols)
+        # 같은 칸 안에서는 행 번호(= destination.id) 순서 유지
+        order = np.lexsort((rows, keys))
+        lat = np.radians(lat_deg[order])
+        return cls(
+            cell_degrees=cell_degrees,
+            n_cols=n_cols,
+            keys=keys[order],
+            rows=rows[order],
+            lat=lat,
+            lng=np.radians(lng_deg[order]),
+            cos_lat=np.cos(lat),
+        )
+
+    @staticmethod
+    def _cell_row(lat_deg, cell_degrees: float):
+        return np.floor((np.asarray(lat_deg) + 90) / cell_degrees).astype(np.int64)
+
+    @staticmethod
+    def _cell_col(lng_deg, cell_degrees: float, n_cols: int):
+        return np.minimum(np.floor((np.asarray(lng_deg) + 180) / cell_degrees).astype(np.int64), n_cols - 1)
+
+    @property
+    def size(self) -> int:
+        return int(self.rows.shape[0])
+
+    def _col_ranges(self, lng_ranges: Optional[List[Tuple[float, float]]]) -> List[Tuple[int, int]]:
+        """경도 구간 → 경도 칸 범위 목록 (None 이면 전체)"""
+        if lng_ranges is None:
+            return [(0, self.n_cols - 1)]
+        to_col = lambda value: int(self._cell_col(value, self.cell_degrees, self.n_cols))
+        return [(to_col(lo), to_col(hi)) for lo, hi in lng_ranges]
+
+    def within(self, lat: float, lng: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """반경 radius_km 안의 (ScoreMatrix 행 번호, 거리 km) — 순서 없음"""
+        if self.size == 0 or radius_km <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        lat_lo, lat_hi, lng_ranges = bounding_box(lat, lng, radius_km)
+        cell_rows = np.arange(int(self._cell_row(lat_lo, self.cell_degrees)),
+                              int(self._cell_row(lat_hi, self.cell_degrees)) + 1)
+        lo_keys, hi_keys = [], []
+        for col_lo, col_hi in self._col_ranges(lng_ranges):
+            lo_keys.append(cell_rows * self.n_cols + col_lo)
+            hi_keys.append(cell_rows * self.n_cols + col_hi)
+        starts = np.searchsorted(self.keys, np.concatenate(lo_keys), side="left")
+        ends = np.searchsorted(self.keys, np.concatenate(hi_keys), side="right")
+        spans = [(start, end) for start, end in zip(starts.tolist(), ends.tolist()) if end > start]
+        if not spans:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        candidates = np.concatenate([np.arange(start, end) for start, end in spans])
+
+        distances = self._haversine(candidates, math.radians(lat), math.radians(lng))
+        inside = distances <= radius_km
+        return self.rows[candidates[inside]], distances[inside]
+
+    def nearest(self, lat: float, lng: float, radius_km: float, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """반경 안에서 가까운 순 최대 k 개 (거리가 같으면 행 번호 오름차순)"""
+        rows, distances = self.within(lat, lng, radius_km)
+        if k <= 0 or rows.size == 0:
+            return rows[:0], distances[:0]
+        if k < rows.size:
+            part = np.argpartition(distances, k - 1)[:k]
+            threshold = distances[part].max()
+            part = np.flatnonzero(distances <= threshold)
+            rows, distances = rows[part], distances[part]
+        order = np.lexsort((rows, distances))[:k]
+        return rows[order], distances[order]
+
+    def _haversine(self, candidates: np.ndarray, lat: float, lng: float) -> np.ndarray:
+        dlat = self.lat[candidates] - lat
+        dlng = self.lng[candidates] - lng
+        a = np.sin(dlat / 2) ** 2 + math.cos(lat) * self.cos_lat[candidates] * np.sin(dlng / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
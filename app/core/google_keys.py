@@ -0,0 +1,87 @@
+import asyncio
+import re
+import time
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.core.http_client import get_http_client
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class GoogleKeyCache:
+    """
+    Google ID 토큰 서명 검증용 공개키(JWKS) 캐시
+    - Cache-Control max-age 만큼 보관하고, 만료 전에 백그라운드에서 미리 갱신
+    - 로그인 요청 처리 중에는 (처음 보는 kid 가 아니면) 네트워크 호출이 없습니다.
+    """
+
+    def __init__(self, url: str, default_max_age: float = 3600, refresh_margin: float = 300):
+        self.url = url
+        self.default_max_age = default_max_age
+        self.refresh_margin = refresh_margin
+        self._keys: Dict[str, dict] = {}
+        self._expires_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self._expires_at
+
+    async def refresh(self) -> None:
+        """JWKS 를 다시 받아 키 목록 교체"""
+        response = await get_http_client().get(self.url)
+        response.raise_for_status()
+        keys = {key["kid"]: key for key in response.json().get("keys", []) if "kid" in key}
+
+        match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+        max_age = float(match.group(1)) if match else self.default_max_age
+        self._keys = keys
+        self._expires_at = time.monotonic() + max_age
+
+    async def get_key(self, kid: str) -> Optional[dict]:
+        key = self._keys.get(kid)
+        if key is not None and not self.expired:
+            return key
+
+        # 키가 교체(rotation)되었거나 만료된 경우에만 요청 경로에서 갱신 (동시 요청은 한 번만)
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            stale = self._keys.get(kid)
+            if stale is not None and not self.expired:
+                return stale
+            try:
+                await self.refresh()
+            except Exception:
+                # 갱신 실패 시 만료된 키라도 있으면 사용 (Google 키는 며칠 단위로 교체됨)
+                if stale is None:
+                    raise
+                return stale
+            return self._keys.get(kid)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+                delay = max(self._expires_at - time.monotonic() - self.refresh_margin, 60)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in GoogleKeyCache refresh: {e}")
+                delay = 30
+            await asyncio.sleep(delay)
+
+
+google_key_cache = GoogleKeyCache(settings.GOOGLE_JWKS_URL)
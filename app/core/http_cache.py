@@ -0,0 +1,30 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def body_etag(body: bytes) -> str:
+    """응답 본문 digest 로 만든 strong ETag (같은 본문이면 워커가 달라도 같은 값)"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 비교 (RFC 9110 — weak 비교라 W/ 접두사는 무시, * 는 항상 일치)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def cached_json_response(request: Request, body: bytes, etag: str, max_age: int) -> Response:
+    """
+    직렬화된 JSON 본문을 ETag / Cache-Control 과 함께 반환
+    클라이언트(CDN / 브라우저)가 같은 ETag 를 If-None-Match 로 보내면 본문 없이 304
+    """
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,254 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from starlette.routing import Match
+
+# 라우트 템플릿(/api/v1/plan/jobs/{job_id})을 라벨로 사용해 라벨 수가 경로 수만큼만 늘어나도록 함
+UNMATCHED_ROUTE = "<unmatched>"
+
+HTTP_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+DB_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+
+http_request_duration = Histogram(
+    "galae_http_request_duration_seconds",
+    "HTTP 요청 처리 시간",
+    ["method", "route", "status"],
+    buckets=HTTP_LATENCY_BUCKETS,
+)
+http_requests_in_progress = Gauge(
+    "galae_http_requests_in_progress",
+    "처리 중인 HTTP 요청 수",
+    ["method", "route"],
+)
+http_request_db_queries = Histogram(
+    "galae_http_request_db_queries",
+    "요청 하나가 실행한 SQL 문 수",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+http_request_db_seconds = Histogram(
+    "galae_http_request_db_seconds",
+    "요청 하나가 SQL 실행에 쓴 시간 합계",
+    ["route"],
+    buckets=DB_LATENCY_BUCKETS,
+)
+db_query_duration = Histogram(
+    "galae_db_query_duration_seconds",
+    "SQL 문 실행 시간",
+    ["engine"],
+    buckets=DB_LATENCY_BUCKETS,
+)
+gemini_request_duration = Histogram(
+    "galae_gemini_request_duration_seconds",
+    "Gemini 호출 시간 (스트리밍은 마지막 청크까지)",
+    ["operation", "outcome"],
+    buckets=HTTP_LATENCY_BUCKETS,
+)
+gemini_tokens = Counter(
+    "galae_gemini_tokens",
+    "Gemini 사용 토큰 수 (usage_metadata 기준)",
+    ["kind"],
+)
+plan_responses = Counter(
+    "galae_plan_responses",
+    "Gemini 여행 계획 응답 처리 결과 (attempt: first / reask, outcome: ok / repaired / invalid)",
+    ["attempt", "outcome"],
+)
+plan_response_repairs = Counter(
+    "galae_plan_response_repairs",
+    "여행 계획 JSON 을 읽기 위해 적용한 수리 (fence / prose / trailing_comma / truncated)",
+    ["repair"],
+)
+
+
+class RequestStats:
+    """요청 하나 동안 실행된 SQL 문 수 / 시간 (contextvar 로 요청별 분리)"""
+
+    __slots__ = ("db_queries", "db_seconds")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def instrument_engine(engine, name: str) -> None:
+    """SQLAlchemy 엔진(동기 Engine, 비동기는 .sync_engine)에 SQL 실행 시간 측정 이벤트 등록"""
+    observe = db_query_duration.labels(engine=name).observe
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        elapsed = time.perf_counter() - started
+        observe(elapsed)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        # 실패한 SQL 은 after_cursor_execute 가 호출되지 않으므로 시작 시각만 정리
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+
+def resolve_route(app, scope) -> str:
+    """요청 경로에 해당하는 라우트 템플릿 (없으면 UNMATCHED_ROUTE)"""
+    partial = None
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", UNMATCHED_ROUTE)
+        if match == Match.PARTIAL and partial is None:
+            partial = getattr(route, "path", None)
+    return partial or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    라우트별 지연 시간 히스토그램 / 처리 중 요청 수 / 요청별 SQL 문 수·시간 기록
+    (BaseHTTPMiddleware 보다 가벼운 순수 ASGI 미들웨어, 스트리밍 응답은 본문 전송이 끝날 때까지 측정)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = resolve_route(scope["app"], scope)
+        status = 500
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = http_requests_in_progress.labels(method=method, route=route)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_request_duration.labels(method=method, route=route, status=str(status)).observe(
+                time.perf_counter() - started
+            )
+            in_progress.dec()
+            http_request_db_queries.labels(route=route).observe(stats.db_queries)
+            http_request_db_seconds.labels(route=route).observe(stats.db_seconds)
+            _request_stats.reset(token)
+
+
+@contextmanager
+def time_gemini(operation: str):
+    """with 블록(Gemini 호출) 소요 시간을 결과(ok / timeout / cancelled / error)별로 기록"""
+    outcome = "error"
+    started = time.perf_counter()
+    try:
+        yield
+        outcome = "ok"
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+        raise
+    except (asyncio.CancelledError, GeneratorExit):
+        outcome = "cancelled"
+        raise
+    finally:
+        gemini_request_duration.labels(operation=operation, outcome=outcome).observe(time.perf_counter() - started)
+
+
+def record_gemini_usage(response) -> None:
+    """Gemini 응답(또는 스트림의 마지막 청크)의 usage_metadata 로 토큰 수 누적"""
+    usage = getattr(response, "usage_metadata", None)
+    if not usage:
+        return
+    for kind, field in (
+        ("prompt", "prompt_token_count"),
+        ("candidates", "candidates_token_count"),
+        ("total", "total_token_count"),
+    ):
+        count = getattr(usage, field, 0)
+        if count:
+            gemini_tokens.labels(kind=kind).inc(count)
+
+
+def record_plan_response(attempt: str, outcome: str, repairs=()) -> None:
+    """여행 계획 응답 하나의 처리 결과와 적용한 JSON 수리 기록"""
+    plan_responses.labels(attempt=attempt, outcome=outcome).inc()
+    for repair in repairs:
+        plan_response_repairs.labels(repair=repair).inc()
+
+
+def _add_gauges(prefix: str, stats: dict, labels: dict, families: dict) -> None:
+    """숫자 값만 골라 galae_<prefix>_<key> 게이지로 변환"""
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"galae_{prefix}_{key}"
+        family = families.get(name)
+        if family is None:
+            family = families[name] = GaugeMetricFamily(name, f"{prefix} {key}", labels=list(labels))
+        family.add_metric(list(labels.values()), value)
+
+
+class StatsCollector:
+    """커넥션 풀 / 캐시 / 동시 처리 제한 / 요청 한도 / 호출 횟수 버퍼 상태를 스크레이프 시점에 게이지로 노출"""
+
+    def describe(self):
+        # 등록 시점에 collect() 가 호출되지 않도록 (아직 import 되지 않은 모듈을 참조하므로)
+        return []
+
+    def collect(self):
+        # 순환 import 를 피하기 위해 스크레이프 시점에 import
+        from app.core.auth import auth_cache_stats
+        from app.core.concurrency import concurrency_stats
+        from app.core.counter import COUNTERS
+        from app.core.plan_cache import plan_cache
+        from app.core.rate_limit import rate_limit_stats
+        from app.db.session import get_pool_status
+
+        families = {}
+        for pool, stats in get_pool_status().items():
+            _add_gauges("db_pool", stats, {"pool": pool}, families)
+        _add_gauges("plan_cache", plan_cache.stats(), {}, families)
+        for cache, stats in auth_cache_stats().items():
+            _add_gauges("auth_cache", stats, {"cache": cache}, families)
+        for group, stats in concurrency_stats().items():
+            _add_gauges("concurrency", stats, {"group": group}, families)
+        for route, stats in rate_limit_stats().items():
+            _add_gauges("rate_limit", stats, {"route": route}, families)
+        for counter in COUNTERS:
+            _add_gauges("call_counter", {"pending": counter.pending}, {"table": counter.model.__tablename__}, families)
+        return families.values()
+
+
+REGISTRY.register(StatsCollector())
+
+
+def render_metrics() -> tuple:
+    """(본문, Content-Type) — Prometheus text format"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
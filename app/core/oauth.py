@@ -1,21 +1,21 @@
-import requests
+import httpx
 from typing import Optional, Dict
 from fastapi import HTTPException, status
+from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from app.models.user import User
-from app.core.auth import create_access_token, get_password_hash
-import os
+from app.core.auth import create_access_token
+from app.core.config import settings
+from app.core.google_keys import google_key_cache
+from app.core.http_client import get_http_client
 
-# Google OAuth 설정
-GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
-GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
-GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI", "http://localhost:8000/api/v1/auth/google/callback")
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
 
 def get_google_auth_url() -> str:
     """Google OAuth 인증 URL 생성"""
     params = {
-        "client_id": GOOGLE_CLIENT_ID,
-        "redirect_uri": GOOGLE_REDIRECT_URI,
+        "client_id": settings.GOOGLE_CLIENT_ID,
+        "redirect_uri": settings.GOOGLE_REDIRECT_URI,
         "scope": "openid email profile",
         "response_type": "code",
         "access_type": "offline",
@@ -24,36 +24,66 @@ def get_google_auth_url() -> str:
     query_string = "&".join([f"{k}={v}" for k, v in params.items()])
     return f"https://accounts.google.com/o/oauth2/v2/auth?{query_string}"
 
-def get_google_token(code: str) -> Optional[Dict]:
+async def get_google_token(code: str) -> Optional[Dict]:
     """Google OAuth 코드로 액세스 토큰 교환"""
     token_url = "https://oauth2.googleapis.com/token"
     data = {
-        "client_id": GOOGLE_CLIENT_ID,
-        "client_secret": GOOGLE_CLIENT_SECRET,
+        "client_id": settings.GOOGLE_CLIENT_ID,
+        "client_secret": settings.GOOGLE_CLIENT_SECRET,
         "code": code,
         "grant_type": "authorization_code",
-        "redirect_uri": GOOGLE_REDIRECT_URI,
+        "redirect_uri": settings.GOOGLE_REDIRECT_URI,
     }
     
     try:
-        response = requests.post(token_url, data=data)
+        response = await get_http_client().post(token_url, data=data)
         response.raise_for_status()
         return response.json()
-    except requests.RequestException:
+    except httpx.HTTPError:
         return None
 
-def get_google_user_info(access_token: str) -> Optional[Dict]:
+async def get_google_user_info(access_token: str) -> Optional[Dict]:
     """Google 사용자 정보 조회"""
     user_info_url = "https://www.googleapis.com/oauth2/v2/userinfo"
     headers = {"Authorization": f"Bearer {access_token}"}
     
     try:
-        response = requests.get(user_info_url, headers=headers)
+        response = await get_http_client().get(user_info_url, headers=headers)
         response.raise_for_status()
         return response.json()
-    except requests.RequestException:
+    except httpx.HTTPError:
         return None
 
+async def verify_google_id_token(credential: str) -> Dict:
+    """
+    Google ID 토큰(credential) 서명/만료/발급자/대상 검증 후 claims 반환
+    공개키는 google_key_cache 에서 가져오므로 보통 네트워크 호출이 없습니다.
+
+    Raises:
+        HTTPException(503): GOOGLE_CLIENT_ID 가 설정되지 않은 경우 (대상 검사 없이 받아들이지 않음)
+        JWTError: 서명이나 claims 가 유효하지 않은 경우
+    """
+    client_id = settings.GOOGLE_CLIENT_ID
+    if not client_id:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Google login is not configured"
+        )
+
+    header = jwt.get_unverified_header(credential)
+    key = await google_key_cache.get_key(header.get("kid", ""))
+    if key is None:
+        raise JWTError("Unknown signing key")
+
+    return jwt.decode(
+        credential,
+        key,
+        algorithms=["RS256"],
+        audience=client_id,
+        issuer=GOOGLE_ISSUERS,
+        options={"verify_at_hash": False},
+    )
+
 def get_or_create_google_user(db: Session, google_user_info: Dict) -> User:
     """Google 사용자 정보로 사용자 조회 또는 생성"""
     email = google_user_info.get("email")
@@ -70,11 +100,11 @@ def get_or_create_google_user(db: Session, google_user_info: Dict) -> User:
     if user:
         return user
     
-    # 새 사용자 생성
+    # 새 사용자 생성 (Google 로그인 전용 계정은 비밀번호를 두지 않아 해싱 비용이 없음)
     user = User(
         email=email,
         nickname=google_user_info.get("name", email.split("@")[0]),
-        password=get_password_hash("google_oauth_user")  # 임시 비밀번호
+        password=None
     )
     
     db.add(user)
@@ -0,0 +1,111 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+# 프로세스(메인 + 풀 워커)마다 rounds 별 CryptContext 를 한 번만 생성
+_contexts: Dict[int, CryptContext] = {}
+
+
+def get_password_context(rounds: int) -> CryptContext:
+    """
+    bcrypt work factor 를 rounds 로 고정한 CryptContext
+    min/max rounds 도 같은 값으로 두어, 설정이 바뀌면 기존 해시가 needs_update 로 판정됩니다.
+    """
+    context = _contexts.get(rounds)
+    if context is None:
+        context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds,
+        )
+        _contexts[rounds] = context
+    return context
+
+
+def _hash(password: str, rounds: int) -> str:
+    return get_password_context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, hashed: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    return get_password_context(rounds).verify_and_update(password, hashed)
+
+
+def _warm(rounds: int) -> None:
+    # 워커에서 passlib / bcrypt 백엔드를 미리 불러 두어 첫 로그인 요청이 import 비용을 내지 않게 함
+    get_password_context(rounds).handler("bcrypt").get_backend()
+
+
+def _mp_context():
+    """
+    풀 워커 시작 방식
+    fork 는 스레드(커넥션 풀, 백그라운드 작업)와 열린 소켓이 있는 서버 프로세스를 그대로 복제하므로
+    forkserver (없는 플랫폼은 spawn) 로 깨끗한 프로세스에서 시작합니다.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class PasswordHasher:
+    """
+    bcrypt 해시/검증을 프로세스 풀에서 실행해 요청 스레드와 이벤트 루프를 막지 않는 서비스
+    - 동시에 풀에 들어갈 수 있는 작업 수를 제한해 가입 폭주 시에도 대기열이 무한히 쌓이지 않음
+    - verify() 는 work factor 가 바뀐 해시에 대해 새 해시를 함께 돌려줌 (lazy rehash)
+    """
+
+    def __init__(self, rounds: int, workers: int, max_pending: int):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def context(self) -> CryptContext:
+        return get_password_context(self.rounds)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_mp_context())
+        return self._executor
+
+    def start(self) -> None:
+        """
+        기동 시 워커 프로세스를 미리 띄워 둠 (완료를 기다리지 않음)
+        spawn / forkserver 는 워커마다 모듈을 새로 import 하므로, 첫 로그인 요청에서 그 비용을 내지 않도록 합니다.
+        """
+        executor = self._get_executor()
+        for _ in range(self.workers):
+            executor.submit(_warm, self.rounds)
+
+    async def _run(self, fn, *args):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """(일치 여부, 다시 저장해야 할 새 해시 또는 None)"""
+        return await self._run(_verify_and_update, password, hashed, self.rounds)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -1,32 +1,108 @@
-import google.generativeai as genai
+from app.core.config import settings
+from app.core.metrics import record_gemini_usage, record_plan_response, time_gemini
+from app.core.plan_json import loads_tolerant
+from app.schemas.plan import TravelPlan
+from functools import lru_cache
+from pydantic import ValidationError
+from typing import List
+import asyncio
 import os
 import json
+import random
 
-# Gemini API 키 설정은 애플리케이션 시작점에서 한 번만 호출하는 것이 가장 좋습니다.
-# (예: app/main.py). 여기서도 호출은 가능합니다.
 # 공식 환경변수명인 GOOGLE_API_KEY를 사용합니다.
 if not os.getenv("GOOGLE_API_KEY"):
     from dotenv import load_dotenv
     load_dotenv()
 
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+# google.generativeai 는 import 비용이 커서(워커 기동 시간의 상당 부분)
+# 모듈 로드 시점이 아니라 첫 여행 계획 요청에서 import / configure 합니다.
+_model = None
+_semaphore = None
+_transient_errors = None
 
 
-def create_travel_plan(destination: str, schedule: str) -> dict:
+class InvalidPlanResponse(ValueError):
+    """Gemini 응답을 고쳐 읽어도 여행 계획(TravelPlan) 스키마에 맞지 않는 경우"""
+
+
+def _gemini_schema(node: dict, defs: dict) -> dict:
     """
-    여행지(destination)와 일정(schedule)을 받아 Gemini API를 통해 여행 계획을 생성합니다.
+    pydantic JSON 스키마 → Gemini response_schema (OpenAPI 부분집합)
+    $ref 를 펼치고 type / description / properties / items / required 만 남깁니다.
+    생성할 때는 기본값이 있는 필드도 빠뜨리지 않도록 모든 속성을 required 로 둡니다.
+    """
+    if "$ref" in node:
+        node = defs[node["$ref"].rsplit("/", 1)[-1]]
+    elif "allOf" in node and len(node["allOf"]) == 1:
+        node = {**node["allOf"][0], "description": node.get("description")}
+        return _gemini_schema(node, defs)
+    schema = {"type": node["type"]}
+    if node.get("description"):
+        schema["description"] = node["description"]
+    if node["type"] == "object":
+        properties = node.get("properties", {})
+        schema["properties"] = {name: _gemini_schema(prop, defs) for name, prop in properties.items()}
+        schema["required"] = list(properties)
+    elif node["type"] == "array":
+        schema["items"] = _gemini_schema(node["items"], defs)
+    return schema
 
-    Returns:
-        dict: 생성된 여행 계획 JSON 데이터
-    
-    Raises:
-        json.JSONDecodeError: API 응답이 유효한 JSON이 아닐 경우
-        Exception: API 호출 또는 기타 과정에서 오류 발생 시
+
+@lru_cache(maxsize=None)
+def plan_response_schema() -> dict:
+    """TravelPlan 을 Gemini 구조화 출력(response_schema) 형식으로 변환"""
+    schema = TravelPlan.model_json_schema()
+    return _gemini_schema(schema, schema.get("$defs", {}))
+
+
+def get_model():
     """
-    try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
+    GenerativeModel 은 요청마다 만들지 않고 프로세스에서 하나를 재사용합니다.
+    PLAN_STRUCTURED_OUTPUT 이면 응답을 TravelPlan 스키마의 JSON 으로만 생성하도록 설정합니다.
+    """
+    global _model
+    if _model is None:
+        import google.generativeai as genai
+
+        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+        generation_config = None
+        if settings.PLAN_STRUCTURED_OUTPUT:
+            generation_config = genai.GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=plan_response_schema(),
+            )
+        _model = genai.GenerativeModel(settings.GEMINI_MODEL_NAME, generation_config=generation_config)
+    return _model
+
+
+def transient_errors() -> tuple:
+    """일시적인 장애로 보고 재시도하는 예외 (429 / 5xx / 타임아웃)"""
+    global _transient_errors
+    if _transient_errors is None:
+        from google.api_core import exceptions as google_exceptions
+
+        _transient_errors = (
+            google_exceptions.ResourceExhausted,
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.InternalServerError,
+            google_exceptions.DeadlineExceeded,
+            google_exceptions.GatewayTimeout,
+            asyncio.TimeoutError,
+        )
+    return _transient_errors
 
-        prompt = f"""
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """동시에 진행 중인 Gemini 호출 수 제한 (PLAN_MAX_CONCURRENCY)"""
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.PLAN_MAX_CONCURRENCY)
+    return _semaphore
+
+
+def build_plan_prompt(destination: str, schedule: str) -> str:
+    return f"""
         여행지: {destination}
         일정: {schedule}
 
@@ -46,15 +122,143 @@ def create_travel_plan(destination: str, schedule: str) -> dict:
         }}
         """
 
-        response = model.generate_content(prompt)
-        
-        # 가끔 응답이 마크다운 코드 블록으로 감싸여 오는 경우가 있어 제거합니다.
-        json_response_text = response.text.strip().replace("```json", "").replace("```", "").strip()
-        
-        plan_data = json.loads(json_response_text)
-        return plan_data
-
-    except (json.JSONDecodeError, Exception) as e:
-        # 예외를 상위 호출자(API 엔드포인트)로 다시 던져서 처리하도록 합니다.
-        print(f"Error in create_travel_plan: {e}")
-        raise 
\ No newline at end of file
+
+def build_reask_contents(prompt: str, text: str, error: InvalidPlanResponse) -> List[dict]:
+    """스키마에 맞지 않은 응답과 그 이유를 보여주고 전체 JSON 을 다시 요청하는 대화"""
+    return [
+        {"role": "user", "parts": [prompt]},
+        {"role": "model", "parts": [text]},
+        {"role": "user", "parts": [
+            f"위 응답은 요청한 JSON 형식에 맞지 않아 읽을 수 없었어 ({error}). "
+            "설명이나 마크다운 없이, 처음 요청한 형식의 완전한 JSON 객체 하나만 처음부터 다시 보내줘."
+        ]},
+    ]
+
+
+def parse_plan_text(text: str, attempt: str = "first") -> dict:
+    """
+    Gemini 응답 텍스트를 여행 계획 dict 로 변환
+    코드 블록 / 앞뒤 설명 / 끝의 콤마는 고쳐서 읽고(loads_tolerant), TravelPlan 스키마로 검증합니다.
+    끊긴 출력은 남은 날짜만으로도 스키마를 통과해 요청보다 짧은 일정이 캐시될 수 있으므로 받아들이지 않습니다.
+
+    Raises:
+        InvalidPlanResponse: 고쳐도 JSON 이 아니거나, 출력이 끊겼거나, 스키마에 맞지 않는 경우
+    """
+    try:
+        data, repairs = loads_tolerant(text)
+        if "truncated" in repairs:
+            record_plan_response(attempt, "invalid", repairs)
+            raise InvalidPlanResponse("출력이 중간에 끊겨 JSON 이 완성되지 않았습니다")
+        plan = TravelPlan.model_validate(data)
+    except json.JSONDecodeError as e:
+        record_plan_response(attempt, "invalid")
+        raise InvalidPlanResponse(f"JSON 이 아닙니다: {e.msg} (위치 {e.pos})") from e
+    except ValidationError as e:
+        record_plan_response(attempt, "invalid", repairs)
+        problems = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()[:5])
+        raise InvalidPlanResponse(f"스키마와 다릅니다: {problems}") from e
+    record_plan_response(attempt, "repaired" if repairs else "ok", repairs)
+    return plan.model_dump()
+
+
+async def _generate_async(contents, operation: str) -> str:
+    """
+    Gemini 호출 한 번 (응답 텍스트 반환)
+    - 동시 호출 수를 세마포어로 제한하고, 호출마다 PLAN_TIMEOUT_SECONDS 데드라인 적용
+    - 일시적인 오류(transient_errors())는 지수 백오프로 PLAN_MAX_RETRIES 번까지 재시도
+    """
+    retryable = transient_errors()
+
+    for attempt in range(settings.PLAN_MAX_RETRIES + 1):
+        try:
+            async with _get_semaphore():
+                with time_gemini(operation):
+                    response = await asyncio.wait_for(
+                        get_model().generate_content_async(contents),
+                        timeout=settings.PLAN_TIMEOUT_SECONDS,
+                    )
+            record_gemini_usage(response)
+            return response.text
+
+        except retryable as e:
+            if attempt >= settings.PLAN_MAX_RETRIES:
+                print(f"Error in create_travel_plan_async (giving up after {attempt + 1} attempts): {e!r}")
+                raise
+            # 지수 백오프 + 지터 (동시에 실패한 요청들이 한꺼번에 재시도하지 않도록)
+            delay = settings.PLAN_RETRY_BACKOFF_SECONDS * (2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay))
+
+        except Exception as e:
+            print(f"Error in create_travel_plan_async: {e}")
+            raise
+
+
+async def parse_plan_or_reask(prompt: str, text: str) -> dict:
+    """
+    응답 텍스트를 여행 계획으로 변환하고, 고쳐 읽어도 쓸 수 없으면 이유를 알려주고 한 번만 다시 요청
+    (PLAN_REASK_ON_INVALID=false 면 다시 요청하지 않음)
+
+    Raises:
+        InvalidPlanResponse: 다시 요청한 응답도 스키마에 맞지 않을 경우
+    """
+    try:
+        return parse_plan_text(text)
+    except InvalidPlanResponse as e:
+        if not settings.PLAN_REASK_ON_INVALID:
+            raise
+        return await reask_plan(prompt, text, e)
+
+
+async def reask_plan(prompt: str, text: str, error: InvalidPlanResponse) -> dict:
+    """
+    쓸 수 없는 응답(text)과 그 이유(error)를 알려주고 한 번 다시 요청
+    (스트리밍처럼 다시 요청하기 전에 할 일이 있는 호출자는 parse_plan_text 후 직접 호출)
+
+    Raises:
+        InvalidPlanResponse: 다시 요청한 응답도 스키마에 맞지 않을 경우
+    """
+    print(f"Error in create_travel_plan_async (re-asking): {error}")
+    reply = await _generate_async(build_reask_contents(prompt, text, error), "reask")
+    return parse_plan_text(reply, attempt="reask")
+
+
+async def create_travel_plan_async(destination: str, schedule: str) -> dict:
+    """
+    여행지(destination)와 일정(schedule)을 받아 Gemini API를 통해 여행 계획을 생성합니다.
+    (동시 호출 제한 / 데드라인 / 재시도는 _generate_async, 응답 검증과 재요청은 parse_plan_or_reask)
+
+    Raises:
+        InvalidPlanResponse: 다시 요청한 응답도 스키마에 맞지 않을 경우
+        asyncio.TimeoutError: 재시도 후에도 데드라인을 넘긴 경우
+        Exception: API 호출 또는 기타 과정에서 오류 발생 시
+    """
+    prompt = build_plan_prompt(destination, schedule)
+    text = await _generate_async(prompt, "generate")
+    return await parse_plan_or_reask(prompt, text)
+
+
+async def stream_travel_plan_text(destination: str, schedule: str):
+    """
+    Gemini 스트리밍 생성으로 응답 텍스트를 도착하는 대로 yield
+    - 세마포어는 스트림이 끝날 때까지 유지하고, 청크 사이 간격에 PLAN_TIMEOUT_SECONDS 데드라인 적용
+    - 스트림이 시작된 뒤에는 재시도하지 않습니다 (이미 일부를 클라이언트에 보냈기 때문)
+    """
+    prompt = build_plan_prompt(destination, schedule)
+
+    async with _get_semaphore():
+        with time_gemini("stream"):
+            response = await asyncio.wait_for(
+                get_model().generate_content_async(prompt, stream=True),
+                timeout=settings.PLAN_TIMEOUT_SECONDS,
+            )
+            chunks = response.__aiter__()
+            chunk = None
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=settings.PLAN_TIMEOUT_SECONDS)
+                except StopAsyncIteration:
+                    break
+                if chunk.text:
+                    yield chunk.text
+        # 토큰 사용량은 마지막 청크에 담겨 옵니다.
+        record_gemini_usage(chunk)
@@ -0,0 +1,139 @@
+import asyncio
+import hashlib
+import json
+import unicodedata
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.plan import create_travel_plan_async
+from app.db.session import SessionLocal
+from app.models.plan_cache import PlanCache
+
+
+def _normalize(text: str) -> str:
+    """유니코드 정규화 + 공백 정리 + 대소문자 무시 ("제주도 ", "제주도" → 같은 키)"""
+    return " ".join(unicodedata.normalize("NFKC", text).split()).casefold()
+
+
+def plan_fingerprint(destination: str, schedule: str) -> str:
+    raw = json.dumps([_normalize(destination), _normalize(schedule)], ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class PlanCacheService:
+    """
+    여행 계획 2단 캐시 + single-flight
+    1) 프로세스 메모리 LRU/TTL
+    2) DB plan_cache 테이블 (zlib 압축 JSON)
+    3) 둘 다 없으면 Gemini 호출 — 같은 키의 동시 요청은 호출 하나를 공유
+    """
+
+    def __init__(self):
+        self.memory = TTLCache(settings.PLAN_CACHE_MAX_ENTRIES, settings.PLAN_CACHE_TTL_SECONDS)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "shared": 0,
+            "bypass": 0,
+        }
+
+    def stats(self) -> Dict[str, float]:
+        stats = dict(self._stats)
+        hits = stats["memory_hits"] + stats["db_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        stats["memory_entries"] = len(self.memory)
+        stats["inflight"] = len(self._inflight)
+        return stats
+
+    async def lookup(self, destination: str, schedule: str) -> Optional[dict]:
+        """메모리 → DB 순서로 캐시 조회 (없으면 None)"""
+        key = plan_fingerprint(destination, schedule)
+
+        plan = self.memory.get(key)
+        if plan is not None:
+            self._stats["memory_hits"] += 1
+            return plan
+
+        plan = await run_in_threadpool(self._load, key)
+        if plan is not None:
+            self._stats["db_hits"] += 1
+            self.memory.set(key, plan)
+            return plan
+
+        self._stats["misses"] += 1
+        return None
+
+    async def remember(self, destination: str, schedule: str, plan: dict) -> None:
+        """캐시를 거치지 않고 생성한 계획(스트리밍 등)을 두 캐시에 저장"""
+        key = plan_fingerprint(destination, schedule)
+        self.memory.set(key, plan)
+        try:
+            await run_in_threadpool(self._store, key, destination, schedule, plan)
+        except Exception as e:
+            # 영구 캐시 저장 실패는 응답에 영향을 주지 않습니다.
+            print(f"Error in PlanCacheService._store: {e}")
+
+    async def get_plan(self, destination: str, schedule: str, bypass: bool = False) -> dict:
+        """캐시된 여행 계획 반환, bypass=True 면 캐시를 무시하고 새로 생성"""
+        if bypass:
+            self._stats["bypass"] += 1
+        else:
+            plan = await self.lookup(destination, schedule)
+            if plan is not None:
+                return plan
+
+        key = plan_fingerprint(destination, schedule)
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["shared"] += 1
+        else:
+            # 요청한 클라이언트가 끊겨도 다른 대기자를 위해 생성은 계속되도록 별도 task 로 실행
+            task = asyncio.ensure_future(self._generate(destination, schedule))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _generate(self, destination: str, schedule: str) -> dict:
+        plan = await create_travel_plan_async(destination=destination, schedule=schedule)
+        await self.remember(destination, schedule, plan)
+        return plan
+
+    def _load(self, key: str) -> Optional[dict]:
+        db = SessionLocal()
+        try:
+            row = db.get(PlanCache, key)
+            if row is None or (row.expires_at is not None and row.expires_at < datetime.now()):
+                return None
+            return json.loads(zlib.decompress(row.payload))
+        except Exception as e:
+            print(f"Error in PlanCacheService._load: {e}")
+            return None
+        finally:
+            db.close()
+
+    def _store(self, key: str, destination: str, schedule: str, plan: dict) -> None:
+        payload = zlib.compress(json.dumps(plan, ensure_ascii=False).encode())
+        db = SessionLocal()
+        try:
+            db.merge(PlanCache(
+                key=key,
+                destination=destination[:255],
+                schedule=schedule[:255],
+                payload=payload,
+                created_at=datetime.now(),
+                expires_at=datetime.now() + timedelta(seconds=settings.PLAN_CACHE_DB_TTL_SECONDS),
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+
+plan_cache = PlanCacheService()
@@ -0,0 +1,320 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import closing
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.plan_cache import plan_cache
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    """대기 중인 작업이 PLAN_JOB_QUEUE_SIZE 를 넘은 경우"""
+
+
+@dataclass
+class PlanJob:
+    destination: str
+    schedule: str
+    refresh: bool = False
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = "queued"              # queued → running → succeeded / failed
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+
+class JobBackend(ABC):
+    """여행 계획 작업 큐 저장소 인터페이스"""
+
+    @abstractmethod
+    async def submit(self, job: PlanJob) -> None:
+        """작업 등록 (큐가 가득 차면 QueueFull)"""
+
+    @abstractmethod
+    async def claim(self) -> PlanJob:
+        """다음 대기 작업을 running 으로 바꿔 반환 (없으면 생길 때까지 대기)"""
+
+    @abstractmethod
+    async def finish(self, job: PlanJob) -> None:
+        """succeeded / failed 로 끝난 작업 저장"""
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[PlanJob]:
+        """작업 조회"""
+
+    @abstractmethod
+    async def depth(self) -> int:
+        """대기 중인 작업 수"""
+
+
+class InMemoryJobBackend(JobBackend):
+    """프로세스 메모리 큐 (단일 워커 프로세스용)"""
+
+    def __init__(self, max_size: int, retention_seconds: float):
+        self.retention_seconds = retention_seconds
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self._jobs: Dict[str, PlanJob] = {}
+
+    async def submit(self, job: PlanJob) -> None:
+        self._purge()
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFull()
+        self._jobs[job.id] = job
+
+    async def claim(self) -> PlanJob:
+        job = await self._queue.get()
+        job.status = "running"
+        job.updated_at = time.time()
+        return job
+
+    async def finish(self, job: PlanJob) -> None:
+        job.updated_at = time.time()
+        self._jobs[job.id] = job
+
+    async def get(self, job_id: str) -> Optional[PlanJob]:
+        return self._jobs.get(job_id)
+
+    async def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _purge(self) -> None:
+        """보관 기간이 지난 완료 작업 정리"""
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in ("succeeded", "failed") and job.updated_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class SQLiteJobBackend(JobBackend):
+    """
+    SQLite 파일 큐 — 외부 서비스 없이 여러 워커 프로세스가 같은 큐를 공유
+    running 상태로 PLAN_JOB_STALE_SECONDS 이상 멈춘 작업(죽은 워커)은 다시 가져갑니다.
+    """
+
+    def __init__(self, path: str, max_size: int, retention_seconds: float,
+                 stale_seconds: float, poll_interval: float = 0.2):
+        self.path = path
+        self.max_size = max_size
+        self.retention_seconds = retention_seconds
+        self.stale_seconds = stale_seconds
+        self.poll_interval = poll_interval
+        with closing(self._connect()) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS plan_job (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_plan_job_status ON plan_job (status, created_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _to_job(self, row: sqlite3.Row) -> PlanJob:
+        payload = json.loads(row["payload"])
+        return PlanJob(
+            id=row["id"],
+            status=row["status"],
+            destination=payload["destination"],
+            schedule=payload["schedule"],
+            refresh=payload.get("refresh", False),
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+        )
+
+    def _submit(self, job: PlanJob) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "DELETE FROM plan_job WHERE status IN ('succeeded', 'failed') AND updated_at < ?",
+                (time.time() - self.retention_seconds,),
+            )
+            (queued,) = conn.execute("SELECT COUNT(*) FROM plan_job WHERE status = 'queued'").fetchone()
+            if queued >= self.max_size:
+                conn.execute("ROLLBACK")
+                raise QueueFull()
+            payload = json.dumps(
+                {"destination": job.destination, "schedule": job.schedule, "refresh": job.refresh},
+                ensure_ascii=False,
+            )
+            conn.execute(
+                "INSERT INTO plan_job (id, status, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job.id, job.status, payload, job.created_at, job.updated_at),
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def _claim(self) -> Optional[PlanJob]:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                """
+                SELECT * FROM plan_job
+                WHERE status = 'queued' OR (status = 'running' AND updated_at < ?)
+                ORDER BY created_at LIMIT 1
+                """,
+                (now - self.stale_seconds,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE plan_job SET status = 'running', updated_at = ? WHERE id = ?",
+                (now, row["id"]),
+            )
+            conn.execute("COMMIT")
+            job = self._to_job(row)
+            job.status = "running"
+            job.updated_at = now
+            return job
+        finally:
+            conn.close()
+
+    def _finish(self, job: PlanJob) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE plan_job SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+                (
+                    job.status,
+                    json.dumps(job.result, ensure_ascii=False) if job.result is not None else None,
+                    job.error,
+                    time.time(),
+                    job.id,
+                ),
+            )
+
+    def _get(self, job_id: str) -> Optional[PlanJob]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM plan_job WHERE id = ?", (job_id,)).fetchone()
+            return self._to_job(row) if row else None
+
+    def _depth(self) -> int:
+        with closing(self._connect()) as conn:
+            (queued,) = conn.execute("SELECT COUNT(*) FROM plan_job WHERE status = 'queued'").fetchone()
+            return queued
+
+    async def submit(self, job: PlanJob) -> None:
+        await asyncio.to_thread(self._submit, job)
+
+    async def claim(self) -> PlanJob:
+        while True:
+            job = await asyncio.to_thread(self._claim)
+            if job is not None:
+                return job
+            await asyncio.sleep(self.poll_interval)
+
+    async def finish(self, job: PlanJob) -> None:
+        await asyncio.to_thread(self._finish, job)
+
+    async def get(self, job_id: str) -> Optional[PlanJob]:
+        return await asyncio.to_thread(self._get, job_id)
+
+    async def depth(self) -> int:
+        return await asyncio.to_thread(self._depth)
+
+
+def create_job_backend() -> JobBackend:
+    if settings.PLAN_JOB_BACKEND == "sqlite":
+        return SQLiteJobBackend(
+            path=settings.PLAN_JOB_SQLITE_PATH,
+            max_size=settings.PLAN_JOB_QUEUE_SIZE,
+            retention_seconds=settings.PLAN_JOB_RETENTION_SECONDS,
+            stale_seconds=settings.PLAN_JOB_STALE_SECONDS,
+        )
+    return InMemoryJobBackend(
+        max_size=settings.PLAN_JOB_QUEUE_SIZE,
+        retention_seconds=settings.PLAN_JOB_RETENTION_SECONDS,
+    )
+
+
+class PlanJobRunner:
+    """PLAN_JOB_WORKERS 개의 asyncio 워커가 큐에서 작업을 꺼내 여행 계획을 생성"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._backend: Optional[JobBackend] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def backend(self) -> JobBackend:
+        # asyncio.Queue 가 서버 이벤트 루프에서 만들어지도록 처음 사용할 때 생성
+        if self._backend is None:
+            self._backend = create_job_backend()
+        return self._backend
+
+    async def submit(self, destination: str, schedule: str, refresh: bool = False) -> PlanJob:
+        job = PlanJob(destination=destination, schedule=schedule, refresh=refresh)
+        await self.backend.submit(job)
+        return job
+
+    async def get(self, job_id: str) -> Optional[PlanJob]:
+        return await self.backend.get(job_id)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                job = await self.backend.claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("PlanJobRunner claim failed")
+                await asyncio.sleep(1)
+                continue
+
+            try:
+                job.result = await plan_cache.get_plan(job.destination, job.schedule, bypass=job.refresh)
+                job.status = "succeeded"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("PlanJobRunner job %s failed", job.id)
+                job.status = "failed"
+                job.error = str(e) or e.__class__.__name__
+
+            try:
+                await self.backend.finish(job)
+            except Exception:
+                logger.exception("PlanJobRunner finish %s failed", job.id)
+
+
+plan_job_runner = PlanJobRunner(settings.PLAN_JOB_WORKERS)
@@ -0,0 +1,105 @@
+import json
+import re
+from typing import List, Optional, Tuple
+
+_FENCE = re.compile(r"```[a-zA-Z]*\s*(.*?)\s*(?:```|$)", re.DOTALL)
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _scan(text: str, start: int) -> Tuple[Optional[int], int, List[str], List[int]]:
+    """
+    start 의 '{' 부터 문자열을 고려해 괄호를 따라감
+    → (최상위 객체가 닫힌 위치 + 1 또는 None, 마지막으로 컨테이너가 닫힌 위치 + 1,
+       그 시점에 열려 있던 컨테이너, 문자열 밖의 콤마 위치)
+    """
+    stack: List[str] = []
+    in_string = escape = False
+    last_close, open_at_close = start + 1, ["{"]
+    commas: List[int] = []
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append(ch)
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                return i + 1, i + 1, [], commas
+            last_close, open_at_close = i + 1, list(stack)
+        elif ch == ",":
+            commas.append(i)
+    return None, last_close, open_at_close, commas
+
+
+def _strip_trailing_commas(text: str, commas: List[int]) -> str:
+    """'}' / ']' 바로 앞(공백 제외)에 오는 콤마 제거"""
+    drop = set()
+    for i in commas:
+        j = i + 1
+        while j < len(text) and text[j].isspace():
+            j += 1
+        if j < len(text) and text[j] in "}]":
+            drop.add(i)
+    return "".join(ch for i, ch in enumerate(text) if i not in drop) if drop else text
+
+
+def loads_tolerant(text: str) -> Tuple[object, List[str]]:
+    """
+    LLM 이 만든 JSON 객체 텍스트를 읽되, 흔한 형식 오류는 고쳐서 읽음 → (값, 적용한 수리 목록)
+    - fence:          ```json ... ``` 코드 블록
+    - prose:          객체 앞뒤의 설명 문장
+    - trailing_comma: '}' / ']' 앞의 콤마
+    - truncated:      출력이 중간에 끊김 → 마지막으로 완성된 원소까지만 남기고 괄호를 닫음
+                      (내용이 빠진 값이므로 받아들일지는 호출자가 결정 — parse_plan_text 는 거절)
+
+    Raises:
+        json.JSONDecodeError: 고쳐도 JSON 으로 읽을 수 없는 경우
+    """
+    try:
+        return json.loads(text), []
+    except json.JSONDecodeError as e:
+        error = e
+
+    repairs: List[str] = []
+    body = text.strip()
+    fence = _FENCE.search(body)
+    if fence is not None:
+        body = fence.group(1)
+        repairs.append("fence")
+
+    start = body.find("{")
+    if start < 0:
+        raise error
+    end, last_close, still_open, commas = _scan(body, start)
+    if end is not None:
+        if body[:start].strip() or body[end:].strip():
+            repairs.append("prose")
+        candidate = body[start:end]
+    else:
+        # 끊긴 원소는 버리고 (마지막으로 닫힌 컨테이너까지) 남은 괄호를 역순으로 닫음
+        if body[:start].strip():
+            repairs.append("prose")
+        repairs.append("truncated")
+        candidate = body[start:last_close].rstrip().rstrip(",")
+        candidate += "".join(_CLOSERS[ch] for ch in reversed(still_open))
+
+    try:
+        return json.loads(candidate), repairs
+    except json.JSONDecodeError:
+        pass
+    kept = end if end is not None else last_close
+    fixed = _strip_trailing_commas(candidate, [i - start for i in commas if i < kept])
+    try:
+        value = json.loads(fixed)
+    except json.JSONDecodeError:
+        raise error
+    return value, repairs + ["trailing_comma"]
@@ -0,0 +1,81 @@
+import json
+from typing import List, Optional
+
+
+class PlanDayParser:
+    """
+    Gemini 가 스트리밍으로 보내는 여행 계획 JSON 을 조금씩 받아서
+    최상위 "plan" 배열의 원소(하루치 객체)가 닫히는 즉시 dict 로 돌려주는 증분 파서
+
+    >>> parser = PlanDayParser()
+    >>> parser.feed('{"plan": [{"day": 1, "pla')
+    []
+    >>> parser.feed('ces": []}, {"day"')
+    [{'day': 1, 'places': []}]
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._stack: List[str] = []         # 열린 컨테이너 ('{' / '[')
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: Optional[str] = None  # 최상위 객체에서 마지막으로 읽은 문자열
+        self._plan_depth: Optional[int] = None  # "plan" 배열이 열린 뒤의 스택 깊이
+        self._day_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[dict]:
+        """새 텍스트를 추가하고, 이번에 완성된 day 객체 목록 반환"""
+        self.text += chunk
+        days: List[dict] = []
+        text = self.text
+
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._last_key = text[self._string_start + 1:i]
+                continue
+
+            if ch == '"':
+                if self._stack:
+                    self._in_string = True
+                    self._string_start = i
+            elif ch in "{[":
+                # 코드 블록 표시나 앞뒤 설명 문장은 첫 '{' 전까지 무시됩니다.
+                if not self._stack and ch == "[":
+                    continue
+                if (
+                    ch == "{"
+                    and self._plan_depth is not None
+                    and len(self._stack) == self._plan_depth
+                ):
+                    self._day_start = i
+                self._stack.append(ch)
+                if ch == "[" and len(self._stack) == 2 and self._last_key == "plan":
+                    self._plan_depth = 2
+            elif ch in "}]":
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                if (
+                    ch == "}"
+                    and self._day_start is not None
+                    and self._plan_depth is not None
+                    and len(self._stack) == self._plan_depth
+                ):
+                    days.append(json.loads(text[self._day_start:i + 1]))
+                    self._day_start = None
+                elif ch == "]" and self._plan_depth is not None and len(self._stack) < self._plan_depth:
+                    self._plan_depth = None
+
+        self._pos = len(text)
+        return days
@@ -0,0 +1,257 @@
+import collections
+import hashlib
+import hmac
+import marshal
+import random
+import sys
+import threading
+import time
+import uuid
+from typing import Counter, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+# (파일, 함수 시작 줄, 함수 이름) — pstats 의 함수 키와 같은 형식
+FrameKey = Tuple[str, int, str]
+Stack = Tuple[FrameKey, ...]
+
+# 스레드가 일을 하지 않고 대기 중일 때의 최상단 프레임 (샘플에서 제외)
+_IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+def sign_profile_request(method: str, path: str, expires: int, secret: Optional[str] = None) -> str:
+    """X-Profile 헤더 값 "<만료 unix 시각>.<HMAC-SHA256>" 생성 (운영자가 프로파일 요청을 만들 때 사용)"""
+    key = (secret or settings.PROFILING_SECRET or "").encode()
+    message = f"{method.upper()} {path} {expires}".encode()
+    return f"{expires}.{hmac.new(key, message, hashlib.sha256).hexdigest()}"
+
+
+def verify_profile_header(value: str, method: str, path: str) -> bool:
+    if not settings.PROFILING_SECRET:
+        return False
+    expires, _, _ = value.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    expected = sign_profile_request(method, path, int(expires))
+    return hmac.compare_digest(expected.encode(), value.encode())
+
+
+class ProfileSession:
+    """요청 하나를 프로파일링하는 동안 모은 스레드별 스택 샘플"""
+
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.status: Optional[int] = None
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.interval = settings.PROFILING_INTERVAL_MS / 1000
+        self.samples: Dict[str, Counter[Stack]] = collections.defaultdict(collections.Counter)
+        self.sample_count = 0
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3),
+            "samples": self.sample_count,
+            "interval_ms": settings.PROFILING_INTERVAL_MS,
+        }
+
+    def to_speedscope(self) -> dict:
+        """https://www.speedscope.app 에서 열 수 있는 sampled profile (스레드별)"""
+        frames: List[dict] = []
+        frame_index: Dict[FrameKey, int] = {}
+        profiles = []
+        weight = self.interval * 1000
+        for thread_name, stacks in self.samples.items():
+            samples, weights = [], []
+            for stack, count in stacks.items():
+                indexes = []
+                for key in stack:
+                    index = frame_index.get(key)
+                    if index is None:
+                        index = frame_index[key] = len(frames)
+                        frames.append({"name": key[2], "file": key[0], "line": key[1]})
+                    indexes.append(index)
+                samples.append(indexes)
+                weights.append(count * weight)
+            profiles.append({
+                "type": "sampled",
+                "name": thread_name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.method} {self.path} ({self.id})",
+            "exporter": "galae-malae",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def to_pstats(self) -> bytes:
+        """
+        샘플로 계산한 pstats 데이터 (marshal) — pstats.Stats(파일) / snakeviz 로 열 수 있음
+        호출 횟수 대신 샘플 수가 들어가고, 시간은 샘플 수 × 샘플 간격입니다.
+        """
+        stats: Dict[FrameKey, list] = {}
+        callers: Dict[FrameKey, Dict[FrameKey, list]] = collections.defaultdict(dict)
+        for stacks in self.samples.values():
+            for stack, count in stacks.items():
+                seconds = count * self.interval
+                for key in set(stack):  # 재귀 호출은 누적 시간에 한 번만 더함
+                    entry = stats.setdefault(key, [0, 0, 0.0, 0.0])
+                    entry[0] += count
+                    entry[1] += count
+                    entry[3] += seconds
+                stats[stack[-1]][2] += seconds
+                for caller, callee in set(zip(stack, stack[1:])):
+                    edge = callers[callee].setdefault(caller, [0, 0, 0.0, 0.0])
+                    edge[0] += count
+                    edge[1] += count
+                    edge[3] += seconds
+                if len(stack) > 1:
+                    callers[stack[-1]][stack[-2]][2] += seconds
+        return marshal.dumps({
+            key: (cc, nc, tt, ct, {caller: tuple(edge) for caller, edge in callers[key].items()})
+            for key, (cc, nc, tt, ct) in stats.items()
+        })
+
+
+class SamplingProfiler:
+    """
+    요청 단위 샘플링 프로파일러
+    - 프로파일링 중인 요청이 있을 때만 샘플러 스레드가 PROFILING_INTERVAL_MS 마다 모든 스레드의 스택을 수집
+      (이벤트 루프 + 스레드풀에서 실행되는 동기 코드 모두 포함, 대기 중인 스레드는 제외)
+    - 같은 시간에 처리 중인 다른 요청의 스택도 함께 잡힐 수 있습니다.
+    - 완료된 프로파일은 최근 PROFILING_RING_SIZE 개만 메모리에 보관
+    """
+
+    def __init__(self, ring_size: int):
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.profiles: collections.deque = collections.deque(maxlen=ring_size)
+        self._active: Dict[str, ProfileSession] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or bool(settings.PROFILING_SECRET)
+
+    def should_profile(self, scope) -> bool:
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return True
+        if settings.PROFILING_SECRET:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return verify_profile_header(value.decode("latin-1"), scope["method"], scope["path"])
+        return False
+
+    def start(self, method: str, path: str) -> ProfileSession:
+        session = ProfileSession(method, path)
+        with self._lock:
+            self._active[session.id] = session
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        return session
+
+    def finish(self, session: ProfileSession) -> None:
+        session.duration = time.time() - session.started_at
+        with self._lock:
+            self._active.pop(session.id, None)
+        self.profiles.append(session)
+
+    def get(self, profile_id: str) -> Optional[ProfileSession]:
+        for session in list(self.profiles):
+            if session.id == profile_id:
+                return session
+        return None
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        interval = settings.PROFILING_INTERVAL_MS / 1000
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks = {}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = _stack(frame)
+                if stack:
+                    stacks[names.get(thread_id, str(thread_id))] = stack
+            # finish() 이후에는 세션에 샘플이 더해지지 않도록 락 안에서 기록
+            with self._lock:
+                if not self._active:
+                    # 프로파일링 중인 요청이 없으면 스레드 종료 (평소에는 비용 없음)
+                    self._thread = None
+                    return
+                for session in self._active.values():
+                    session.sample_count += 1
+                    for thread_name, stack in stacks.items():
+                        session.samples[thread_name][stack] += 1
+            time.sleep(interval)
+
+
+def _stack(frame) -> Optional[Stack]:
+    """가장 바깥 프레임부터의 스택 (대기 중인 스레드는 None)"""
+    code = frame.f_code
+    if (code.co_filename.rsplit("/", 1)[-1], code.co_name) in _IDLE_LEAVES:
+        return None
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+class ProfilingMiddleware:
+    """
+    서명된 X-Profile 헤더가 있거나 PROFILING_SAMPLE_RATE 확률에 걸린 요청만 프로파일링
+    (그 외 요청은 sample_rate / 헤더 확인만 하고 그대로 통과)
+    프로파일링된 요청의 응답에는 X-Profile-Id 헤더가 붙습니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not request_profiler.enabled or not request_profiler.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        session = request_profiler.start(scope["method"], scope["path"])
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                session.status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (PROFILE_ID_HEADER, session.id.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_profiler.finish(session)
+
+
+request_profiler = SamplingProfiler(settings.PROFILING_RING_SIZE)
@@ -0,0 +1,307 @@
+import asyncio
+import json
+import math
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from app.core.auth import decode_token
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """capacity 개까지 쌓이고 period_seconds 동안 capacity 개가 다시 채워지는 토큰 버킷"""
+    capacity: int
+    period_seconds: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period_seconds
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimitRule":
+        """'20/60' → 60초에 20회 (순간적으로도 20회까지)"""
+        capacity, _, period = spec.partition("/")
+        rule = cls(int(capacity), float(period))
+        if rule.capacity < 1 or rule.period_seconds <= 0:
+            raise ValueError(f"invalid rate limit {spec!r} (expected '<capacity>/<period seconds>')")
+        return rule
+
+
+@dataclass
+class Decision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float      # 버킷이 가득 찰 때까지 남은 초
+    retry_after: float      # 거절된 경우 토큰 1개가 생길 때까지 남은 초
+
+    def headers(self) -> List[Tuple[bytes, bytes]]:
+        headers = [
+            (b"x-ratelimit-limit", str(self.limit).encode()),
+            (b"x-ratelimit-remaining", str(self.remaining).encode()),
+            (b"x-ratelimit-reset", str(math.ceil(self.reset_after)).encode()),
+        ]
+        if not self.allowed:
+            headers.append((b"retry-after", str(max(1, math.ceil(self.retry_after))).encode()))
+        return headers
+
+
+def _take(tokens: float, elapsed: float, rule: RateLimitRule) -> Tuple[float, Decision]:
+    """elapsed 초 동안 채운 뒤 토큰 1개를 꺼냄 → (남은 토큰, 판정)"""
+    rate = rule.refill_per_second
+    tokens = min(float(rule.capacity), tokens + max(0.0, elapsed) * rate)
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    return tokens, Decision(
+        allowed=allowed,
+        limit=rule.capacity,
+        remaining=int(tokens),
+        reset_after=(rule.capacity - tokens) / rate,
+        retry_after=0.0 if allowed else (1 - tokens) / rate,
+    )
+
+
+class BucketStore(ABC):
+    """토큰 버킷 저장소 인터페이스 (key = '<route>|<client>')"""
+
+    @abstractmethod
+    async def take(self, key: str, rule: RateLimitRule) -> Decision:
+        """토큰 1개를 꺼내고 판정 반환 (버킷이 없으면 가득 찬 버킷에서 시작)"""
+
+
+class InMemoryBucketStore(BucketStore):
+    """
+    프로세스 메모리 버킷 (기본값, 워커 프로세스마다 따로 셈)
+    I/O 없이 dict 조회 + 산술 몇 번이라 요청 경로에 지연을 더하지 않습니다.
+    max_buckets 를 넘으면 가장 오래 쓰지 않은 버킷부터 버림 (버려진 클라이언트는 가득 찬 버킷에서 다시 시작)
+    """
+
+    def __init__(self, max_buckets: int):
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take_now(self, key: str, rule: RateLimitRule) -> Decision:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens, decision = _take(float(rule.capacity), 0.0, rule)
+                self._buckets[key] = [tokens, now]
+                if len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                bucket[0], decision = _take(bucket[0], now - bucket[1], rule)
+                bucket[1] = now
+                self._buckets.move_to_end(key)
+            return decision
+
+    async def take(self, key: str, rule: RateLimitRule) -> Decision:
+        return self.take_now(key, rule)
+
+
+class SQLiteBucketStore(BucketStore):
+    """
+    SQLite 파일 버킷 — 같은 호스트의 여러 워커 프로세스가 한 클라이언트의 한도를 함께 씀
+    판정 한 번이 짧은 쓰기 트랜잭션 하나이며, 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+    retention_seconds 동안 쓰이지 않은 버킷은 cleanup_every 번 판정마다 한 번 지움
+    """
+
+    def __init__(self, path: str, retention_seconds: float, cleanup_every: int = 1000):
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self.cleanup_every = cleanup_every
+        self._calls = 0
+        self._local = threading.local()
+        with closing(sqlite3.connect(self.path, timeout=5, isolation_level=None)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rate_limit_bucket (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limit_bucket_updated_at ON rate_limit_bucket (updated_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        스레드별로 열어 둔 연결 (판정마다 연결을 새로 열지 않음)
+        WAL + synchronous=NORMAL 이라 커밋마다 fsync 하지 않습니다 (전원이 꺼지면 마지막 몇 건의 차감만 잃음).
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _take(self, key: str, rule: RateLimitRule, cleanup: bool) -> Decision:
+        # 여러 프로세스가 같이 쓰므로 monotonic 대신 벽시계 시간
+        now = time.time()
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if cleanup:
+                conn.execute("DELETE FROM rate_limit_bucket WHERE updated_at < ?", (now - self.retention_seconds,))
+            row = conn.execute("SELECT tokens, updated_at FROM rate_limit_bucket WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                tokens, decision = _take(float(rule.capacity), 0.0, rule)
+            else:
+                tokens, decision = _take(row[0], now - row[1], rule)
+            conn.execute(
+                "INSERT INTO rate_limit_bucket (key, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (key, tokens, now),
+            )
+            conn.execute("COMMIT")
+            return decision
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    async def take(self, key: str, rule: RateLimitRule) -> Decision:
+        self._calls += 1
+        return await asyncio.to_thread(self._take, key, rule, self._calls % self.cleanup_every == 0)
+
+
+def create_bucket_store() -> BucketStore:
+    if settings.RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteBucketStore(
+            path=settings.RATE_LIMIT_SQLITE_PATH,
+            retention_seconds=settings.RATE_LIMIT_SQLITE_RETENTION_SECONDS,
+        )
+    return InMemoryBucketStore(max_buckets=settings.RATE_LIMIT_MAX_BUCKETS)
+
+
+def _parse_rules(routes: Dict[str, str]) -> Dict[Tuple[str, str], RateLimitRule]:
+    """{ 'POST /api/v1/plan/plan': '20/60' } → { ('POST', '/api/v1/plan/plan'): RateLimitRule }"""
+    rules = {}
+    for route, spec in routes.items():
+        method, _, path = route.strip().partition(" ")
+        rules[(method.upper(), path.strip())] = RateLimitRule.parse(spec)
+    return rules
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def client_key(scope) -> str:
+    """
+    클라이언트 식별자 — 유효한 Bearer 토큰이면 JWT sub, 아니면 클라이언트 IP
+    (토큰 검증은 auth 의 token_cache 를 거치므로 이미 본 토큰은 서명 검증을 다시 하지 않음)
+    """
+    authorization = _header(scope, b"authorization")
+    if authorization:
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and token:
+            payload = decode_token(token.strip())
+            if payload is not None and payload.get("sub"):
+                return f"sub:{payload['sub']}"
+    if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = _header(scope, b"x-forwarded-for")
+        if forwarded:
+            return f"ip:{forwarded.split(',')[0].strip()}"
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimiter:
+    """라우트별 규칙 + 버킷 저장소 + 판정 통계"""
+
+    def __init__(self, rules: Dict[Tuple[str, str], RateLimitRule], store: BucketStore):
+        self.rules = rules
+        self.store = store
+        self.allowed: Dict[str, int] = {f"{method} {path}": 0 for method, path in rules}
+        self.limited: Dict[str, int] = dict(self.allowed)
+
+    def rule_for(self, method: str, path: str) -> Optional[RateLimitRule]:
+        return self.rules.get((method, path))
+
+    async def check(self, method: str, path: str, client: str) -> Decision:
+        rule = self.rules[(method, path)]
+        route = f"{method} {path}"
+        decision = await self.store.take(f"{route}|{client}", rule)
+        if decision.allowed:
+            self.allowed[route] += 1
+        else:
+            self.limited[route] += 1
+        return decision
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            route: {
+                "capacity": rule.capacity,
+                "period_seconds": rule.period_seconds,
+                "allowed": self.allowed[route],
+                "limited": self.limited[route],
+            }
+            for route, rule in ((f"{method} {path}", rule) for (method, path), rule in self.rules.items())
+        }
+
+
+rate_limiter = RateLimiter(_parse_rules(settings.RATE_LIMIT_ROUTES), create_bucket_store())
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, float]]:
+    return rate_limiter.stats()
+
+
+class RateLimitMiddleware:
+    """
+    RATE_LIMIT_ROUTES 에 있는 라우트에 클라이언트별 토큰 버킷 한도 적용
+    - 통과한 응답에는 X-RateLimit-Limit / -Remaining / -Reset 헤더를 붙임
+    - 한도를 넘으면 본문을 읽기 전에 429 + Retry-After 로 거절
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        method, path = scope["method"], scope["path"]
+        if rate_limiter.rule_for(method, path) is None:
+            await self.app(scope, receive, send)
+            return
+
+        decision = await rate_limiter.check(method, path, client_key(scope))
+        if not decision.allowed:
+            await self._reject(send, decision)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), *decision.headers()]}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _reject(self, send, decision: Decision) -> None:
+        body = json.dumps({"detail": "요청 한도를 초과했습니다. 잠시 후 다시 시도해 주세요."}, ensure_ascii=False).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *decision.headers(),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
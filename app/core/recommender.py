@@ -0,0 +1,254 @@
+import threading
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.geo import GeoIndex
+from app.models import Destination, DestinationTag, Tag
+
+# (위도, 경도, 반경 km) — "내 위치에서 X km 이내" 필터
+GeoFilter = Tuple[float, float, float]
+
+
+@dataclass(frozen=True)
+class ScoreMatrix:
+    """
+    destination_tag.score 를 메모리에 올린 destination × tag 밀집 행렬 스냅샷
+    한 번 만들어진 스냅샷은 수정하지 않고, refresh 시 통째로 교체합니다.
+    """
+    version: int
+    dest_ids: np.ndarray          # (D,) destination.id, 오름차순
+    tag_index: Dict[str, int]     # tag.name → 열 번호
+    scores: np.ndarray            # (D, T) int64, destination_tag.score 합
+    present: np.ndarray           # (D, T) bool, destination_tag 행 존재 여부
+    destinations: List[Dict]      # 행 번호 → 응답용 destination 컬럼
+    geo: GeoIndex                 # 위경도 격자 인덱스 (행 번호 기준)
+
+    @property
+    def size(self) -> int:
+        return int(self.dest_ids.shape[0])
+
+    @property
+    def chunk_rows(self) -> int:
+        """
+        top_n_many 가 한 번에 채점할 프로필 수
+        chunk 마다 (n, D) int64 점수 + int32 일치 수 + bool 후보 행렬이 생기므로
+        RECOMMEND_CHUNK_BYTES 안에 들어가도록 여행지 수에 맞춰 정합니다.
+        """
+        return max(1, settings.RECOMMEND_CHUNK_BYTES // (max(self.size, 1) * (8 + 4 + 1)))
+
+    def profile_vector(self, profile: Dict[str, int]) -> np.ndarray:
+        """{ tag_name: weight } → (T,) 가중치 벡터 (행렬에 없는 태그는 무시)"""
+        vec = np.zeros(len(self.tag_index), dtype=np.int64)
+        for tag_name, weight in profile.items():
+            col = self.tag_index.get(tag_name)
+            if col is not None:
+                vec[col] += weight
+        return vec
+
+    def rows_near(self, near: GeoFilter) -> np.ndarray:
+        """반경 안에 있는 행 번호 (오름차순)"""
+        rows, _ = self.geo.within(*near)
+        return np.sort(rows)
+
+    def top_n(self, vec: np.ndarray, top_n: int, rows: Optional[np.ndarray] = None) -> List[Dict]:
+        """
+        가중치 벡터 한 개에 대해 행렬-벡터 곱으로 점수를 계산하고
+        argpartition 으로 상위 top_n 만 골라 정렬합니다.
+        rows 가 주어지면 그 행(예: 반경 안의 여행지)만 후보로 사용합니다.
+        """
+        cols = np.flatnonzero(vec)
+        if cols.size == 0 or top_n <= 0:
+            return []
+
+        # 프로필 태그 중 하나라도 destination_tag 행이 있는 destination 만 후보
+        if rows is None:
+            candidates = np.flatnonzero(self.present[:, cols].any(axis=1))
+        else:
+            candidates = rows[self.present[rows][:, cols].any(axis=1)]
+        if candidates.size == 0:
+            return []
+
+        totals = self.scores[candidates][:, cols] @ vec[cols]
+        return self._select(candidates, totals, top_n)
+
+    def top_n_many(self, profiles: np.ndarray, top_n: int, chunk_size: Optional[int] = None) -> List[List[Dict]]:
+        """
+        (N, T) 가중치 행렬을 chunk 단위 행렬-행렬 곱으로 한 번에 점수 계산
+        결과는 top_n() 을 행마다 호출한 것과 동일합니다.
+        chunk_size 를 주지 않으면 chunk_rows (메모리 예산 기준) 를 사용합니다.
+        """
+        chunk_size = chunk_size or self.chunk_rows
+        results: List[List[Dict]] = []
+        present = self.present.astype(np.int32)
+        for start in range(0, profiles.shape[0], chunk_size):
+            block = profiles[start:start + chunk_size]
+            totals = block @ self.scores.T                               # (n, D)
+            hits = (block != 0).astype(np.int32) @ present.T > 0         # (n, D)
+            for row_totals, row_hits in zip(totals, hits):
+                candidates = np.flatnonzero(row_hits)
+                if candidates.size == 0 or top_n <= 0:
+                    results.append([])
+                    continue
+                results.append(self._select(candidates, row_totals[candidates], top_n))
+        return results
+
+    def _select(self, candidates: np.ndarray, totals: np.ndarray, top_n: int) -> List[Dict]:
+        k = min(top_n, candidates.size)
+        if k < candidates.size:
+            part = np.argpartition(-totals, k - 1)[:k]
+            # 경계값과 같은 점수가 잘려 나가지 않도록 동점자는 모두 포함한 뒤 정렬
+            threshold = totals[part].min()
+            part = np.flatnonzero(totals >= threshold)
+        else:
+            part = np.arange(candidates.size)
+
+        # 점수 내림차순, 동점이면 destination.id 오름차순
+        order = np.lexsort((candidates[part], -totals[part]))[:k]
+        return [
+            {**self.destinations[candidates[part[i]]], "score": int(totals[part[i]])}
+            for i in order
+        ]
+
+
+class RecommendationEngine:
+    """
+    destination_tag 점수 행렬을 프로세스 메모리에 캐시하는 추천 엔진
+    - 최초 사용 시 한 번 로드하고, 이후 요청은 DB 조회 없이 행렬 연산만 수행
+    - 점수 데이터가 바뀌면 invalidate() / refresh() 로 재시작 없이 반영
+    """
+
+    def __init__(self):
+        self._matrix: Optional[ScoreMatrix] = None
+        self._version = 0
+        self._started = 0        # 시작한 로드 번호
+        self._swapped = 0        # 마지막으로 교체한 로드 번호
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._matrix is not None
+
+    @property
+    def version(self) -> Optional[int]:
+        """현재 스냅샷 버전 (로드 전이거나 invalidate 된 경우 None)"""
+        matrix = self._matrix
+        return matrix.version if matrix is not None else None
+
+    def load(self, db: Session) -> ScoreMatrix:
+        """
+        DB에서 destination / tag / destination_tag 를 읽어 새 스냅샷을 만든 뒤 교체
+        읽고 만드는 동안은 잠그지 않으므로 다른 요청은 기존 스냅샷으로 계속 응답하며,
+        교체만 잠금 안에서 합니다. (동시에 로드가 여러 번 돌면 나중에 시작한 로드의 결과만 남김)
+        """
+        with self._lock:
+            self._started += 1
+            ticket = self._started
+        matrix = self._build(db)
+        with self._lock:
+            if ticket < self._swapped and self._matrix is not None:
+                return self._matrix
+            self._version += 1
+            self._swapped = ticket
+            self._matrix = replace(matrix, version=self._version)
+            return self._matrix
+
+    def _build(self, db: Session) -> ScoreMatrix:
+        """새 스냅샷 생성 (version 은 load 에서 교체할 때 부여)"""
+        dest_rows = db.execute(
+            select(
+                Destination.id,
+                Destination.name,
+                Destination.description,
+                Destination.country,
+                Destination.latitude,
+                Destination.longitude,
+            )
+            .where(Destination.deleted_at.is_(None))
+            .order_by(Destination.id)
+        ).all()
+        tag_rows = db.execute(select(Tag.id, Tag.name)).all()
+        dt_rows = db.execute(
+            select(DestinationTag.destination_id, DestinationTag.tag_id, DestinationTag.score)
+        ).all()
+
+        dest_ids = np.array([row.id for row in dest_rows], dtype=np.int64)
+        destinations = [
+            {
+                "name": row.name,
+                "description": row.description,
+                "country": row.country,
+                "latitude": row.latitude,
+                "longitude": row.longitude,
+            }
+            for row in dest_rows
+        ]
+
+        # 같은 이름의 태그가 여러 개면 한 열로 합칩니다 (기존 쿼리와 동일한 의미)
+        tag_index: Dict[str, int] = {}
+        tagid_to_col: Dict[int, int] = {}
+        for row in tag_rows:
+            col = tag_index.setdefault(row.name, len(tag_index))
+            tagid_to_col[row.id] = col
+
+        scores = np.zeros((dest_ids.size, len(tag_index)), dtype=np.int64)
+        present = np.zeros((dest_ids.size, len(tag_index)), dtype=bool)
+
+        if dt_rows and dest_ids.size:
+            raw = np.array(
+                [(r.destination_id, tagid_to_col.get(r.tag_id, -1), r.score or 0) for r in dt_rows],
+                dtype=np.int64,
+            ).reshape(-1, 3)
+            rows = np.searchsorted(dest_ids, raw[:, 0])
+            rows = np.minimum(rows, dest_ids.size - 1)
+            valid = (dest_ids[rows] == raw[:, 0]) & (raw[:, 1] >= 0)
+            rows, cols, vals = rows[valid], raw[valid, 1], raw[valid, 2]
+            np.add.at(scores, (rows, cols), vals)
+            present[rows, cols] = True
+
+        geo = GeoIndex.build(
+            np.array([np.nan if d["latitude"] is None else d["latitude"] for d in destinations], dtype=np.float64),
+            np.array([np.nan if d["longitude"] is None else d["longitude"] for d in destinations], dtype=np.float64),
+            settings.GEO_CELL_DEGREES,
+        )
+
+        return ScoreMatrix(
+            version=0,
+            dest_ids=dest_ids,
+            tag_index=tag_index,
+            scores=scores,
+            present=present,
+            destinations=destinations,
+            geo=geo,
+        )
+
+    def get(self, db: Session) -> ScoreMatrix:
+        """
+        현재 스냅샷 반환 (없으면 로드)
+        기동 시에는 워밍업이 먼저 로드하고 요청은 warmup.wait_until_ready 로 그때까지 기다리므로,
+        여기서 로드하는 경우는 invalidate() 직후 정도입니다.
+        """
+        matrix = self._matrix
+        return matrix if matrix is not None else self.load(db)
+
+    def refresh(self, db: Session) -> ScoreMatrix:
+        """점수 데이터를 즉시 다시 읽어 스냅샷 교체"""
+        return self.load(db)
+
+    def invalidate(self) -> None:
+        """스냅샷을 버리고 다음 요청에서 다시 로드하도록 표시"""
+        with self._lock:
+            self._matrix = None
+
+    def recommend(self, profile: Dict[str, int], db: Session, top_n: int = 3,
+                  near: Optional[GeoFilter] = None) -> List[Dict]:
+        matrix = self.get(db)
+        rows = matrix.rows_near(near) if near is not None else None
+        return matrix.top_n(matrix.profile_vector(profile), top_n, rows)
+
+
+recommendation_engine = RecommendationEngine()
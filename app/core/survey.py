@@ -1,93 +1,154 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
+import math
+import numpy as np
+import orjson
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import Integer, String, and_, func, literal, or_, select, union_all
+from app.core.config import settings
+from app.core.geo import bounding_box, haversine_threshold
+from app.core.recommender import GeoFilter, recommendation_engine
+from app.core.survey_model import QUESTION_TAG_MAP, QUESTION_WEIGHTS, CompiledSurveyModel, survey_model
 from app.models import DestinationTag, Destination, Tag
+from app.schemas.survey import SurveyResult
 
-# 1) 설문 문항 → 태그 raw 매핑 (0/1)
-QUESTION_TAG_MAP: Dict[str, Dict[str, Dict[str, int]]] = {
-    "q1": {"A": {"sightseeing": 1}, "B": {"relaxation": 1}},
-    "q2": {"A": {"beach": 1},       "B": {"mountain": 1}},
-    "q3": {
-        "A": {"solo": 1},   "B": {"friends": 1},
-        "C": {"family": 1}, "D": {"couple": 1}
-    },
-    "q4": {"A": {"warm": 1}, "B": {"comfortable": 1}, "C": {"cool": 1}, "D": {"cold": 1}},
-    "q5": {"A": {"traditional": 1}, "B": {"fusion": 1}, "C": {"street": 1},  "D": {"vegan": 1}},
-    "q6": {"A": {"car": 1},      "B": {"public": 1},     "C": {"walk": 1},    "D": {"bus": 1}},
-    "q7": {"A": {"leisure": 1},  "B": {"normal": 1},     "C": {"tight": 1},   "D": {"spontaneous": 1}},
-}
-
-# 2) 문항별 가중치
-QUESTION_WEIGHTS: Dict[str, int] = {
-    "q1": 3,
-    "q2": 2,
-    **{f"q{i}": 1 for i in range(3, 8)}
-}
-
-
-def build_profile(answers: Dict[str, str]) -> Dict[str, int]:
+
+def build_profile(answers: Dict[str, str], model: Optional[CompiledSurveyModel] = None) -> Dict[str, int]:
     """
     설문 응답(answers)으로부터 사용자 태그 가중치 프로필 반환
     :param answers: { "q1": "A", ..., "q7": "D" }
+    :param model: 채점 모델 스냅샷 (없으면 현재 활성화된 모델)
     :return: { "beach": weight, "sightseeing": weight, ... }
     """
-    profile: Dict[str, int] = {}
-    for q_key, choice in answers.items():
-        tag_map = QUESTION_TAG_MAP.get(q_key, {})
-        tags = tag_map.get(choice, {})
-        weight = QUESTION_WEIGHTS.get(q_key, 1)
-        for tag_name, raw_val in tags.items():
-            profile[tag_name] = profile.get(tag_name, 0) + raw_val * weight
-    return profile
+    return (model or survey_model.current).profile(answers)
 
 
-def run_recommendation(profile: Dict[str, int], db: Session, top_n: int = 3) -> List[Dict[str, int]]:
+def build_profile_matrix(answers_list: List[Dict[str, str]], tag_index: Dict[str, int],
+                         model: Optional[CompiledSurveyModel] = None) -> np.ndarray:
+    """
+    여러 설문 응답을 한 번에 (N, T) 태그 가중치 행렬로 변환 (build_profile 의 벡터화 버전)
+    :param answers_list: [ { "q1": "A", ..., "q7": "D" }, ... ]
+    :param tag_index: { tag_name: 열 번호 } (점수 행렬의 태그 인덱스)
+    :param model: 채점 모델 스냅샷 (없으면 현재 활성화된 모델)
+    :return: 행 i 가 answers_list[i] 의 프로필인 int64 행렬
+    """
+    return (model or survey_model.current).profile_matrix(answers_list, tag_index)
+
+
+def serialize_result(recs: List[Dict], model_version: int) -> bytes:
+    """
+    추천 결과를 SurveyResult 스키마로 검증한 뒤 orjson 으로 직렬화한 응답 본문
+    (응답 스키마에 맞지 않는 데이터면 ValueError)
+    """
+    result = SurveyResult(recommendations=recs, model_version=model_version)
+    return orjson.dumps(result.model_dump())
+
+
+def run_recommendation(profile: Dict[str, int], db: Session, top_n: int = 3,
+                       near: Optional[GeoFilter] = None) -> List[Dict[str, int]]:
     """
     사용자 프로필을 바탕으로 DB에서 destination_tag.score 가져와 내적 계산 후 상위 top_n 추천
     :param profile: 사용자 { tag_name: weight }
     :param db: SQLAlchemy Session
     :param top_n: 추천 개수
+    :param near: (위도, 경도, 반경 km) 가 주어지면 반경 안의 여행지만 추천
     :return: [ { "name": str, "score": int }, ... ]
     """
-    # 1) 관심 있는 태그 ID 목록 조회
-    tag_names = list(profile.keys())
-    tag_rows = db.execute(select(Tag.id, Tag.name).where(Tag.name.in_(tag_names))).all()
-    tagid_to_name = {row.id: row.name for row in tag_rows}
-    tag_ids = list(tagid_to_name.keys())
+    # 메모리 행렬 모드: 점수 행렬을 한 번만 로드하고 행렬-벡터 곱으로 계산
+    if settings.RECOMMENDATION_MODE == "memory":
+        return recommendation_engine.recommend(profile, db, top_n, near)
 
-    if not tag_ids:
-        return []
+    # SQL 모드: 점수 계산/정렬/상위 top_n 을 DB 한 번의 쿼리로 처리
+    return run_recommendation_sql(profile, db, top_n, near)
+
+
+def within_radius(near: GeoFilter):
+    """
+    destination 이 (위도, 경도, 반경 km) 안에 있는지 판정하는 SQL 조건
+    위경도 범위(bounding box)로 먼저 거르고 haversine 식으로 정확히 판정합니다. (메모리 격자 인덱스와 같은 기준)
+    """
+    lat, lng, radius_km = near
+    lat_lo, lat_hi, lng_ranges = bounding_box(lat, lng, radius_km)
+    conditions = [Destination.latitude.between(lat_lo, lat_hi)]
+    if lng_ranges is not None:
+        conditions.append(or_(*(Destination.longitude.between(lo, hi) for lo, hi in lng_ranges)))
+
+    to_rad = math.pi / 180
+    dlat = (Destination.latitude - lat) * to_rad
+    dlng = (Destination.longitude - lng) * to_rad
+    a = (
+        func.sin(dlat / 2) * func.sin(dlat / 2)
+        + math.cos(lat * to_rad) * func.cos(Destination.latitude * to_rad) * func.sin(dlng / 2) * func.sin(dlng / 2)
+    )
+    conditions.append(a <= haversine_threshold(radius_km))
+    return and_(*conditions)
 
-    # 2) destination_tag에서 raw_score 조회 (모델에 score 컬럼 사용)
-    rows = db.execute(
+
+def recommendation_query(profile: Dict[str, int], top_n: int, near: Optional[GeoFilter] = None):
+    """
+    SQL 모드 추천 쿼리 (app.db.query_plan 에서 실행 계획 확인에도 사용)
+    destination_tag 는 (tag_id, destination_id, score) 커버링 인덱스만으로 읽도록 설계되어 있습니다.
+    """
+    # 1) { tag_name: weight } → (SELECT :name, :weight UNION ALL ...) 파생 테이블
+    weight_rows = [
+        select(literal(tag_name, String).label("tag_name"), literal(weight, Integer).label("weight"))
+        for tag_name, weight in profile.items()
+    ]
+    weights = (union_all(*weight_rows) if len(weight_rows) > 1 else weight_rows[0]).subquery("profile")
+
+    # 2) 조인 + 집계 + 정렬 + LIMIT
+    total_score = func.sum(DestinationTag.score * weights.c.weight).label("score")
+    stmt = (
         select(
-            DestinationTag.destination_id,
-            DestinationTag.score,
-            DestinationTag.tag_id
-        ).where(DestinationTag.tag_id.in_(tag_ids))
-    ).all()
-
-    # 3) 내적 계산: destination_id 별 누적 점수
-    scores: Dict[int, int] = {}
-    for dest_id, raw_score, tag_id in rows:
-        tag_name = tagid_to_name.get(tag_id)
-        user_weight = profile.get(tag_name, 0)
-        scores[dest_id] = scores.get(dest_id, 0) + raw_score * user_weight
-
-    # 4) 상위 top_n dest_id 추출
-    top_dest = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_n]
-
-    # 5) destination 이름 조회 및 결과 포맷
-    recommendations: List[Dict[str, int]] = []
-    for dest_id, total_score in top_dest:
-        dest = db.get(Destination, dest_id)
-        if dest:
-            recommendations.append({
-                "name": dest.name,
-                "description": dest.description,
-                "country" : dest.country,
-                "latitude" : dest.latitude,                
-                "longitude" : dest.longitude,
-                "score": total_score
-            })
-    return recommendations
+            Destination.id,
+            Destination.name,
+            Destination.description,
+            Destination.country,
+            Destination.latitude,
+            Destination.longitude,
+            total_score,
+        )
+        .select_from(DestinationTag)
+        .join(Tag, Tag.id == DestinationTag.tag_id)
+        .join(weights, weights.c.tag_name == Tag.name)
+        .join(Destination, Destination.id == DestinationTag.destination_id)
+        .where(Destination.deleted_at.is_(None))
+        .group_by(
+            Destination.id,
+            Destination.name,
+            Destination.description,
+            Destination.country,
+            Destination.latitude,
+            Destination.longitude,
+        )
+        .order_by(total_score.desc(), Destination.id)
+        .limit(top_n)
+    )
+    if near is not None:
+        stmt = stmt.where(within_radius(near))
+    return stmt
+
+
+def run_recommendation_sql(profile: Dict[str, int], db: Session, top_n: int = 3,
+                           near: Optional[GeoFilter] = None) -> List[Dict[str, int]]:
+    """
+    프로필 가중치를 파생 테이블로 보내 destination_tag → tag → destination 을 조인하고
+    SUM(score * weight) 로 정렬한 상위 top_n 을 destination 컬럼과 함께 한 번에 조회
+    (삭제된 destination 은 제외, near 가 있으면 반경 안 여행지만 — 반경 판정도 같은 쿼리에서)
+    """
+    if not profile or top_n <= 0:
+        return []
+
+    stmt = recommendation_query(profile, top_n, near)
+
+    # 쿼리 실행 + 결과 포맷
+    return [
+        {
+            "name": row.name,
+            "description": row.description,
+            "country": row.country,
+            "latitude": row.latitude,
+            "longitude": row.longitude,
+            "score": int(row.score),
+        }
+        for row in db.execute(stmt).all()
+    ]
@@ -0,0 +1,236 @@
+import json
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.survey import SurveyModel
+
+# 설문 문항 (SurveySubmit 의 q1 ~ q7)
+SURVEY_QUESTIONS: List[str] = [f"q{i}" for i in range(1, 8)]
+
+# DB 에 활성화된 모델이 없을 때 사용하는 기본 모델 (버전 0)
+BUILTIN_VERSION = 0
+
+# 1) 설문 문항 → 태그 raw 매핑 (0/1)
+QUESTION_TAG_MAP: Dict[str, Dict[str, Dict[str, int]]] = {
+    "q1": {"A": {"sightseeing": 1}, "B": {"relaxation": 1}},
+    "q2": {"A": {"beach": 1},       "B": {"mountain": 1}},
+    "q3": {
+        "A": {"solo": 1},   "B": {"friends": 1},
+        "C": {"family": 1}, "D": {"couple": 1}
+    },
+    "q4": {"A": {"warm": 1}, "B": {"comfortable": 1}, "C": {"cool": 1}, "D": {"cold": 1}},
+    "q5": {"A": {"traditional": 1}, "B": {"fusion": 1}, "C": {"street": 1},  "D": {"vegan": 1}},
+    "q6": {"A": {"car": 1},      "B": {"public": 1},     "C": {"walk": 1},    "D": {"bus": 1}},
+    "q7": {"A": {"leisure": 1},  "B": {"normal": 1},     "C": {"tight": 1},   "D": {"spontaneous": 1}},
+}
+
+# 2) 문항별 가중치 (없는 문항은 1)
+QUESTION_WEIGHTS: Dict[str, int] = {
+    "q1": 3,
+    "q2": 2,
+    **{f"q{i}": 1 for i in range(3, 8)}
+}
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+@dataclass(frozen=True)
+class CompiledSurveyModel:
+    """
+    설문 채점 모델을 배열로 컴파일한 스냅샷
+    - 모든 (문항, 선택지) 에 행 번호를 매기고, 각 행에 raw × 문항 가중치 태그 벡터를 미리 계산
+    - 프로필 = 응답한 선택지 행들의 합 (문항 수만큼의 배열 덧셈)
+    한 번 만들어진 스냅샷은 수정하지 않고, 새 버전이 활성화되면 통째로 교체합니다.
+    """
+    version: int
+    tag_map: Dict[str, Dict[str, Dict[str, int]]]   # 원본 설정 (관리자 조회 / 응답 조합 열거용)
+    weights: Dict[str, int]
+    tag_names: List[str]                            # 열 번호 → tag.name
+    choice_rows: Dict[str, Dict[str, int]]          # 문항 → 선택지 → vectors 행 번호
+    vectors: np.ndarray                             # (C + 1, T) int64, 마지막 행은 0 (모르는 선택지)
+
+    @property
+    def empty_row(self) -> int:
+        return int(self.vectors.shape[0]) - 1
+
+    def answer_rows(self, answers: Dict[str, str]) -> List[int]:
+        """응답한 선택지의 행 번호 (모델에 없는 문항/선택지는 건너뜀)"""
+        rows = []
+        for q_key, choice in answers.items():
+            row = self.choice_rows.get(q_key, {}).get(choice)
+            if row is not None:
+                rows.append(row)
+        return rows
+
+    def profile_array(self, answers: Dict[str, str]) -> np.ndarray:
+        """(T,) 태그 가중치 벡터 (열 순서는 tag_names)"""
+        return self.vectors[self.answer_rows(answers)].sum(axis=0)
+
+    def profile(self, answers: Dict[str, str]) -> Dict[str, int]:
+        """{ tag_name: weight } (가중치가 0 인 태그는 제외)"""
+        weights = self.profile_array(answers).tolist()
+        return {tag_name: weight for tag_name, weight in zip(self.tag_names, weights) if weight}
+
+    def profile_matrix(self, answers_list: List[Dict[str, str]], tag_index: Dict[str, int]) -> np.ndarray:
+        """
+        여러 응답을 한 번에 (N, len(tag_index)) 행렬로 변환
+        :param tag_index: { tag_name: 열 번호 } (점수 행렬의 태그 인덱스, 없는 태그는 무시)
+        """
+        # 선택지 벡터를 점수 행렬의 열 순서로 한 번만 옮겨 둠
+        projected = np.zeros((self.vectors.shape[0], len(tag_index)), dtype=np.int64)
+        for col, tag_name in enumerate(self.tag_names):
+            target = tag_index.get(tag_name)
+            if target is not None:
+                projected[:, target] += self.vectors[:, col]
+
+        # (N, 문항 수) 선택지 행 번호 — 응답하지 않았거나 모르는 선택지는 0 벡터 행
+        questions = list(self.choice_rows)
+        rows = np.full((len(answers_list), len(questions)), self.empty_row, dtype=np.int64)
+        for i, answers in enumerate(answers_list):
+            for j, q_key in enumerate(questions):
+                row = self.choice_rows[q_key].get(answers.get(q_key))
+                if row is not None:
+                    rows[i, j] = row
+        return projected[rows].sum(axis=1)
+
+
+def compile_survey_model(version: int, tag_map: Dict[str, Dict[str, Dict[str, int]]],
+                         weights: Dict[str, int]) -> CompiledSurveyModel:
+    """설정을 검증하고 배열로 컴파일 (잘못된 설정은 ValueError)"""
+    if not isinstance(tag_map, dict) or not isinstance(weights, dict):
+        raise ValueError("tag_map and weights must be objects")
+    unknown = (set(tag_map) | set(weights)) - set(SURVEY_QUESTIONS)
+    if unknown:
+        raise ValueError(f"unknown questions: {sorted(unknown)} (expected {SURVEY_QUESTIONS})")
+    for q_key, weight in weights.items():
+        if not _is_int(weight):
+            raise ValueError(f"weight of {q_key} must be an integer")
+
+    questions = [q for q in SURVEY_QUESTIONS if q in tag_map]
+    tag_names: List[str] = []
+    tag_cols: Dict[str, int] = {}
+    choice_rows: Dict[str, Dict[str, int]] = {}
+    entries = []
+    n_rows = 0
+    for q_key in questions:
+        choices = tag_map[q_key]
+        if not isinstance(choices, dict) or not choices:
+            raise ValueError(f"{q_key} must map choices to tag weights")
+        weight = weights.get(q_key, 1)
+        choice_rows[q_key] = {}
+        for choice, tags in sorted(choices.items()):
+            if not isinstance(tags, dict):
+                raise ValueError(f"{q_key}.{choice} must map tag names to integers")
+            row = n_rows
+            choice_rows[q_key][choice] = row
+            n_rows += 1
+            for tag_name, raw_val in tags.items():
+                if not _is_int(raw_val):
+                    raise ValueError(f"{q_key}.{choice}.{tag_name} must be an integer")
+                col = tag_cols.setdefault(tag_name, len(tag_cols))
+                if col == len(tag_names):
+                    tag_names.append(tag_name)
+                entries.append((row, col, raw_val * weight))
+
+    vectors = np.zeros((n_rows + 1, len(tag_names)), dtype=np.int64)
+    for row, col, value in entries:
+        vectors[row, col] += value
+    vectors.setflags(write=False)
+
+    return CompiledSurveyModel(
+        version=version,
+        tag_map=tag_map,
+        weights=weights,
+        tag_names=tag_names,
+        choice_rows=choice_rows,
+        vectors=vectors,
+    )
+
+
+class SurveyModelRegistry:
+    """
+    활성화된 설문 채점 모델을 프로세스 메모리에 보관
+    - survey_model 테이블에서 active 인 버전을 읽어 컴파일하고, 참조 하나를 바꾸는 것으로 원자적으로 교체
+      (요청은 시작할 때 current 를 한 번 읽어 끝까지 같은 버전을 사용)
+    - 다른 프로세스에서 활성화한 버전은 CatalogWatcher 가 주기적으로 refresh() 해서 반영
+    """
+
+    def __init__(self):
+        self._model = compile_survey_model(BUILTIN_VERSION, QUESTION_TAG_MAP, QUESTION_WEIGHTS)
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> CompiledSurveyModel:
+        return self._model
+
+    def active_version(self, db: Session) -> int:
+        version = db.execute(
+            select(SurveyModel.id).where(SurveyModel.active.is_(True)).order_by(SurveyModel.id.desc()).limit(1)
+        ).scalar()
+        return version if version is not None else BUILTIN_VERSION
+
+    def load(self, db: Session) -> CompiledSurveyModel:
+        """활성화된 버전을 읽어 교체 (없으면 기본 모델)"""
+        version = self.active_version(db)
+        with self._lock:
+            if version != self._model.version:
+                self._model = self._compile(db, version)
+            return self._model
+
+    def refresh(self, db: Session) -> bool:
+        """활성화된 버전이 바뀌었으면 교체하고 True"""
+        previous = self._model.version
+        return self.load(db).version != previous
+
+    def _compile(self, db: Session, version: int) -> CompiledSurveyModel:
+        if version == BUILTIN_VERSION:
+            return compile_survey_model(BUILTIN_VERSION, QUESTION_TAG_MAP, QUESTION_WEIGHTS)
+        row = db.get(SurveyModel, version)
+        return compile_survey_model(row.id, json.loads(row.tag_map), json.loads(row.weights))
+
+    def publish(self, db: Session, tag_map: dict, weights: dict, description: Optional[str] = None,
+                activate: bool = True) -> int:
+        """새 버전 저장 (저장 전에 컴파일해서 검증), activate 면 바로 활성화"""
+        compile_survey_model(BUILTIN_VERSION, tag_map, weights)
+        row = SurveyModel(
+            tag_map=json.dumps(tag_map, ensure_ascii=False),
+            weights=json.dumps(weights),
+            description=description,
+            active=False,
+        )
+        db.add(row)
+        db.commit()
+        if activate:
+            self.activate(db, row.id)
+        return row.id
+
+    def activate(self, db: Session, version: int) -> CompiledSurveyModel:
+        """
+        version 을 활성화 (0 이면 기본 모델로 되돌림)
+        존재하지 않는 버전은 ValueError
+        """
+        if version != BUILTIN_VERSION and db.get(SurveyModel, version) is None:
+            raise ValueError(f"survey model version {version} does not exist")
+        db.execute(update(SurveyModel.__table__).values(active=SurveyModel.__table__.c.id == version))
+        db.commit()
+        return self.load(db)
+
+    def versions(self, db: Session) -> List[dict]:
+        rows = db.execute(
+            select(SurveyModel.id, SurveyModel.description, SurveyModel.active, SurveyModel.created_at)
+            .order_by(SurveyModel.id.desc())
+        ).all()
+        return [
+            {"version": row.id, "description": row.description, "active": row.active, "created_at": row.created_at}
+            for row in rows
+        ]
+
+
+survey_model = SurveyModelRegistry()
@@ -0,0 +1,140 @@
+import itertools
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.http_cache import body_etag
+from app.core.recommender import recommendation_engine
+from app.core.survey import serialize_result
+from app.core.survey_model import CompiledSurveyModel, survey_model
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# (ETag, 응답 bytes)
+Entry = Tuple[str, bytes]
+
+
+class AnswerSpace:
+    """
+    설문 응답 조합 전체를 정수 키(혼합 기수)로 표현
+    q1..q7 순서로 각 문항의 선택지 인덱스를 자릿수로 사용합니다.
+    """
+
+    def __init__(self, tag_map: Dict[str, Dict[str, Dict[str, int]]]):
+        self.questions: List[str] = sorted(tag_map, key=lambda q: int(q[1:]))
+        self.choices: List[List[str]] = [sorted(tag_map[q]) for q in self.questions]
+        self._choice_index: List[Dict[str, int]] = [
+            {c: i for i, c in enumerate(choices)} for choices in self.choices
+        ]
+        self.size = 1
+        for choices in self.choices:
+            self.size *= len(choices)
+
+    def key(self, answers: Dict[str, str]) -> Optional[int]:
+        """유효한 응답이면 0 ~ size-1 의 키, 아니면 None"""
+        key = 0
+        for q_key, choices, index in zip(self.questions, self.choices, self._choice_index):
+            i = index.get(answers.get(q_key))
+            if i is None:
+                return None
+            key = key * len(choices) + i
+        return key
+
+    def combinations(self):
+        """키 순서(0, 1, 2, ...)대로 응답 dict 생성"""
+        for combo in itertools.product(*self.choices):
+            yield dict(zip(self.questions, combo))
+
+
+class RecommendationTable:
+    """
+    가능한 모든 설문 응답에 대한 추천 결과를 미리 계산해 둔 조회 테이블
+    - 각 응답 조합의 직렬화된 SurveyResult 응답 bytes 와 그 ETag 를 보관
+      (ETag 는 본문 digest 라 결과가 같으면 워커 / 재생성과 관계없이 같은 값)
+    - 점수 행렬 버전이나 설문 채점 모델 버전이 바뀌면 stale 로 보고 백그라운드에서 재생성
+    """
+
+    def __init__(self, top_n: int = 3):
+        self.top_n = top_n
+        # (응답 공간, (ETag, 응답 bytes) 목록, (점수 행렬 버전, 채점 모델 버전)) 를 한 번에 교체
+        self._state: Optional[Tuple[AnswerSpace, List[Optional[Entry]], Tuple[int, int]]] = None
+        self._lock = threading.Lock()
+        self._building = False
+
+    @property
+    def enabled(self) -> bool:
+        return settings.SURVEY_TABLE_ENABLED and settings.RECOMMENDATION_MODE == "memory"
+
+    def build(self, db: Session) -> None:
+        """점수 행렬 + 현재 채점 모델로 전체 응답 공간의 추천 결과를 계산해 테이블 교체"""
+        model = survey_model.current
+        matrix = recommendation_engine.get(db)
+        space = AnswerSpace(model.tag_map)
+
+        profiles = model.profile_matrix(list(space.combinations()), matrix.tag_index)
+        results = matrix.top_n_many(profiles, self.top_n)
+
+        entries: List[Optional[Entry]] = []
+        for recs in results:
+            try:
+                body = serialize_result(recs, model.version)
+                entries.append((body_etag(body), body))
+            except ValueError:
+                # 응답 스키마에 맞지 않는 데이터는 요청 시점 계산으로 넘깁니다.
+                entries.append(None)
+
+        self._state = (space, entries, (matrix.version, model.version))
+
+    def lookup(self, answers: Dict[str, str], model: CompiledSurveyModel) -> Optional[bytes]:
+        """model 로 채점한 미리 계산된 응답 bytes 반환 (없으면 None)"""
+        entry = self.lookup_entry(answers, model)
+        return entry[1] if entry is not None else None
+
+    def lookup_entry(self, answers: Dict[str, str], model: CompiledSurveyModel) -> Optional[Entry]:
+        """
+        model 로 채점한 미리 계산된 (ETag, 응답 bytes) 반환
+        테이블이 없거나 stale 이면 None 을 반환하고 백그라운드 재생성을 시작합니다.
+        """
+        if not self.enabled:
+            return None
+
+        state = self._state
+        if state is None or state[2] != (recommendation_engine.version, model.version):
+            self.rebuild_in_background()
+            return None
+        space, entries, _ = state
+        key = space.key(answers)
+        if key is None:
+            return None
+        return entries[key]
+
+    def invalidate(self) -> None:
+        self._state = None
+
+    def rebuild_in_background(self) -> None:
+        """이미 재생성 중이면 무시"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+        threading.Thread(target=self._rebuild, name="survey-table-build", daemon=True).start()
+
+    def _rebuild(self) -> None:
+        db = SessionLocal()
+        try:
+            self.build(db)
+        except Exception:
+            logger.exception("RecommendationTable rebuild failed")
+        finally:
+            db.close()
+            with self._lock:
+                self._building = False
+
+
+recommendation_table = RecommendationTable()
@@ -0,0 +1,121 @@
+import asyncio
+import time
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.recommender import recommendation_engine
+from app.core.survey_model import survey_model
+from app.core.survey_table import recommendation_table
+from app.db.session import SessionLocal, async_engine, engine
+
+
+class Readiness:
+    """워밍업 완료 여부 (/ready 응답용)"""
+
+    def __init__(self):
+        self.ready = False
+        self.warming = False
+        self.started_at = time.monotonic()
+        self.ready_after_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._event: Optional[asyncio.Event] = None
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        self.ready_after_seconds = round(time.monotonic() - self.started_at, 3)
+        self.last_error = None
+        if self._event is not None:
+            self._event.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """준비될 때까지 이벤트 루프에서 기다림 → 준비됐으면 True (워밍업을 돌리지 않는 실행이면 바로 True)"""
+        if self.ready or not self.warming:
+            return True
+        if self._event is None:
+            self._event = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+readiness = Readiness()
+
+
+async def wait_until_ready() -> None:
+    """
+    추천 라우트 의존성 — 워밍업이 점수 행렬 / 조회 테이블을 로드하는 동안 들어온 요청은
+    스레드풀 워커에서 로드를 기다리지 않고 이벤트 루프에서 기다림 (WARMUP_WAIT_SECONDS 를 넘으면 503)
+    """
+    if not await readiness.wait(settings.WARMUP_WAIT_SECONDS):
+        raise HTTPException(
+            status_code=503,
+            detail="서버를 준비하고 있습니다. 잠시 후 다시 시도해 주세요.",
+            headers={"Retry-After": str(int(settings.WARMUP_RETRY_SECONDS))},
+        )
+
+
+def _open_sync_connections(count: int) -> None:
+    """풀에 커넥션을 미리 만들어 두어 첫 요청이 연결 수립 비용을 내지 않도록 함"""
+    conns = []
+    try:
+        for _ in range(count):
+            conn = engine.connect()
+            conn.execute(text("SELECT 1"))
+            conns.append(conn)
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+async def _open_async_connections(count: int) -> None:
+    conns = []
+    try:
+        for _ in range(count):
+            conn = await async_engine.connect()
+            await conn.execute(text("SELECT 1"))
+            conns.append(conn)
+    finally:
+        for conn in conns:
+            await conn.close()
+
+
+def _preload_recommendations() -> None:
+    """설문 채점 모델 / 점수 행렬 로드 + 설문 응답 조회 테이블 생성"""
+    db = SessionLocal()
+    try:
+        survey_model.load(db)
+        if recommendation_table.enabled:
+            recommendation_table.build(db)
+        elif settings.RECOMMENDATION_MODE == "memory":
+            recommendation_engine.get(db)
+    finally:
+        db.close()
+
+
+async def warm_up() -> None:
+    """
+    요청을 받기 전에 필요한 준비 작업 (실패하면 WARMUP_RETRY_SECONDS 뒤 재시도)
+    1) 동기/비동기 커넥션 풀 채우기
+    2) 추천 데이터 미리 로드
+    """
+    readiness.warming = True
+    while True:
+        try:
+            await run_in_threadpool(_open_sync_connections, settings.WARMUP_POOL_CONNECTIONS)
+            await _open_async_connections(settings.WARMUP_POOL_CONNECTIONS)
+            await run_in_threadpool(_preload_recommendations)
+            readiness.mark_ready()
+            print(f"Warm-up completed in {readiness.ready_after_seconds}s")
+            return
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            readiness.last_error = str(e)
+            print(f"Error in warm_up: {e}")
+            await asyncio.sleep(settings.WARMUP_RETRY_SECONDS)
@@ -0,0 +1,339 @@
+"""
+여행지 / 태그 점수 대량 적재
+
+    python -m app.db.ingest destinations data/destinations.csv
+    python -m app.db.ingest scores data/scores.jsonl --create-tags --batch-size 10000
+    cat scores.csv | python -m app.db.ingest scores - --format csv
+
+- destinations: id, name, country, description, latitude, longitude, deleted
+- scores:       destination_id, tag, score   (tag 는 tag.name)
+
+입력을 batch-size 행씩 읽어 pydantic 으로 검증하고, 한 트랜잭션에서 executemany 로 upsert 합니다.
+잘못된 행은 건너뛰고 줄 번호와 함께 보고하며, 끝나면 catalog_version 을 올려
+실행 중인 서버들이 추천 캐시를 다시 읽도록 합니다.
+"""
+import argparse
+import csv
+import itertools
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+
+from app.core.catalog import bump_catalog_version, invalidate_recommendation_caches
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models import Destination, DestinationTag, Tag
+
+
+class DestinationRow(BaseModel):
+    id: int = Field(gt=0)
+    name: str = Field(min_length=1, max_length=100)
+    country: str = Field(max_length=100)
+    description: str = Field("", max_length=255)
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    deleted: bool = False
+
+
+class ScoreRow(BaseModel):
+    destination_id: int = Field(gt=0)
+    tag: str = Field(min_length=1, max_length=100)
+    score: int = Field(ge=0)
+
+
+class IngestStats:
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.read = 0
+        self.written = 0
+        self.rejected = 0
+        self.created_tags = 0
+        self.started = time.perf_counter()
+
+    @property
+    def rows_per_sec(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.read / elapsed if elapsed else 0.0
+
+    def report(self, out=sys.stderr) -> None:
+        print(
+            f"[ingest] {self.kind}: {self.read:,} rows read, {self.written:,} written, "
+            f"{self.rejected:,} rejected ({self.rows_per_sec:,.0f} rows/s)",
+            file=out,
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "read": self.read,
+            "written": self.written,
+            "rejected": self.rejected,
+            "created_tags": self.created_tags,
+            "seconds": round(time.perf_counter() - self.started, 3),
+            "rows_per_sec": round(self.rows_per_sec, 1),
+        }
+
+
+# ---------- 입력 ----------
+
+def read_records(stream, fmt: str) -> Iterator[Tuple[int, dict]]:
+    """(줄 번호, dict) 를 한 줄씩 yield (파일 전체를 메모리에 올리지 않음)"""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            # CSV 빈 칸은 컬럼이 없는 것으로 취급 (기본값 적용)
+            yield reader.line_num, {k: v for k, v in record.items() if k and v != ""}
+    else:
+        for line_no, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError:
+                # 검증 단계에서 거부되도록 dict 가 아닌 값으로 넘김
+                yield line_no, None
+
+
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise SystemExit(f"cannot detect format of {path!r}, use --format csv|jsonl")
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ---------- 쓰기 ----------
+
+def upsert(conn: Connection, table, rows: List[dict], key_columns: List[str], update_columns: List[str]) -> None:
+    """
+    rows 를 한 번의 executemany 로 upsert
+    - MySQL:  INSERT ... ON DUPLICATE KEY UPDATE
+    - SQLite: INSERT ... ON CONFLICT (key) DO UPDATE
+    """
+    if not rows:
+        return
+    dialect = conn.dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(table)
+        stmt = stmt.on_duplicate_key_update({col: stmt.inserted[col] for col in update_columns})
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={col: stmt.excluded[col] for col in update_columns},
+        )
+    else:
+        # 그 외 DB 는 같은 키를 지우고 다시 넣습니다.
+        keys = [tuple(row[col] for col in key_columns) for row in rows]
+        conn.execute(table.delete().where(tuple_(*[table.c[col] for col in key_columns]).in_(keys)))
+        stmt = table.insert()
+    conn.execute(stmt, rows)
+
+
+def replace_scores(conn: Connection, rows: List[dict]) -> None:
+    """(destination_id, tag_id) 유니크 키(alembic 0003)로 destination_tag 점수 upsert"""
+    upsert(
+        conn, DestinationTag.__table__, rows,
+        key_columns=["destination_id", "tag_id"],
+        update_columns=["score"],
+    )
+
+
+class TagResolver:
+    """
+    tag.name → tag.id 메모리 맵 (없는 태그는 create=True 일 때만 생성)
+    새로 만든 태그 id 는 배치 트랜잭션이 커밋된 뒤(commit)에만 맵에 합칩니다.
+    롤백된 배치의 id 를 다음 배치가 쓰면 없는 tag 를 가리키게 되기 때문입니다.
+    """
+
+    def __init__(self, conn: Connection, create: bool):
+        self.create = create
+        self.created = 0
+        self._ids: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}    # 이번 배치에서 만든 태그 (커밋 전)
+        for tag_id, name in conn.execute(select(Tag.id, Tag.name).order_by(Tag.id)):
+            self._ids.setdefault(name, tag_id)
+
+    def resolve(self, conn: Connection, name: str) -> Optional[int]:
+        tag_id = self._ids.get(name) or self._pending.get(name)
+        if tag_id is None and self.create:
+            tag_id = conn.execute(Tag.__table__.insert().values(name=name, label=name)).inserted_primary_key[0]
+            self._pending[name] = tag_id
+        return tag_id
+
+    def commit(self) -> None:
+        self._ids.update(self._pending)
+        self.created += len(self._pending)
+        self._pending.clear()
+
+    def rollback(self) -> None:
+        self._pending.clear()
+
+
+def _destination_values(row: DestinationRow, now: datetime) -> dict:
+    return {
+        "id": row.id,
+        "name": row.name,
+        "country": row.country,
+        "description": row.description,
+        "latitude": row.latitude,
+        "longitude": row.longitude,
+        "created_at": now,
+        "updated_at": now,
+        "deleted_at": now if row.deleted else None,
+    }
+
+
+def _write_destinations(conn: Connection, rows: List[Tuple[int, DestinationRow]], state: dict) -> int:
+    now = datetime.now()
+    # 같은 배치 안에서 id 가 겹치면 마지막 행을 사용
+    values = list({row.id: _destination_values(row, now) for _, row in rows}.values())
+    upsert(
+        conn, Destination.__table__, values,
+        key_columns=["id"],
+        update_columns=["name", "country", "description", "latitude", "longitude", "updated_at", "deleted_at"],
+    )
+    return len(values)
+
+
+def _write_scores(conn: Connection, rows: List[Tuple[int, ScoreRow]], state: dict) -> int:
+    resolver: TagResolver = state["tags"]
+    known: Set[int] = state["destinations"]
+    values: Dict[Tuple[int, int], dict] = {}
+    for line_no, row in rows:
+        if row.destination_id not in known:
+            state["reject"](line_no, f"unknown destination_id {row.destination_id}")
+            continue
+        tag_id = resolver.resolve(conn, row.tag)
+        if tag_id is None:
+            state["reject"](line_no, f"unknown tag {row.tag!r} (use --create-tags)")
+            continue
+        values[(row.destination_id, tag_id)] = {
+            "destination_id": row.destination_id,
+            "tag_id": tag_id,
+            "score": row.score,
+        }
+    replace_scores(conn, list(values.values()))
+    return len(values)
+
+
+KINDS: Dict[str, Tuple[type, Callable]] = {
+    "destinations": (DestinationRow, _write_destinations),
+    "scores": (ScoreRow, _write_scores),
+}
+
+
+def ingest(records: Iterable[Tuple[int, dict]], kind: str, batch_size: int = settings.INGEST_BATCH_SIZE,
+           create_tags: bool = False, max_errors: int = 100, progress: bool = True) -> IngestStats:
+    """
+    (줄 번호, dict) 레코드를 batch_size 행씩 검증 + 적재
+    배치 하나가 트랜잭션 하나이며, max_errors 개를 넘게 거부되면 중단합니다 (이미 커밋한 배치는 유지).
+    """
+    model, write = KINDS[kind]
+    stats = IngestStats(kind)
+
+    def reject(line_no: int, reason: str) -> None:
+        stats.rejected += 1
+        if stats.rejected <= 20:
+            print(f"[ingest] line {line_no}: {reason}", file=sys.stderr)
+        if stats.rejected > max_errors:
+            raise SystemExit(f"[ingest] aborted: more than {max_errors} rejected rows")
+
+    state = {"reject": reject}
+    if kind == "scores":
+        with engine.connect() as conn:
+            state["tags"] = TagResolver(conn, create_tags)
+            state["destinations"] = set(conn.execute(select(Destination.id)).scalars())
+
+    tags: Optional[TagResolver] = state.get("tags")
+    try:
+        for chunk in _chunks(records, batch_size):
+            rows = []
+            for line_no, record in chunk:
+                stats.read += 1
+                try:
+                    row = model.model_validate(record)
+                except ValidationError as e:
+                    reject(line_no, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+                    continue
+                rows.append((line_no, row))
+            try:
+                with engine.begin() as conn:
+                    written = write(conn, rows, state)
+            except BaseException:
+                if tags is not None:
+                    tags.rollback()
+                raise
+            if tags is not None:
+                tags.commit()
+            stats.written += written
+            if progress:
+                stats.report()
+    finally:
+        # max_errors 초과(SystemExit) 등으로 중단돼도 이미 커밋한 배치는 서버에 알림
+        if tags is not None:
+            stats.created_tags = tags.created
+        if stats.written:
+            # 다른 프로세스(서버)는 catalog_version 변경으로, 이 프로세스는 직접 캐시를 버림
+            db = SessionLocal()
+            try:
+                bump_catalog_version(db)
+            finally:
+                db.close()
+            invalidate_recommendation_caches()
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="bulk load destinations / destination_tag scores")
+    parser.add_argument("kind", choices=sorted(KINDS))
+    parser.add_argument("path", help="CSV / JSONL 파일 경로, - 는 표준입력")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument("--batch-size", type=int, default=settings.INGEST_BATCH_SIZE, help="트랜잭션당 행 수")
+    parser.add_argument("--create-tags", action="store_true", help="없는 태그 이름은 새 tag 행으로 생성")
+    parser.add_argument("--max-errors", type=int, default=100, help="거부된 행이 이보다 많으면 중단")
+    args = parser.parse_args(argv)
+
+    if args.path == "-":
+        if not args.format:
+            parser.error("--format is required when reading from stdin")
+        stream = sys.stdin
+    else:
+        stream = open(args.path, newline="", encoding="utf-8")
+    try:
+        stats = ingest(
+            read_records(stream, _detect_format(args.path, args.format)),
+            args.kind,
+            batch_size=args.batch_size,
+            create_tags=args.create_tags,
+            max_errors=args.max_errors,
+        )
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    print(json.dumps(stats.as_dict()))
+    return 1 if stats.rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
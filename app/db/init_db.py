@@ -1,14 +1,41 @@
-from app.db.session import engine, Base
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.db.session import engine
 from app.models.user import User  # 모든 모델을 여기서 import
 from app.models.destination import Destination
 from app.models.tag import Tag
 from app.models.destination_tag import DestinationTag
+from app.models.plan_cache import PlanCache
+from app.models.catalog_version import CatalogVersion
+from app.models.survey import SurveyModel
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+BASELINE_REVISION = "0001"
+
+
+def alembic_config() -> Config:
+    cfg = Config(str(ALEMBIC_INI))
+    cfg.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    return cfg
 
 
 def init_db():
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    """
+    alembic 마이그레이션을 head 까지 적용
+    마이그레이션 도입 전에 create_all 로 만든 DB 는 baseline(0001) 으로 stamp 한 뒤 나머지를 적용합니다.
+    """
+    print("Migrating database...")
+    cfg = alembic_config()
+    tables = set(inspect(engine).get_table_names())
+    if "alembic_version" not in tables and Destination.__tablename__ in tables:
+        print(f"Existing tables without alembic_version, stamping {BASELINE_REVISION}")
+        command.stamp(cfg, BASELINE_REVISION)
+    command.upgrade(cfg, "head")
     print("Database tables created successfully!")
 
 if __name__ == "__main__":
-    init_db() 
\ No newline at end of file
+    init_db()
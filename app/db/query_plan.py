@@ -0,0 +1,145 @@
+"""
+자주 실행되는 쿼리의 실행 계획 확인 (마이그레이션 적용 후 CI / 배포 전에 실행)
+
+    python -m app.db.query_plan            # 실패하면 종료 코드 1
+    python -m app.db.query_plan --verbose  # 통과해도 실행 계획 출력
+
+같은 검사를 tests/test_query_plan.py 가 마이그레이션을 적용한 SQLite DB 에 대해 pytest 로 실행합니다.
+
+- MySQL:  EXPLAIN 에서 type=ALL(풀스캔) 이거나 기대한 인덱스를 쓰지 않으면 실패
+- SQLite: EXPLAIN QUERY PLAN 에서 인덱스 없는 SCAN 이거나 기대한 인덱스를 쓰지 않으면 실패
+"""
+import argparse
+import re
+import sys
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
+
+from app.core.survey import build_profile, recommendation_query
+from app.db.session import engine
+from app.models.user import User
+
+COVERING_INDEX = "ix_destination_tag_tag_id_destination_id_score"
+UNIQUE_PAIR_INDEX = "uq_destination_tag_destination_id_tag_id"
+PRIMARY = "PRIMARY"
+
+_SQLITE_DETAIL = re.compile(r"^(SCAN|SEARCH) (?:TABLE )?(\w+)(?: AS \w+)?(?: USING (?:COVERING )?INDEX (\w+)| USING INTEGER PRIMARY KEY)?")
+
+
+class QueryCheck:
+    """
+    검사할 쿼리 하나
+    expected: { 테이블: 허용하는 인덱스 이름 } — 여기 있는 테이블은 풀스캔 금지 + 허용 인덱스 중 하나를 써야 함
+    """
+
+    def __init__(self, name: str, stmt, expected: Dict[str, Set[str]]):
+        self.name = name
+        self.stmt = stmt
+        self.expected = expected
+
+
+def hot_queries() -> List[QueryCheck]:
+    profile = build_profile({f"q{i}": "A" for i in range(1, 8)})
+    return [
+        QueryCheck(
+            "survey recommendation (SQL mode)",
+            recommendation_query(profile, top_n=3),
+            {
+                "tag": {"ix_tag_name"},
+                "destination_tag": {COVERING_INDEX},
+                "destination": {PRIMARY},
+            },
+        ),
+        QueryCheck(
+            "survey recommendation near a location",
+            recommendation_query(profile, top_n=3, near=(37.5665, 126.978, 50.0)),
+            {
+                "tag": {"ix_tag_name", PRIMARY},
+                "destination_tag": {COVERING_INDEX, UNIQUE_PAIR_INDEX},
+                "destination": {PRIMARY},
+            },
+        ),
+        QueryCheck(
+            "user by email (login / JWT)",
+            select(User).where(User.email == "user@example.com", User.deleted_at.is_(None)),
+            {"user": {"ix_user_email"}},
+        ),
+    ]
+
+
+def _compile(conn: Connection, stmt) -> str:
+    return str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def _explain_mysql(conn: Connection, sql: str) -> List[dict]:
+    """[{ table, index(None 이면 풀스캔), detail }]"""
+    steps = []
+    for row in conn.exec_driver_sql(f"EXPLAIN {sql}").mappings():
+        table = row["table"]
+        if not table or table.startswith("<"):  # <derived2>, <union1,2> 등 파생 테이블
+            continue
+        index = None if row["type"] == "ALL" else row["key"]
+        steps.append({
+            "table": table,
+            "index": index,
+            "detail": f"type={row['type']} key={row['key']} rows={row['rows']} extra={row['Extra']}",
+        })
+    return steps
+
+
+def _explain_sqlite(conn: Connection, sql: str) -> List[dict]:
+    steps = []
+    for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"):
+        detail = row[-1]
+        if detail.startswith("SCAN CONSTANT ROW"):  # SELECT 리터럴 (UNION ALL 파생 테이블)
+            continue
+        match = _SQLITE_DETAIL.match(detail)
+        if match is None:
+            continue
+        _, table, index = match.groups()
+        if index is None and "INTEGER PRIMARY KEY" in detail:
+            index = PRIMARY
+        steps.append({"table": table, "index": index, "detail": detail})
+    return steps
+
+
+def check_query(conn: Connection, check: QueryCheck) -> Tuple[List[str], List[dict]]:
+    """(실행 계획 문제 목록 — 비어 있으면 통과, 실행 계획 단계)"""
+    explain = _explain_mysql if conn.dialect.name == "mysql" else _explain_sqlite
+    steps = explain(conn, _compile(conn, check.stmt))
+    problems = []
+    for step in steps:
+        allowed = check.expected.get(step["table"])
+        if allowed is None:
+            continue
+        if step["index"] is None:
+            problems.append(f"full scan of {step['table']} ({step['detail']})")
+        elif step["index"] not in allowed:
+            problems.append(f"{step['table']} uses {step['index']}, expected one of {sorted(allowed)} ({step['detail']})")
+    return problems, steps
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="check EXPLAIN output of hot queries")
+    parser.add_argument("--verbose", action="store_true", help="통과한 쿼리의 실행 계획도 출력")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    with engine.connect() as conn:
+        for check in hot_queries():
+            problems, steps = check_query(conn, check)
+            status = "FAIL" if problems else "ok"
+            print(f"[{status}] {check.name}")
+            if problems or args.verbose:
+                for step in steps:
+                    print(f"    {step['table']}: {step['detail']}")
+            for problem in problems:
+                print(f"    - {problem}")
+            failed += bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
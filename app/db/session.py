@@ -1,6 +1,15 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.config import settings
+from app.core.metrics import instrument_engine
+import math
+import sqlite3
+import threading
+import time
 import os
 
 MYSQL_USER = os.getenv("MYSQL_USER", "root")
@@ -9,13 +18,102 @@ MYSQL_HOST = os.getenv("MYSQL_HOST", "localhost")
 MYSQL_PORT = os.getenv("MYSQL_PORT", "3306")
 MYSQL_DATABASE = os.getenv("MYSQL_DATABASE", "galae_malae")
 
-SQLALCHEMY_DATABASE_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}"
+# SQLALCHEMY_DATABASE_URL / ASYNC_SQLALCHEMY_DATABASE_URL 환경변수로 덮어쓸 수 있습니다.
+# (예: 테스트/벤치마크에서 sqlite:///..., sqlite+aiosqlite:///...)
+SQLALCHEMY_DATABASE_URL = settings.SQLALCHEMY_DATABASE_URL or (
+    f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}"
+)
+ASYNC_SQLALCHEMY_DATABASE_URL = settings.ASYNC_SQLALCHEMY_DATABASE_URL or (
+    f"mysql+aiomysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}"
+)
+
+
+class PoolStats:
+    """커넥션 풀 checkout 대기 시간 / 타임아웃 통계"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            if timed_out:
+                self.timeouts += 1
+
+
+def _instrumented_pool(pool_class, stats: PoolStats):
+    """풀에서 커넥션을 꺼낼 때까지 걸린 시간을 stats 에 기록하는 풀 클래스"""
+
+    class InstrumentedPool(pool_class):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                conn = super()._do_get()
+            except PoolTimeoutError:
+                stats.record(time.perf_counter() - started, timed_out=True)
+                raise
+            stats.record(time.perf_counter() - started)
+            return conn
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+def _engine_options(url: str, pool_class, stats: PoolStats) -> dict:
+    """DB_POOL_* 설정 적용 (sqlite 는 SQLAlchemy 기본 풀 사용)"""
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": _instrumented_pool(pool_class, stats),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+sync_pool_stats = PoolStats()
+async_pool_stats = PoolStats()
 
 # 엔진 생성
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    **_engine_options(SQLALCHEMY_DATABASE_URL, QueuePool, sync_pool_stats),
+)
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    **_engine_options(ASYNC_SQLALCHEMY_DATABASE_URL, AsyncAdaptedQueuePool, async_pool_stats),
+)
+
+
+def _register_sqlite_math_functions(dbapi_connection, connection_record) -> None:
+    """SQLITE_ENABLE_MATH_FUNCTIONS 없이 빌드된 SQLite 에도 반경 검색(haversine)에 쓰는 sin / cos 등록"""
+    try:
+        dbapi_connection.execute("SELECT sin(0), cos(0)")
+    except sqlite3.OperationalError:
+        dbapi_connection.create_function("sin", 1, math.sin, deterministic=True)
+        dbapi_connection.create_function("cos", 1, math.cos, deterministic=True)
+
+
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    event.listen(engine, "connect", _register_sqlite_math_functions)
+
+# SQL 문 실행 시간 / 요청별 SQL 문 수 측정 (/metrics)
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "async")
 
 # 세션 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
 # Base 클래스 생성
 Base = declarative_base()
@@ -26,4 +124,37 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# 비동기 DB 세션 의존성
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _pool_status(pool, stats: PoolStats) -> dict:
+    status = {
+        "checkouts": stats.checkouts,
+        "timeouts": stats.timeouts,
+        "wait_seconds_avg": round(stats.wait_seconds_total / stats.checkouts, 6) if stats.checkouts else 0.0,
+        "wait_seconds_max": round(stats.wait_seconds_max, 6),
+    }
+    if isinstance(pool, QueuePool):
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": checked_out,
+            "overflow": pool.overflow(),
+            "saturation": round(checked_out / capacity, 4) if capacity else 0.0,
+        })
+    return status
+
+
+def get_pool_status() -> dict:
+    """동기/비동기 엔진의 커넥션 풀 사용량과 checkout 대기 시간"""
+    return {
+        "sync": _pool_status(engine.pool, sync_pool_stats),
+        "async": _pool_status(async_engine.sync_engine.pool, async_pool_stats),
+    }
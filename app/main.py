@@ -1,7 +1,21 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1.endpoints import survey, auth, plan
-from app.db.init_db import init_db
+from app.api.v1.endpoints import survey, auth, plan, admin, destination
+from app.core.auth import require_admin_token
+from app.core.config import settings
+from app.core.warmup import readiness, warm_up
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.concurrency import ConcurrencyLimitMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.core.counter import counter_flusher
+from app.core.catalog import catalog_watcher
+from app.core.plan_jobs import plan_job_runner
+from app.core.google_keys import google_key_cache
+from app.core.http_client import close_http_client
+from app.core.password import password_hasher
 from dotenv import load_dotenv
 import os
 
@@ -14,6 +28,12 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# 라우트 그룹별 적응형 동시 처리 제한 (거절 응답에도 CORS 헤더가 붙도록 CORS 보다 안쪽에 둠)
+app.add_middleware(ConcurrencyLimitMiddleware)
+
+# 클라이언트별 요청 한도 (한도를 넘은 요청은 동시 처리 자리를 차지하기 전에 429)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -23,16 +43,65 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 라우트별 지연 시간 / SQL 문 수 측정 (METRICS_ENABLED=false 로 끌 수 있음)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# 요청 프로파일링 (서명된 X-Profile 헤더 / 관리자 API 에서 켠 샘플링 비율에 걸린 요청만)
+app.add_middleware(ProfilingMiddleware)
+
 # API 라우터 등록
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["authentication"])
 app.include_router(survey.router, prefix="/api/v1/survey", tags=["survey"])
 app.include_router(plan.router, prefix="/api/v1/plan", tags=["plan"])
+app.include_router(destination.router, prefix="/api/v1/destinations", tags=["destination"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to GalaeMalae API"}
 
-# 앱 시작 시 데이터베이스 초기화
+@app.get("/ready")
+async def ready():
+    """워밍업(커넥션 풀, 추천 데이터 로드)이 끝나야 200, 그 전에는 503"""
+    body = {
+        "ready": readiness.ready,
+        "ready_after_seconds": readiness.ready_after_seconds,
+        "last_error": readiness.last_error,
+    }
+    return JSONResponse(body, status_code=200 if readiness.ready else 503)
+
+# 관리자 API 와 같이 X-Admin-Token 필요 (ADMIN_TOKEN 이 없으면 404)
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_admin_token)])
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(body, headers={"Content-Type": content_type})
+
+_warmup_task = None
+
+# 테이블 생성은 배포 단계에서 `python -m app.db.init_db` 로 한 번만 실행합니다.
 @app.on_event("startup")
 async def startup_event():
-    init_db() 
\ No newline at end of file
+    global _warmup_task
+    # 커넥션 풀 / 추천 데이터 준비는 기동을 막지 않도록 백그라운드에서 진행 (/ready 로 확인)
+    _warmup_task = asyncio.ensure_future(warm_up())
+    counter_flusher.start()
+    # 적재(python -m app.db.ingest)로 여행지 데이터가 바뀌면 추천 캐시를 다시 읽음
+    catalog_watcher.start()
+    plan_job_runner.start()
+    # 비밀번호 해싱 워커 프로세스를 미리 띄워 둠
+    password_hasher.start()
+    # Google 로그인 검증용 공개키를 미리 받아 두고 만료 전에 갱신
+    google_key_cache.start()
+
+# 앱 종료 시 메모리에 남은 호출 횟수를 DB에 반영
+@app.on_event("shutdown")
+async def shutdown_event():
+    if _warmup_task is not None:
+        _warmup_task.cancel()
+    await plan_job_runner.stop()
+    catalog_watcher.stop()
+    await google_key_cache.stop()
+    await close_http_client()
+    password_hasher.shutdown()
+    counter_flusher.stop() 
\ No newline at end of file
@@ -4,3 +4,6 @@ from .tag         import Tag
 from .destination_tag import DestinationTag
 from .survey_call_count import SurveyCallCount
 from .plan_call_count import PlanCallCount
+from .plan_cache import PlanCache
+from .catalog_version import CatalogVersion
+from .survey import SurveyModel
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, DateTime
+from app.db.session import Base
+from datetime import datetime
+
+class CatalogVersion(Base):
+    """여행지/태그 점수 데이터 버전 (적재할 때마다 1 증가, 서버는 주기적으로 확인해 추천 캐시 갱신)"""
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)      # 항상 1 한 행
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.now)
@@ -5,12 +5,14 @@ from datetime import datetime
 class Destination(Base):
     __tablename__ = "destination"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # 추천은 id(PK)로만 조회하고 위치 검색은 메모리 격자 인덱스를 사용하므로
+    # name 외의 컬럼에는 보조 인덱스를 두지 않습니다. (alembic 0003)
+    id = Column(Integer, primary_key=True)
     name = Column(String(100), index=True)
-    country = Column(String(100), index=True)
-    description = Column(String(255), index=True)
-    latitude = Column(Float, index=True)
-    longitude = Column(Float, index=True)
+    country = Column(String(100))
+    description = Column(String(255))
+    latitude = Column(Float)
+    longitude = Column(Float)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now)
-    deleted_at = Column(DateTime, default=datetime.now)
\ No newline at end of file
+    deleted_at = Column(DateTime, nullable=True)
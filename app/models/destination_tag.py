@@ -1,13 +1,18 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
 
 class DestinationTag(Base):
     __tablename__ = "destination_tag"
+    __table_args__ = (
+        # 여행지-태그 쌍은 하나만 (적재 시 ON DUPLICATE KEY UPDATE 키)
+        Index("uq_destination_tag_destination_id_tag_id", "destination_id", "tag_id", unique=True),
+        # WHERE tag_id IN (...) 추천 쿼리를 테이블 접근 없이 인덱스만으로 처리하는 커버링 인덱스
+        Index("ix_destination_tag_tag_id_destination_id_score", "tag_id", "destination_id", "score"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     destination_id = Column(Integer, ForeignKey("destination.id"))
     tag_id = Column(Integer, ForeignKey("tag.id"))
     score = Column(Integer, default=0)
-    
\ No newline at end of file
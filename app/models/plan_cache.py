@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, DateTime, LargeBinary
+from app.db.session import Base
+from datetime import datetime
+
+class PlanCache(Base):
+    __tablename__ = "plan_cache"
+
+    key = Column(String(64), primary_key=True)          # 정규화한 (destination, schedule) 의 sha256
+    destination = Column(String(255))
+    schedule = Column(String(255))
+    payload = Column(LargeBinary(length=2 ** 24))       # zlib 압축한 여행 계획 JSON
+    created_at = Column(DateTime, default=datetime.now)
+    expires_at = Column(DateTime, index=True)
@@ -1 +1,14 @@
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text
+from app.db.session import Base
+from datetime import datetime
 
+class SurveyModel(Base):
+    """설문 채점 모델 버전 (문항 → 태그 매핑 + 문항 가중치), active 인 한 행을 서버가 사용"""
+    __tablename__ = "survey_model"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)     # 모델 버전
+    tag_map = Column(Text, nullable=False)      # JSON { "q1": { "A": { "sightseeing": 1 } }, ... }
+    weights = Column(Text, nullable=False)      # JSON { "q1": 3, ... }
+    description = Column(String(255))
+    active = Column(Boolean, nullable=False, default=False, index=True)
+    created_at = Column(DateTime, default=datetime.now)
@@ -4,6 +4,6 @@ from app.db.session import Base
 class Tag(Base):
     __tablename__ = "tag"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(100), index=True)
-    label = Column(String(100), index=True)
\ No newline at end of file
+    label = Column(String(100))
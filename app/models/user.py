@@ -11,6 +11,7 @@ class User(Base):
     email = Column(String(255), unique=True, index=True)
     name = Column(String(255))
     nickname = Column(String(255))
+    password = Column(String(255), nullable=True)  # bcrypt 해시, Google 로그인 전용 계정은 NULL
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     deleted_at = Column(DateTime, nullable=True) 
\ No newline at end of file
@@ -0,0 +1,22 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProfilingSettings(BaseModel):
+    # 0 이면 샘플링 끔 (서명된 X-Profile 헤더 요청은 계속 프로파일링)
+    sample_rate: float = Field(ge=0.0, le=1.0)
+
+
+class SurveyModelConfig(BaseModel):
+    # { "q1": { "A": { "sightseeing": 1 }, ... }, ... } — 문항은 q1 ~ q7
+    tag_map: Dict[str, Dict[str, Dict[str, int]]]
+    # { "q1": 3, ... } — 없는 문항은 1
+    weights: Dict[str, int] = {}
+    description: Optional[str] = Field(None, max_length=255)
+    activate: bool = True
+
+
+class SurveyModelActivate(BaseModel):
+    # 0 이면 기본 모델로 되돌림
+    version: int = Field(ge=0)
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class NearbyDestination(BaseModel):
+    id: int
+    name: str
+    description: str
+    country: str
+    latitude: float
+    longitude: float
+    distance_km: float
+
+
+class NearbyResult(BaseModel):
+    destinations: List[NearbyDestination]
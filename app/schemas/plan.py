@@ -1,6 +1,38 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
 
 
 class PlanRequest(BaseModel):
     destination: str
-    schedule: str
\ No newline at end of file
+    schedule: str
+
+
+class PlanJobStatus(BaseModel):
+    job_id: str
+    status: str
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+
+# Gemini 응답 스키마 (response_schema 로도 전달하므로 Gemini 스키마가 지원하지 않는
+# ge / max_length 같은 제약 대신 타입과 description 만 사용합니다.)
+class PlanPlace(BaseModel):
+    # 비용을 숫자로 주는 경우가 있어 문자열로 변환
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    name: str = Field(description="장소 이름")
+    address: str = Field("", description="주소")
+    activity: str = Field("", description="할 것")
+    estimated_cost: str = Field("", description="예상 비용")
+
+
+class PlanDay(BaseModel):
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    day: int = Field(description="몇째 날인지 (1부터)")
+    description: str = Field("", description="그날 일정 요약")
+    places: List[PlanPlace] = Field(default_factory=list, description="방문할 장소 (방문 순서대로)")
+
+
+class TravelPlan(BaseModel):
+    plan: List[PlanDay] = Field(min_length=1, description="날짜별 일정")
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import List, Optional, Tuple
+from app.core.config import settings
 class Recommendation(BaseModel):
     name: str
     description : str
@@ -8,7 +9,17 @@ class Recommendation(BaseModel):
     latitude : float          
     longitude : float
 
-class SurveySubmit(BaseModel):
+class LocationFilter(BaseModel):
+    """내 위치(lat, lng)에서 radius_km 이내 여행지만 추천"""
+    lat: float = Field(ge=-90, le=90)
+    lng: float = Field(ge=-180, le=180)
+    radius_km: float = Field(gt=0, le=settings.GEO_MAX_RADIUS_KM)
+
+    def as_tuple(self) -> Tuple[float, float, float]:
+        return (self.lat, self.lng, self.radius_km)
+
+class SurveyAnswers(BaseModel):
+    """설문 응답 q1 ~ q7 (GET /survey/result 에서는 쿼리 파라미터)"""
     q1: str
     q2: str
     q3: str
@@ -17,5 +28,20 @@ class SurveySubmit(BaseModel):
     q6: str
     q7: str
 
+    def answers(self) -> dict:
+        """q1 ~ q7 응답만"""
+        return self.dict(exclude={"near"})
+
+class SurveySubmit(SurveyAnswers):
+    near: Optional[LocationFilter] = None
+
 class SurveyResult(BaseModel):
-    recommendations: List[Recommendation]
\ No newline at end of file
+    recommendations: List[Recommendation]
+    model_version: int        # 채점에 사용한 설문 모델 버전 (0 은 기본 모델)
+
+    class Config:
+        # model_version 필드가 pydantic 의 model_ 예약 접두사 경고에 걸리지 않도록
+        protected_namespaces = ()
+
+class SurveyBatchSubmit(BaseModel):
+    surveys: List[SurveySubmit]
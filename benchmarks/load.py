@@ -0,0 +1,338 @@
+"""
+엔드투엔드 부하 벤치마크 — SQLite + 가짜 Gemini 로 앱 전체를 띄워 엔드포인트별 RPS / 지연 분위수 측정
+
+    python -m benchmarks.load --destinations 10000 --concurrency 32 --requests 2000
+    python -m benchmarks.load --save baseline.json
+    python -m benchmarks.load --baseline baseline.json --tolerance 0.2
+
+- 합성 여행지/태그를 임시 SQLite DB 에 시드 (--destinations 최대 100k 까지)
+- Gemini 는 지연 시간(--gemini-latency-ms)과 응답 크기(--plan-days, --places-per-day)를
+  조절할 수 있는 가짜 모델로 대체
+- 앱은 프로세스 안에서 ASGI 로 직접 호출 (네트워크 / uvicorn 오버헤드 제외)
+- 결과는 JSON 으로 출력하고, --baseline 과 비교해 RPS 가 떨어지거나 p95/p99 가
+  tolerance 이상 늘어나면 exit 1
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ENDPOINTS = ["survey_submit", "plan_plan", "auth_me"]
+
+ANSWER_CHOICES = {
+    "q1": "AB", "q2": "AB", "q3": "ABCD", "q4": "ABCD",
+    "q5": "ABCD", "q6": "ABCD", "q7": "ABCD",
+}
+
+
+def configure_database(path: str) -> None:
+    """app 모듈을 import 하기 전에 DB URL 을 벤치마크용 SQLite 로 바꿔 둠"""
+    os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["ASYNC_SQLALCHEMY_DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+
+
+def seed_database(destinations: int, tags_per_destination: int, seed: int, chunk_size: int = 5000) -> None:
+    """설문 문항에 쓰이는 태그 + 합성 여행지 / destination_tag 점수 생성"""
+    from app.core.survey import QUESTION_TAG_MAP
+    from app.db.init_db import init_db
+    from app.db.session import engine
+    from app.models import Destination, DestinationTag, Tag
+
+    init_db()
+    rng = random.Random(seed)
+    tag_names = sorted({tag for choices in QUESTION_TAG_MAP.values() for tags in choices.values() for tag in tags})
+    tag_ids = list(range(1, len(tag_names) + 1))
+    per_destination = min(tags_per_destination, len(tag_ids))
+
+    with engine.begin() as conn:
+        conn.execute(Tag.__table__.delete())
+        conn.execute(DestinationTag.__table__.delete())
+        conn.execute(Destination.__table__.delete())
+        conn.execute(Tag.__table__.insert(), [
+            {"id": tag_id, "name": name, "label": name} for tag_id, name in zip(tag_ids, tag_names)
+        ])
+
+        link_id = 0
+        for start in range(1, destinations + 1, chunk_size):
+            ids = range(start, min(start + chunk_size, destinations + 1))
+            conn.execute(Destination.__table__.insert(), [
+                {
+                    "id": dest_id,
+                    "name": f"destination-{dest_id}",
+                    "country": "KR",
+                    "description": f"synthetic destination {dest_id}",
+                    "latitude": rng.uniform(33.0, 38.5),
+                    "longitude": rng.uniform(124.5, 131.0),
+                    "deleted_at": None,
+                }
+                for dest_id in ids
+            ])
+            links = []
+            for dest_id in ids:
+                for tag_id in rng.sample(tag_ids, per_destination):
+                    link_id += 1
+                    links.append({
+                        "id": link_id,
+                        "destination_id": dest_id,
+                        "tag_id": tag_id,
+                        "score": rng.randint(1, 5),
+                    })
+            conn.execute(DestinationTag.__table__.insert(), links)
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeStream:
+    def __init__(self, text: str, chunks: int, latency: float):
+        size = max(1, len(text) // max(chunks, 1))
+        self._parts = [text[i:i + size] for i in range(0, len(text), size)]
+        self._delay = latency / max(len(self._parts), 1)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for part in self._parts:
+            await asyncio.sleep(self._delay)
+            yield FakeResponse(part)
+
+
+class FakeGeminiModel:
+    """generate_content / generate_content_async 만 흉내 내는 Gemini 대역"""
+
+    def __init__(self, latency_ms: float, days: int, places_per_day: int):
+        self.latency = latency_ms / 1000
+        self.calls = 0
+        self.text = json.dumps({
+            "plan": [
+                {
+                    "day": day,
+                    "description": f"{day}일차 일정",
+                    "places": [
+                        {
+                            "name": f"장소 {day}-{place}",
+                            "address": f"가상시 가상구 {place}번길",
+                            "activity": "산책과 식사",
+                            "estimated_cost": "30,000원",
+                        }
+                        for place in range(1, places_per_day + 1)
+                    ],
+                }
+                for day in range(1, days + 1)
+            ]
+        }, ensure_ascii=False)
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        return FakeResponse(self.text)
+
+    async def generate_content_async(self, prompt, stream: bool = False, **kwargs):
+        self.calls += 1
+        if stream:
+            return FakeStream(self.text, chunks=8, latency=self.latency)
+        await asyncio.sleep(self.latency)
+        return FakeResponse(self.text)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    values = sorted(latencies)
+    return {
+        "requests": len(values) + errors,
+        "errors": errors,
+        "rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.mean(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(_percentile(values, 50) * 1000, 3),
+        "p95_ms": round(_percentile(values, 95) * 1000, 3),
+        "p99_ms": round(_percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+    }
+
+
+def _request_factory(endpoint: str, args, rng: random.Random, tokens: List[str]):
+    """엔드포인트별로 (method, url, kwargs) 를 만드는 함수"""
+    if endpoint == "survey_submit":
+        def build(i):
+            answers = {q: rng.choice(choices) for q, choices in ANSWER_CHOICES.items()}
+            return "POST", "/api/v1/survey/submit", {"json": answers}
+    elif endpoint == "plan_plan":
+        def build(i):
+            # plan_cache_hit_ratio 비율만큼은 같은 키로 보내 캐시 적중, 나머지는 매번 새 키로 생성
+            if rng.random() < args.plan_cache_hit_ratio:
+                destination = "벤치마크 인기 여행지"
+            else:
+                destination = f"벤치마크 여행지 {i}"
+            body = {"destination": destination, "schedule": f"{args.plan_days}일"}
+            return "POST", "/api/v1/plan/plan", {"json": body}
+    elif endpoint == "auth_me":
+        def build(i):
+            headers = {"Authorization": f"Bearer {tokens[i % len(tokens)]}"}
+            return "GET", "/api/v1/auth/me", {"headers": headers}
+    else:
+        raise ValueError(f"unknown endpoint: {endpoint}")
+    return build
+
+
+async def run_endpoint(client, endpoint: str, args, tokens: List[str]) -> Dict[str, float]:
+    """concurrency 개의 클라이언트가 requests 개 요청을 나눠 보내는 closed-loop 부하"""
+    rng = random.Random(args.seed)
+    build = _request_factory(endpoint, args, rng, tokens)
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(args.requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            method, url, kwargs = build(i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                ok = response.status_code < 400
+            except Exception as e:
+                print(f"Error in {endpoint} request: {e!r}", file=sys.stderr)
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    # 연결 / 캐시 초기화 비용이 측정에 섞이지 않도록 몇 번 먼저 호출
+    for i in range(min(args.warmup_requests, args.requests)):
+        method, url, kwargs = build(-1 - i)
+        await client.request(method, url, **kwargs)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run(args) -> dict:
+    import httpx
+
+    import app.core.plan as plan
+    from app.api.v1.endpoints.auth import create_jwt
+    from app.core.config import settings
+    from app.core.warmup import readiness
+    from app.main import app
+
+    # 모든 요청이 한 클라이언트(IP)에서 나가므로 클라이언트별 요청 한도는 끄고 서버 처리량만 측정
+    settings.RATE_LIMIT_ENABLED = False
+    # 부하 제한(503)이 아닌 처리량 / 지연을 비교하는 벤치마크이므로 적응형 동시 처리 제한도 끔
+    settings.CONCURRENCY_LIMIT_ENABLED = False
+    fake_model = FakeGeminiModel(args.gemini_latency_ms, args.plan_days, args.places_per_day)
+    plan._model = fake_model
+    tokens = [create_jwt(email=f"bench{i}@example.com", name=f"bench{i}") for i in range(args.users)]
+
+    await app.router.startup()
+    try:
+        while not readiness.ready:
+            await asyncio.sleep(0.05)
+
+        results = {}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for endpoint in args.endpoints:
+                results[endpoint] = await run_endpoint(client, endpoint, args, tokens)
+        results["plan_plan_gemini_calls"] = fake_model.calls
+        return results
+    finally:
+        await app.router.shutdown()
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """기준 결과 대비 회귀 항목 목록"""
+    failures = []
+    for endpoint, base in baseline.get("endpoints", {}).items():
+        now = current["endpoints"].get(endpoint)
+        if now is None:
+            continue
+        if now["rps"] < base["rps"] * (1 - tolerance):
+            failures.append(f"{endpoint} rps {now['rps']} < {base['rps']} * (1 - {tolerance})")
+        for key in ("p95_ms", "p99_ms"):
+            if base[key] and now[key] > base[key] * (1 + tolerance):
+                failures.append(f"{endpoint} {key} {now[key]} > {base[key]} * (1 + {tolerance})")
+        if now["errors"] > base["errors"]:
+            failures.append(f"{endpoint} errors {now['errors']} > {base['errors']}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="end-to-end load benchmark (SQLite + fake Gemini)")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument("--destinations", type=int, default=10000, help="시드할 여행지 수 (최대 100000)")
+    parser.add_argument("--tags-per-destination", type=int, default=6)
+    parser.add_argument("--requests", type=int, default=1000, help="엔드포인트별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup-requests", type=int, default=20)
+    parser.add_argument("--users", type=int, default=100, help="/auth/me 에 쓸 서로 다른 토큰 수")
+    parser.add_argument("--gemini-latency-ms", type=float, default=200.0)
+    parser.add_argument("--plan-days", type=int, default=3)
+    parser.add_argument("--places-per-day", type=int, default=4)
+    parser.add_argument("--plan-cache-hit-ratio", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default=None, help="SQLite 파일 경로 (기본: 임시 파일)")
+    parser.add_argument("--save", default=None, help="결과를 JSON 파일로 저장")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="기준 대비 허용 변화율")
+    args = parser.parse_args()
+
+    if not 1 <= args.destinations <= 100000:
+        parser.error("--destinations must be between 1 and 100000")
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="galae-bench-"), "bench.db")
+    configure_database(db_path)
+
+    started = time.perf_counter()
+    seed_database(args.destinations, args.tags_per_destination, args.seed)
+    seed_seconds = time.perf_counter() - started
+
+    result = {
+        "config": {
+            "destinations": args.destinations,
+            "tags_per_destination": args.tags_per_destination,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "gemini_latency_ms": args.gemini_latency_ms,
+            "plan_days": args.plan_days,
+            "places_per_day": args.places_per_day,
+            "plan_cache_hit_ratio": args.plan_cache_hit_ratio,
+            "python": sys.version.split()[0],
+        },
+        "seed_seconds": round(seed_seconds, 3),
+        "endpoints": asyncio.run(run(args)),
+    }
+    result["gemini_calls"] = result["endpoints"].pop("plan_plan_gemini_calls")
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = compare(result, json.load(f), args.tolerance)
+        if failures:
+            for failure in failures:
+                print(f"REGRESSION: {failure}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+과부하 벤치마크 — /plan/plan 을 처리량 이상으로 몰아붙이는 동안 /survey/submit 지연이 유지되는지 측정
+
+    python -m benchmarks.overload --duration 20 --plan-rps 150 --gemini-latency-ms 300
+    python -m benchmarks.overload --max-survey-p99-ms 250   # 적응형 제한을 켠 실행의 survey p99 가 넘으면 exit 1
+
+- 같은 부하를 적응형 동시 처리 제한을 끈 상태 / 켠 상태로 한 번씩 실행해 비교
+- survey: --survey-concurrency 개 클라이언트가 쉬지 않고 보내는 closed-loop 부하
+- plan:   --plan-rps 로 도착하는 open-loop 부하 (매번 새 여행지라 캐시 미적중),
+          가짜 Gemini 는 동시 호출이 --gemini-capacity 를 넘으면 그 비율만큼 느려지고,
+          실행 중간(--spike-at 초)부터는 기본 지연이 --spike-factor 배로 늘어남
+- 결과: 그룹별 지연 분위수, 503 거절 수, 종료 시점의 제한 값
+  (제한이 없으면 plan 요청이 끝없이 쌓이므로 종료 후 --drain-seconds 안에 끝나지 않은 요청은 abandoned 로 집계)
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List
+
+from benchmarks.load import ANSWER_CHOICES, FakeGeminiModel, FakeResponse, configure_database, seed_database, summarize
+
+
+class SaturatingGeminiModel(FakeGeminiModel):
+    """동시 호출 수가 capacity 를 넘으면 지연이 비례해 늘어나는 Gemini 대역 (spike() 이후 기본 지연 증가)"""
+
+    def __init__(self, latency_ms: float, capacity: int, days: int, places_per_day: int):
+        super().__init__(latency_ms, days, places_per_day)
+        self.capacity = capacity
+        self.inflight = 0
+
+    def spike(self, factor: float) -> None:
+        self.latency *= factor
+
+    async def generate_content_async(self, prompt, stream: bool = False, **kwargs):
+        self.calls += 1
+        self.inflight += 1
+        try:
+            await asyncio.sleep(self.latency * max(1.0, self.inflight / self.capacity))
+        finally:
+            self.inflight -= 1
+        return FakeResponse(self.text)
+
+
+async def _survey_load(client, stop: asyncio.Event, concurrency: int, rng: random.Random, result: dict) -> None:
+    async def worker():
+        while not stop.is_set():
+            answers = {q: rng.choice(choices) for q, choices in ANSWER_CHOICES.items()}
+            started = time.perf_counter()
+            response = await client.post("/api/v1/survey/submit", json=answers)
+            elapsed = time.perf_counter() - started
+            if response.status_code == 200:
+                result["latencies"].append(elapsed)
+            elif response.status_code == 503:
+                result["shed"] += 1
+                await asyncio.sleep(float(response.headers.get("retry-after", 1)))
+            else:
+                result["errors"] += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def _plan_load(client, stop: asyncio.Event, rps: float, prefix: str, drain_seconds: float,
+                     result: dict) -> None:
+    tasks = []
+    counter = 0
+
+    async def one(i: int):
+        started = time.perf_counter()
+        try:
+            response = await client.post(
+                "/api/v1/plan/plan", json={"destination": f"{prefix} 여행지 {i}", "schedule": "3일"}
+            )
+        except Exception as e:
+            print(f"Error in plan request: {e!r}", file=sys.stderr)
+            result["errors"] += 1
+            return
+        elapsed = time.perf_counter() - started
+        if response.status_code == 200:
+            result["latencies"].append(elapsed)
+        elif response.status_code == 503:
+            result["shed"] += 1
+            result["shed_latencies"].append(elapsed)
+        else:
+            result["errors"] += 1
+
+    interval = 1 / rps
+    next_at = time.perf_counter()
+    while not stop.is_set():
+        counter += 1
+        tasks.append(asyncio.ensure_future(one(counter)))
+        next_at += interval
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+    # 종료 시점에 남은 요청은 drain_seconds 까지만 기다리고 나머지는 취소 (측정 시간에는 포함하지 않음)
+    result["pending_at_stop"] = sum(not task.done() for task in tasks)
+    _, pending = await asyncio.wait(tasks, timeout=drain_seconds) if tasks else (set(), set())
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    result["abandoned"] = len(pending)
+
+
+async def run_scenario(app, args, limiter_enabled: bool) -> dict:
+    import httpx
+
+    import app.core.concurrency as concurrency
+    import app.core.plan as plan
+    from app.core.config import settings
+
+    settings.CONCURRENCY_LIMIT_ENABLED = limiter_enabled
+    # 부하가 한 클라이언트(IP)에서 나가므로 클라이언트별 요청 한도는 끄고 동시 처리 제한만 비교
+    settings.RATE_LIMIT_ENABLED = False
+    for name, limiter in list(concurrency.limiters.items()):
+        concurrency.limiters[name] = concurrency.AdaptiveLimiter(
+            name, settings.CONCURRENCY_INITIAL_LIMIT, limiter.min_limit, limiter.max_limit
+        )
+    model = SaturatingGeminiModel(args.gemini_latency_ms, args.gemini_capacity, args.plan_days, args.places_per_day)
+    plan._model = model
+
+    survey = {"latencies": [], "errors": 0, "shed": 0}
+    plan_result = {"latencies": [], "shed_latencies": [], "errors": 0, "shed": 0}
+    stop = asyncio.Event()
+    rng = random.Random(args.seed)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        started = time.perf_counter()
+        loads = asyncio.gather(
+            _survey_load(client, stop, args.survey_concurrency, rng, survey),
+            _plan_load(client, stop, args.plan_rps, f"limiter-{limiter_enabled}", args.drain_seconds, plan_result),
+        )
+        await asyncio.sleep(args.spike_at)
+        model.spike(args.spike_factor)
+        await asyncio.sleep(max(0.0, args.duration - args.spike_at))
+        stop.set()
+        elapsed = time.perf_counter() - started
+        limits = concurrency.concurrency_stats()
+        await loads
+
+    return {
+        "limiter": "on" if limiter_enabled else "off",
+        "survey_submit": {**summarize(survey["latencies"], survey["errors"], elapsed), "shed": survey["shed"]},
+        "plan_plan": {
+            **summarize(plan_result["latencies"], plan_result["errors"], elapsed),
+            "shed": plan_result["shed"],
+            "shed_p99_ms": summarize(plan_result["shed_latencies"], 0, elapsed)["p99_ms"],
+            "pending_at_stop": plan_result["pending_at_stop"],
+            "abandoned": plan_result["abandoned"],
+        },
+        "limits": limits,
+        "gemini_calls": model.calls,
+    }
+
+
+async def _cancel_background_generations() -> None:
+    """
+    클라이언트가 끊겨도 계속되는 Gemini 생성 task(plan_cache 의 single-flight)를 정리해
+    다음 시나리오가 앞 시나리오의 밀린 작업 뒤에서 기다리지 않도록 함
+    """
+    from app.core.plan_cache import plan_cache
+
+    tasks = list(plan_cache._inflight.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def run(args) -> List[dict]:
+    from app.core.warmup import readiness
+    from app.main import app
+
+    await app.router.startup()
+    try:
+        while not readiness.ready:
+            await asyncio.sleep(0.05)
+        results = []
+        for enabled in (False, True):
+            results.append(await run_scenario(app, args, enabled))
+            await _cancel_background_generations()
+        return results
+    finally:
+        await app.router.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="overload benchmark for adaptive concurrency limiting")
+    parser.add_argument("--destinations", type=int, default=5000)
+    parser.add_argument("--tags-per-destination", type=int, default=6)
+    parser.add_argument("--duration", type=float, default=20.0, help="시나리오당 부하 시간(초)")
+    parser.add_argument("--survey-concurrency", type=int, default=8)
+    parser.add_argument("--plan-rps", type=float, default=150.0, help="/plan/plan 도착률 (초당)")
+    parser.add_argument("--gemini-latency-ms", type=float, default=300.0)
+    parser.add_argument("--gemini-capacity", type=int, default=8, help="이 이상 동시 호출되면 Gemini 가 느려짐")
+    parser.add_argument("--spike-at", type=float, default=10.0, help="Gemini 지연이 늘어나는 시점(초)")
+    parser.add_argument("--spike-factor", type=float, default=4.0)
+    parser.add_argument("--drain-seconds", type=float, default=5.0, help="종료 후 남은 plan 요청을 기다릴 시간")
+    parser.add_argument("--plan-days", type=int, default=3)
+    parser.add_argument("--places-per-day", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default=None, help="SQLite 파일 경로 (기본: 임시 파일)")
+    parser.add_argument("--save", default=None, help="결과를 JSON 파일로 저장")
+    parser.add_argument("--max-survey-p99-ms", type=float, default=None,
+                        help="제한을 켠 실행의 /survey/submit p99 상한 (넘으면 exit 1)")
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="galae-overload-"), "bench.db")
+    configure_database(db_path)
+    seed_database(args.destinations, args.tags_per_destination, args.seed)
+
+    scenarios = asyncio.run(run(args))
+    result = {"config": vars(args), "scenarios": scenarios}
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+    limited = scenarios[-1]["survey_submit"]
+    if args.max_survey_p99_ms is not None and limited["p99_ms"] > args.max_survey_p99_ms:
+        print(f"REGRESSION: survey_submit p99 {limited['p99_ms']} ms > {args.max_survey_p99_ms} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+비밀번호 해싱 마이크로 벤치마크 — 코어당 초당 bcrypt 해시 수 측정
+
+    python -m benchmarks.password_hashing --rounds 10 12 --count 20
+
+BCRYPT_ROUNDS 를 환경별로 정할 때 참고용으로 사용합니다.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.password import _hash
+
+
+def _single_core(rounds: int, count: int) -> float:
+    _hash("warm-up", rounds)
+    started = time.perf_counter()
+    for i in range(count):
+        _hash(f"password-{i}", rounds)
+    return count / (time.perf_counter() - started)
+
+
+def _pool(rounds: int, count: int, workers: int) -> float:
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(_hash, ["warm-up"] * workers, [rounds] * workers))
+        started = time.perf_counter()
+        list(executor.map(_hash, [f"password-{i}" for i in range(count)], [rounds] * count))
+        return count / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="bcrypt hashes/sec per core")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 12])
+    parser.add_argument("--count", type=int, default=20, help="rounds 별 해시 횟수")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    results = []
+    for rounds in args.rounds:
+        single = _single_core(rounds, args.count)
+        pooled = _pool(rounds, args.count * args.workers, args.workers)
+        results.append({
+            "rounds": rounds,
+            "hashes_per_sec_per_core": round(single, 2),
+            "ms_per_hash": round(1000 / single, 2),
+            "pool_workers": args.workers,
+            "pool_hashes_per_sec": round(pooled, 2),
+            "pool_hashes_per_sec_per_core": round(pooled / args.workers, 2),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
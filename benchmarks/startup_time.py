@@ -0,0 +1,82 @@
+"""
+워커 기동 시간 벤치마크 — 새 프로세스에서 `import app.main` 에 걸리는 시간 측정
+
+    python -m benchmarks.startup_time --runs 5 --max-seconds 1.5
+    python -m benchmarks.startup_time --save baseline.json
+    python -m benchmarks.startup_time --baseline baseline.json --tolerance 0.2
+
+무거운 모듈(google.generativeai 등)이 다시 import 시점에 로드되면 실패(exit 1)합니다.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# import 시점에 로드되면 안 되는 모듈 (첫 사용 시 lazy import)
+LAZY_MODULES = ["google.generativeai"]
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+
+def _measure_once() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(lazy=LAZY_MODULES)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    # app 모듈이 출력하는 로그가 섞일 수 있어 마지막 줄만 사용
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="import app.main cold start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None, help="중앙값 허용 상한")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="기준 대비 허용 증가율")
+    parser.add_argument("--save", default=None, help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    samples = [_measure_once() for _ in range(args.runs)]
+    seconds = [s["seconds"] for s in samples]
+    loaded = sorted({m for s in samples for m in s["loaded"]})
+    result = {
+        "runs": args.runs,
+        "median_seconds": round(statistics.median(seconds), 4),
+        "min_seconds": round(min(seconds), 4),
+        "max_seconds": round(max(seconds), 4),
+        "eagerly_loaded": loaded,
+    }
+    print(json.dumps(result, indent=2))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+
+    failures = []
+    if loaded:
+        failures.append(f"modules imported eagerly: {', '.join(loaded)}")
+    if args.max_seconds is not None and result["median_seconds"] > args.max_seconds:
+        failures.append(f"median {result['median_seconds']}s > {args.max_seconds}s")
+    if args.baseline:
+        with open(args.baseline) as f:
+            limit = json.load(f)["median_seconds"] * (1 + args.tolerance)
+        if result["median_seconds"] > limit:
+            failures.append(f"median {result['median_seconds']}s > baseline limit {limit:.4f}s")
+
+    if failures:
+        for failure in failures:
+            print(f"REGRESSION: {failure}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+# app 모듈이 설정을 읽기 전에 테스트용 SQLite 로 바꿔 둠 (MySQL 불필요)
+_DB_DIR = tempfile.mkdtemp(prefix="galae-test-")
+DB_PATH = os.path.join(_DB_DIR, "test.db")
+os.environ.setdefault("SQLALCHEMY_DATABASE_URL", f"sqlite:///{DB_PATH}")
+os.environ.setdefault("ASYNC_SQLALCHEMY_DATABASE_URL", f"sqlite+aiosqlite:///{DB_PATH}")
+
+# 삭제된 여행지 id (시드 데이터 기준)
+DELETED_IDS = {3, 17, 40}
+# 모든 태그 점수가 같아 항상 동점이 되는 여행지 id 묶음
+TIED_IDS = [(21, 22, 23), (30, 31)]
+
+
+def _catalog(tag_names, destinations: int = 48):
+    """
+    결정적인 합성 카탈로그 (동점 / 삭제된 여행지 / 태그가 없는 여행지 포함)
+    → (destination 행, destination_tag 행)
+    """
+    created = datetime(2026, 1, 1)
+    tied = {dest_id: group[0] for group in TIED_IDS for dest_id in group}
+    rows, links = [], []
+    for dest_id in range(1, destinations + 1):
+        rows.append({
+            "id": dest_id,
+            "name": f"destination-{dest_id}",
+            "country": "KR",
+            "description": f"seeded destination {dest_id}",
+            "latitude": 33.0 + (dest_id % 12) * 0.45,
+            "longitude": 124.5 + (dest_id // 12) * 1.5,
+            "created_at": created,
+            "updated_at": created,
+            "deleted_at": created + timedelta(days=30) if dest_id in DELETED_IDS else None,
+        })
+        if dest_id == destinations:
+            continue  # 태그가 하나도 없는 여행지
+        base = tied.get(dest_id, dest_id)
+        for offset, tag_name in enumerate(tag_names):
+            # 점수 1~3 의 작은 범위라 동점이 자주 생김, 일부 태그는 비워 둠
+            if (base + offset) % 4 == 0:
+                continue
+            links.append({
+                "destination_id": dest_id,
+                "tag_name": tag_name,
+                "score": (base * 7 + offset * 3) % 3 + 1,
+            })
+    return rows, links
+
+
+@pytest.fixture(scope="session")
+def seeded_db():
+    """
+    alembic 마이그레이션을 적용한 SQLite DB 에 합성 카탈로그를 넣고 세션을 반환
+    (메모리 점수 행렬 / 설문 조회 테이블은 시드 후 다시 읽도록 비움)
+    """
+    from app.core.catalog import invalidate_recommendation_caches
+    from app.core.survey_model import QUESTION_TAG_MAP
+    from app.db.init_db import init_db
+    from app.db.session import SessionLocal, engine
+    from app.models import Destination, DestinationTag, Tag
+
+    init_db()
+    tag_names = sorted({tag for choices in QUESTION_TAG_MAP.values() for tags in choices.values() for tag in tags})
+    rows, links = _catalog(tag_names)
+    with engine.begin() as conn:
+        conn.execute(DestinationTag.__table__.delete())
+        conn.execute(Tag.__table__.delete())
+        conn.execute(Destination.__table__.delete())
+        conn.execute(Tag.__table__.insert(), [
+            {"id": tag_id, "name": name, "label": name} for tag_id, name in enumerate(tag_names, start=1)
+        ])
+        tag_ids = {name: tag_id for tag_id, name in enumerate(tag_names, start=1)}
+        conn.execute(Destination.__table__.insert(), rows)
+        conn.execute(DestinationTag.__table__.insert(), [
+            {"destination_id": link["destination_id"], "tag_id": tag_ids[link["tag_name"]], "score": link["score"]}
+            for link in links
+        ])
+    invalidate_recommendation_caches()
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
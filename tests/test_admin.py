@@ -0,0 +1,44 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "test-admin-token")
+    # lifespan(startup) 없이 라우트만 호출
+    return TestClient(app)
+
+
+ADMIN = {"X-Admin-Token": "test-admin-token"}
+
+
+def test_db_pool_requires_admin_token(client):
+    assert client.get("/db/pool").status_code == 404
+    assert client.get("/api/v1/admin/db/pool").status_code == 403
+    assert client.get("/api/v1/admin/db/pool", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+    response = client.get("/api/v1/admin/db/pool", headers=ADMIN)
+    assert response.status_code == 200
+    assert set(response.json()) == {"sync", "async"}
+
+
+def test_plan_cache_stats_requires_admin_token(client):
+    assert client.get("/api/v1/plan/cache/stats").status_code in (404, 405)
+    assert client.get("/api/v1/admin/plan-cache").status_code == 403
+    assert client.get("/api/v1/admin/plan-cache", headers=ADMIN).status_code == 200
+
+
+def test_auth_cache_stats_requires_admin_token(client):
+    assert client.get("/api/v1/auth/cache/stats").status_code == 404
+    assert client.get("/api/v1/admin/auth-cache").status_code == 403
+    assert client.get("/api/v1/admin/auth-cache", headers=ADMIN).status_code == 200
+
+
+def test_metrics_requires_admin_token(client):
+    assert client.get("/metrics").status_code == 403
+    response = client.get("/metrics", headers=ADMIN)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from jose import jwk, jwt
+
+from app.api.v1.endpoints.auth import create_jwt
+from app.core.auth import get_current_user, user_cache
+from app.core.config import settings
+from app.core.google_keys import google_key_cache
+from app.db.session import AsyncSessionLocal
+from app.main import app
+from app.models.user import User
+
+
+@pytest.fixture
+def user(seeded_db):
+    user = User(id=1001, email="withdraw@example.com", name="withdraw")
+    seeded_db.add(user)
+    seeded_db.commit()
+    yield user
+    seeded_db.query(User).filter(User.id == 1001).delete()
+    seeded_db.commit()
+    user_cache.invalidate("withdraw@example.com")
+
+
+async def _current_user(payload):
+    async with AsyncSessionLocal() as db:
+        return await get_current_user(payload, db)
+
+
+def test_withdraw_soft_deletes_and_invalidates_cached_user(seeded_db, user):
+    payload = {"sub": user.email}
+    asyncio.run(_current_user(payload))
+    assert user_cache.get(user.email) is not None
+
+    # lifespan(startup) 없이 라우트만 호출
+    client = TestClient(app)
+    response = client.delete(
+        "/api/v1/auth/me", headers={"Authorization": f"Bearer {create_jwt(user.email, user.name)}"}
+    )
+    assert response.status_code == 204
+    assert user_cache.get(user.email) is None
+
+    seeded_db.expire_all()
+    assert seeded_db.get(User, 1001).deleted_at is not None
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(_current_user(payload))
+    assert excinfo.value.status_code == 401
+
+
+CLIENT_ID = "test-client.apps.googleusercontent.com"
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+PRIVATE_PEM = PRIVATE_KEY.private_bytes(
+    serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+)
+PUBLIC_PEM = PRIVATE_KEY.public_key().public_bytes(
+    serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+)
+# Google JWKS 대신 쓰는 로컬 키 목록
+JWKS = {"test-kid": {**jwk.construct(PUBLIC_PEM, "RS256").to_dict(), "kid": "test-kid"}}
+
+
+def _google_credential(kid="test-kid", **claims):
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com",
+        "aud": CLIENT_ID,
+        "iat": now,
+        "exp": now + 600,
+        "email": "google@example.com",
+        "name": "google",
+        **claims,
+    }
+    return jwt.encode(payload, PRIVATE_PEM, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture
+def google(monkeypatch):
+    async def get_key(kid):
+        return JWKS.get(kid)
+
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", CLIENT_ID)
+    monkeypatch.setattr(google_key_cache, "get_key", get_key)
+    return TestClient(app)
+
+
+def _decode(client, credential):
+    return client.post("/api/v1/auth/google/decode", json={"credential": credential})
+
+
+def test_google_credential_is_accepted(google):
+    response = _decode(google, _google_credential())
+    assert response.status_code == 200
+    assert jwt.get_unverified_claims(response.json()["access_token"])["email"] == "google@example.com"
+
+
+@pytest.mark.parametrize("kid, claims", [
+    ("test-kid", {"aud": "someone-else.apps.googleusercontent.com"}),
+    ("test-kid", {"iss": "https://evil.example.com"}),
+    ("test-kid", {"exp": int(time.time()) - 60}),
+    ("unknown-kid", {}),
+])
+def test_invalid_google_credential_is_rejected(google, kid, claims):
+    assert _decode(google, _google_credential(kid, **claims)).status_code == 400
+
+
+def test_google_login_fails_closed_without_client_id(google, monkeypatch):
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", None)
+    assert _decode(google, _google_credential()).status_code == 503
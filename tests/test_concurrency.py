@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from app.core.concurrency import AdaptiveLimiter
+from app.core.config import settings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _limiter(clock, initial=20, max_limit=200):
+    return AdaptiveLimiter("test", initial, settings.CONCURRENCY_MIN_LIMIT, max_limit, clock=clock)
+
+
+def _drive(limiter, clock, latencies, concurrency):
+    """
+    concurrency 개씩 동시에 보내고 주어진 지연(초)으로 끝난 것으로 기록
+    (시계는 묶음에서 가장 느린 요청만큼 진행, 반환값은 거절된 요청 수)
+    """
+    shed = 0
+    for start in range(0, len(latencies), concurrency):
+        batch = latencies[start:start + concurrency]
+        admitted = [latency for latency in batch if limiter.try_acquire()]
+        shed += len(batch) - len(admitted)
+        for latency in admitted:
+            limiter.release(latency)
+        clock.now += max(batch)
+    return shed
+
+
+def test_warmup_admits_observed_concurrency(clock):
+    limiter = _limiter(clock, initial=20)
+    # 초기 제한(20)보다 많은 정상 트래픽이 처음부터 들어와도 거절하지 않고, 그 동시 처리 수에서 시작
+    assert _drive(limiter, clock, [0.005] * 640, concurrency=32) == 0
+    assert not limiter.warming_up
+    assert limiter.limit >= 32 and limiter.decreases == 0
+
+
+def test_first_request_does_not_anchor_the_baseline(clock):
+    limiter = _limiter(clock)
+    # 첫 요청만 캐시 적중으로 빠르고 이후는 평소대로 300ms → 평소 지연은 300ms 근처로 잡혀야 함
+    latencies = [0.001] + [0.3] * 999
+    assert _drive(limiter, clock, latencies, concurrency=8) == 0
+    assert limiter.decreases == 0
+    assert limiter.long_latency == pytest.approx(0.3, rel=0.05)
+
+
+def test_jitter_and_isolated_slow_requests_do_not_cut(clock):
+    rng = random.Random(1)
+    limiter = _limiter(clock)
+    # 수 ms 짜리 라우트 + 가끔 섞이는 느린 요청(로그인 bcrypt 등)
+    latencies = [0.4 if i % 100 == 99 else rng.uniform(0.001, 0.01) for i in range(5000)]
+    assert _drive(limiter, clock, latencies, concurrency=16) == 0
+    assert limiter.decreases == 0
+
+
+def test_sustained_latency_increase_cuts_once_per_interval(clock):
+    limiter = _limiter(clock, max_limit=64)
+    _drive(limiter, clock, [0.3] * 200, concurrency=8)
+    limit, started = limiter.limit, clock.now
+
+    # 지연이 4배로 늘어난 상태가 이어지면 제한을 줄이되, 간격마다 한 번만 줄임
+    _drive(limiter, clock, [1.2] * 200, concurrency=8)
+    interval = max(settings.CONCURRENCY_DECREASE_INTERVAL_SECONDS, limiter.long_latency)
+    assert limiter.limit < limit
+    assert 0 < limiter.decreases <= (clock.now - started) / interval + 1
+
+
+def test_failures_back_off(clock):
+    limiter = _limiter(clock)
+    _drive(limiter, clock, [0.005] * settings.CONCURRENCY_WARMUP_SAMPLES, concurrency=1)
+    limit = limiter.limit
+    assert limiter.try_acquire()
+    limiter.release(0.005, failed=True)
+    assert limiter.limit == pytest.approx(limit * settings.CONCURRENCY_BACKOFF_RATIO)
@@ -0,0 +1,103 @@
+import pytest
+from sqlalchemy import select
+
+from app.core.catalog import get_catalog_version, invalidate_recommendation_caches
+from app.db.ingest import TagResolver, ingest
+from app.db.session import engine
+from app.models import Destination, DestinationTag, Tag
+
+# 시드 카탈로그(1~48)와 겹치지 않는 id / 태그 이름
+FIRST_ID = 9001
+
+
+@pytest.fixture
+def catalog(seeded_db):
+    yield seeded_db
+    with engine.begin() as conn:
+        conn.execute(DestinationTag.__table__.delete().where(DestinationTag.destination_id >= FIRST_ID))
+        conn.execute(Destination.__table__.delete().where(Destination.id >= FIRST_ID))
+        conn.execute(Tag.__table__.delete().where(Tag.name.like("ingest-%")))
+    invalidate_recommendation_caches()
+
+
+def _destination(dest_id, name=None):
+    return {"id": dest_id, "name": name or f"ingest-{dest_id}", "country": "KR"}
+
+
+def _records(rows):
+    return list(enumerate(rows, start=1))
+
+
+def _version(db):
+    db.expire_all()
+    return get_catalog_version(db)
+
+
+def test_abort_after_commit_still_bumps_catalog_version(catalog):
+    before = _version(catalog)
+    rows = [_destination(FIRST_ID), _destination(FIRST_ID + 1)] + [{"id": -1}] * 3
+    # 첫 배치(2행)는 커밋되고, 다음 배치에서 max_errors 를 넘어 중단
+    with pytest.raises(SystemExit):
+        ingest(_records(rows), "destinations", batch_size=2, max_errors=1, progress=False)
+
+    assert _version(catalog) == before + 1
+    ids = catalog.execute(select(Destination.id).where(Destination.id >= FIRST_ID)).scalars().all()
+    assert sorted(ids) == [FIRST_ID, FIRST_ID + 1]
+
+
+def test_duplicate_keys_keep_the_last_row(catalog):
+    rows = [
+        _destination(FIRST_ID, "ingest-first"),
+        _destination(FIRST_ID, "ingest-second"),    # 같은 배치 안의 중복
+        _destination(FIRST_ID, "ingest-third"),     # 다음 배치에서 upsert
+    ]
+    stats = ingest(_records(rows), "destinations", batch_size=2, progress=False)
+    assert (stats.read, stats.written, stats.rejected) == (3, 2, 0)
+
+    scores = [
+        {"destination_id": FIRST_ID, "tag": "ingest-tag", "score": 1},
+        {"destination_id": FIRST_ID, "tag": "ingest-tag", "score": 2},
+        {"destination_id": FIRST_ID, "tag": "ingest-tag", "score": 3},
+    ]
+    ingest(_records(scores), "scores", batch_size=2, create_tags=True, progress=False)
+
+    catalog.expire_all()
+    assert catalog.get(Destination, FIRST_ID).name == "ingest-third"
+    assert catalog.execute(
+        select(DestinationTag.score).where(DestinationTag.destination_id == FIRST_ID)
+    ).scalars().all() == [3]
+
+
+def test_create_tags_only_keeps_ids_from_committed_batches(catalog):
+    ingest(_records([_destination(FIRST_ID)]), "destinations", progress=False)
+    scores = [
+        {"destination_id": FIRST_ID, "tag": "ingest-new", "score": 1},
+        {"destination_id": FIRST_ID, "tag": "ingest-new", "score": 2},
+        {"destination_id": FIRST_ID, "tag": "ingest-missing", "score": 1},
+        {"destination_id": 999999, "tag": "ingest-missing", "score": 1},
+    ]
+    # 첫 배치는 커밋, 두 번째 배치는 태그를 만든 뒤 거부 행으로 중단되어 롤백
+    with pytest.raises(SystemExit):
+        ingest(_records(scores), "scores", batch_size=2, create_tags=True, max_errors=0, progress=False)
+    names = catalog.execute(select(Tag.name).where(Tag.name.like("ingest-%"))).scalars().all()
+    assert names == ["ingest-new"]
+
+    # 새 태그는 기존 태그처럼 다시 사용되고, 없는 태그는 --create-tags 없이는 거부
+    stats = ingest(_records([scores[1], scores[2]]), "scores", progress=False)
+    assert (stats.written, stats.rejected, stats.created_tags) == (1, 1, 0)
+
+
+def test_tag_resolver_forgets_ids_from_rolled_back_batch(catalog):
+    with engine.connect() as conn:
+        resolver = TagResolver(conn, create=True)
+    with pytest.raises(RuntimeError):
+        with engine.begin() as conn:
+            resolver.resolve(conn, "ingest-rolled-back")
+            raise RuntimeError("batch failed")
+    resolver.rollback()
+
+    with engine.begin() as conn:
+        tag_id = resolver.resolve(conn, "ingest-rolled-back")
+    resolver.commit()
+    assert catalog.get(Tag, tag_id).name == "ingest-rolled-back"
+    assert resolver.created == 1
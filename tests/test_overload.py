@@ -0,0 +1,50 @@
+import argparse
+import asyncio
+
+import app.core.concurrency as concurrency
+import app.core.plan as plan
+from app.core.config import settings
+from app.main import app
+from benchmarks.overload import _cancel_background_generations, run_scenario
+
+# benchmarks.overload 의 기본 시나리오를 짧게 줄인 설정 (Gemini 처리량 이상으로 /plan/plan 을 보내고 중간에 지연 급증)
+SCENARIO = argparse.Namespace(
+    duration=4.0,
+    spike_at=2.0,
+    spike_factor=4.0,
+    survey_concurrency=4,
+    plan_rps=100.0,
+    gemini_latency_ms=300.0,
+    gemini_capacity=8,
+    drain_seconds=5.0,
+    plan_days=3,
+    places_per_day=4,
+    seed=42,
+)
+
+
+async def _run():
+    try:
+        return await run_scenario(app, SCENARIO, limiter_enabled=True)
+    finally:
+        await _cancel_background_generations()
+
+
+def test_survey_is_not_shed_while_plan_is_saturated(seeded_db, monkeypatch):
+    # run_scenario 가 바꾸는 전역 상태는 테스트가 끝나면 되돌림
+    monkeypatch.setattr(settings, "CONCURRENCY_LIMIT_ENABLED", settings.CONCURRENCY_LIMIT_ENABLED)
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", settings.RATE_LIMIT_ENABLED)
+    monkeypatch.setattr(concurrency, "limiters", dict(concurrency.limiters))
+    monkeypatch.setattr(plan, "_model", plan._model)
+
+    result = asyncio.run(_run())
+    survey, plan_result = result["survey_submit"], result["plan_plan"]
+
+    # plan 은 포화 상태 → 빠르게 거절되고 대기 중인 요청이 쌓이지 않음
+    assert plan_result["shed"] > 0
+    assert plan_result["pending_at_stop"] < result["limits"]["plan"]["limit"] + SCENARIO.plan_rps
+    # 그동안 survey 는 거절 없이 처리됨 (동시 요청 수가 최소 제한보다 작아 지연과 무관하게 결정적)
+    # 지연 기준의 제한 동작은 tests/test_concurrency.py 에서 가짜 시계로 확인
+    assert SCENARIO.survey_concurrency < settings.CONCURRENCY_MIN_LIMIT
+    assert survey["requests"] > 0
+    assert survey["errors"] == 0 and survey["shed"] == 0
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from app.core.auth import authenticate_user
+from app.core.password import PasswordHasher, get_password_context, password_hasher
+from app.db.session import AsyncSessionLocal
+from app.models.user import User
+
+
+@pytest.fixture
+def user(seeded_db):
+    # 설정과 다른 rounds 로 만든 해시 → 로그인 성공 시 새 rounds 로 다시 저장됨
+    old_rounds = 4 if password_hasher.rounds != 4 else 5
+    user = User(id=2001, email="login@example.com", name="login",
+                password=get_password_context(old_rounds).hash("correct horse"))
+    seeded_db.add(user)
+    seeded_db.commit()
+    yield user
+    seeded_db.query(User).filter(User.id == 2001).delete()
+    seeded_db.commit()
+
+
+async def _authenticate(email: str, password: str):
+    async with AsyncSessionLocal() as db:
+        return await authenticate_user(db, email, password)
+
+
+def test_authenticate_user_with_async_session(seeded_db, user):
+    old_hash = user.password
+    try:
+        assert asyncio.run(_authenticate(user.email, "wrong")) is None
+        assert asyncio.run(_authenticate("nobody@example.com", "correct horse")) is None
+        authenticated = asyncio.run(_authenticate(user.email, "correct horse"))
+    finally:
+        password_hasher.shutdown()
+    assert authenticated is not None and authenticated.id == user.id
+
+    seeded_db.expire_all()
+    new_hash = seeded_db.get(User, user.id).password
+    assert new_hash != old_hash
+    assert get_password_context(password_hasher.rounds).verify("correct horse", new_hash)
+
+
+def test_pool_workers_are_not_forked_and_can_be_prewarmed():
+    hasher = PasswordHasher(rounds=4, workers=2, max_pending=4)
+    try:
+        hasher.start()
+        # 서버 프로세스를 그대로 복제하는 fork 는 쓰지 않음
+        assert hasher._executor._mp_context.get_start_method() in ("forkserver", "spawn")
+        hashed = asyncio.run(hasher.hash("correct horse"))
+        assert asyncio.run(hasher.verify("correct horse", hashed)) == (True, None)
+    finally:
+        hasher.shutdown()
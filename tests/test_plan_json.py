@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api.v1.endpoints.plan as plan_endpoint
+import app.core.plan as plan
+from app.core.plan import InvalidPlanResponse, parse_plan_or_reask, parse_plan_text
+from app.core.plan_cache import PlanCacheService, plan_fingerprint
+from app.core.plan_json import loads_tolerant
+from app.main import app
+
+PLAN = {
+    "plan": [
+        {"day": 1, "description": "첫째 날, {도착}", "places": [
+            {"name": "A", "address": "서울", "activity": "산책", "estimated_cost": "0원"},
+        ]},
+        {"day": 2, "description": "둘째 날", "places": [
+            {"name": "B", "address": "부산", "activity": "바다", "estimated_cost": "1만원"},
+        ]},
+    ]
+}
+TEXT = json.dumps(PLAN, ensure_ascii=False)
+
+
+def test_valid_json_needs_no_repair():
+    assert loads_tolerant(TEXT) == (PLAN, [])
+
+
+@pytest.mark.parametrize("text, repairs", [
+    (f"```json\n{TEXT}\n```", ["fence"]),
+    (f"```\n{TEXT}", ["fence"]),
+    (f"여행 계획입니다:\n{TEXT}\n즐거운 여행 되세요!", ["prose"]),
+    (f"```json\n다음과 같습니다 {TEXT}\n```", ["fence", "prose"]),
+])
+def test_fence_and_prose(text, repairs):
+    assert loads_tolerant(text) == (PLAN, repairs)
+
+
+def test_trailing_commas_outside_strings():
+    text = '{"plan": [{"day": 1, "description": "a, ]", "places": [],},],}'
+    value, repairs = loads_tolerant(text)
+    assert repairs == ["trailing_comma"]
+    assert value == {"plan": [{"day": 1, "description": "a, ]", "places": []}]}
+
+
+def test_truncated_output_keeps_completed_elements():
+    cut = TEXT[:TEXT.index('"B"') + 2]
+    value, repairs = loads_tolerant(cut)
+    assert "truncated" in repairs
+    assert [day["day"] for day in value["plan"]] == [1]
+
+
+def test_unrecoverable_text_raises():
+    with pytest.raises(json.JSONDecodeError):
+        loads_tolerant("plan 을 만들 수 없습니다")
+
+
+def test_parse_plan_text_accepts_repaired_but_rejects_truncated():
+    assert parse_plan_text(f"```json\n{TEXT}\n```") == PLAN
+    with pytest.raises(InvalidPlanResponse, match="끊겨"):
+        parse_plan_text(TEXT[:TEXT.index('"B"') + 2])
+
+
+def test_truncated_reply_is_reasked_and_never_cached(monkeypatch):
+    truncated = TEXT[:TEXT.index('"B"') + 2]
+    reasks = []
+
+    async def fake_generate(contents, operation):
+        reasks.append(contents)
+        return truncated if operation == "generate" else TEXT
+
+    monkeypatch.setattr(plan, "_generate_async", fake_generate)
+    assert asyncio.run(parse_plan_or_reask("prompt", truncated)) == PLAN
+    assert len(reasks) == 1 and "끊겨" in reasks[0][-1]["parts"][0]
+
+    # 다시 요청한 응답도 끊겼으면 실패로 끝나고 캐시에 저장되지 않음
+    async def always_truncated(contents, operation):
+        return truncated
+
+    stored = []
+    cache = PlanCacheService()
+    monkeypatch.setattr(plan, "_generate_async", always_truncated)
+    monkeypatch.setattr(cache, "_store", lambda *args: stored.append(args))
+    with pytest.raises(InvalidPlanResponse):
+        asyncio.run(cache.get_plan("부산", "5일", bypass=True))
+    assert stored == []
+    assert cache.memory.get(plan_fingerprint("부산", "5일")) is None
+
+
+def _sse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_resets_days_before_reasking(monkeypatch):
+    truncated = TEXT[:TEXT.index('"B"') + 2]
+
+    async def fake_stream(destination, schedule):
+        yield truncated
+
+    async def fake_generate(contents, operation):
+        return TEXT
+
+    async def no_store(*args):
+        pass
+
+    monkeypatch.setattr(plan_endpoint, "stream_travel_plan_text", fake_stream)
+    monkeypatch.setattr(plan, "_generate_async", fake_generate)
+    monkeypatch.setattr(plan_endpoint.plan_cache, "remember", no_store)
+
+    response = TestClient(app).post(
+        "/api/v1/plan/plan/stream?refresh=true", json={"destination": "서울", "schedule": "1박 2일"}
+    )
+    events = _sse_events(response.text)
+    # 끊긴 응답에서 나온 첫째 날 → reset → 다시 받은 계획의 day 전체 → done
+    assert [name for name, _ in events] == ["day", "reset", "day", "day", "done"]
+    assert [data for name, data in events[2:4]] == PLAN["plan"]
+    assert events[-1] == ("done", PLAN)
@@ -0,0 +1,14 @@
+import pytest
+
+from app.db.query_plan import check_query, hot_queries
+from app.db.session import engine
+
+HOT_QUERIES = hot_queries()
+
+
+@pytest.mark.parametrize("check", HOT_QUERIES, ids=[check.name for check in HOT_QUERIES])
+def test_hot_query_uses_expected_indexes(seeded_db, check):
+    with engine.connect() as conn:
+        problems, steps = check_query(conn, check)
+    assert steps, "EXPLAIN returned no plan steps"
+    assert not problems, "\n".join(problems + [f"{step['table']}: {step['detail']}" for step in steps])
@@ -0,0 +1,70 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.core.recommender import recommendation_engine
+from app.core.survey import build_profile, run_recommendation_sql
+from app.core.survey_model import QUESTION_TAG_MAP
+from tests.conftest import DELETED_IDS, TIED_IDS
+
+
+def _distinct_profiles(step: int = 8):
+    """설문 응답 전체 조합에서 나오는 서로 다른 프로필 중 step 개마다 하나 (SQL 쿼리 수를 줄이기 위해)"""
+    questions = sorted(QUESTION_TAG_MAP)
+    seen = {}
+    for choices in itertools.product(*(sorted(QUESTION_TAG_MAP[q]) for q in questions)):
+        profile = build_profile(dict(zip(questions, choices)))
+        seen.setdefault(tuple(sorted(profile.items())), profile)
+    return list(seen.values())[::step]
+
+
+PROFILES = _distinct_profiles()
+
+
+def _ranking(recs):
+    return [(rec["name"], rec["score"]) for rec in recs]
+
+
+@pytest.mark.parametrize("top_n", [3, 10, 100])
+def test_sql_and_memory_rankings_match(seeded_db, top_n):
+    for profile in PROFILES:
+        memory = recommendation_engine.recommend(profile, seeded_db, top_n)
+        sql = run_recommendation_sql(profile, seeded_db, top_n)
+        assert _ranking(sql) == _ranking(memory), profile
+
+
+def test_batch_rankings_match_across_chunks(seeded_db, monkeypatch):
+    matrix = recommendation_engine.get(seeded_db)
+    # 한 chunk 가 7행이 되도록 예산을 줄여 chunk 경계를 여러 번 지나가게 함
+    monkeypatch.setattr(settings, "RECOMMEND_CHUNK_BYTES", matrix.size * 13 * 7)
+    assert matrix.chunk_rows == 7
+    profiles = np.stack([matrix.profile_vector(profile) for profile in PROFILES[:50]])
+    batch = matrix.top_n_many(profiles, 10)
+    assert batch == [matrix.top_n(vec, 10) for vec in profiles]
+
+
+def test_rankings_exclude_soft_deleted(seeded_db):
+    deleted = {f"destination-{dest_id}" for dest_id in DELETED_IDS}
+    for profile in PROFILES:
+        for recs in (recommendation_engine.recommend(profile, seeded_db, 100),
+                     run_recommendation_sql(profile, seeded_db, 100)):
+            assert deleted.isdisjoint(rec["name"] for rec in recs)
+
+
+def test_ties_are_ordered_by_destination_id(seeded_db):
+    names = [rec["name"] for rec in run_recommendation_sql(PROFILES[0], seeded_db, 100)]
+    for group in TIED_IDS:
+        positions = [names.index(f"destination-{dest_id}") for dest_id in group]
+        assert positions == sorted(positions)
+        # 점수가 같은 여행지는 순위에서 연달아 나옴
+        assert positions == list(range(positions[0], positions[0] + len(group)))
+
+
+@pytest.mark.parametrize("near", [(35.0, 127.0, 30.0), (35.0, 127.0, 150.0), (36.5, 128.0, 500.0), (10.0, 10.0, 100.0)])
+def test_geo_filter_matches(seeded_db, near):
+    for profile in PROFILES[:100]:
+        memory = recommendation_engine.recommend(profile, seeded_db, 10, near)
+        sql = run_recommendation_sql(profile, seeded_db, 10, near)
+        assert _ranking(sql) == _ranking(memory), profile
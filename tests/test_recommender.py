@@ -0,0 +1,83 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.recommender import RecommendationEngine
+from app.core.warmup import Readiness, wait_until_ready
+from app.db.session import SessionLocal
+
+
+def _refresh_in_new_session(engine):
+    db = SessionLocal()
+    try:
+        engine.refresh(db)
+    finally:
+        db.close()
+
+
+def test_refresh_builds_outside_the_lock(seeded_db, monkeypatch):
+    engine = RecommendationEngine()
+    old = engine.load(seeded_db)
+    building, release = threading.Event(), threading.Event()
+    build = engine._build
+
+    def slow_build(db):
+        building.set()
+        release.wait(5)
+        return build(db)
+
+    monkeypatch.setattr(engine, "_build", slow_build)
+    thread = threading.Thread(target=_refresh_in_new_session, args=(engine,))
+    thread.start()
+    try:
+        assert building.wait(5)
+        # 다시 읽는 동안에도 기존 스냅샷을 바로 반환 (잠금에서 기다리지 않음)
+        assert engine.get(seeded_db) is old
+        assert engine._lock.acquire(timeout=1)
+        engine._lock.release()
+    finally:
+        release.set()
+        thread.join(5)
+    assert engine.get(seeded_db).version == old.version + 1
+
+
+def test_older_load_does_not_replace_newer_snapshot(seeded_db, monkeypatch):
+    engine = RecommendationEngine()
+    build = engine._build
+    newer = []
+    racing = threading.Event()
+
+    def build_then_race(db):
+        matrix = build(db)
+        if not racing.is_set():
+            # 이 로드가 끝나기 전에 나중에 시작한 로드가 먼저 교체
+            racing.set()
+            newer.append(engine.load(db))
+        return matrix
+
+    monkeypatch.setattr(engine, "_build", build_then_race)
+    assert engine.load(seeded_db) is newer[0]
+    assert engine.get(seeded_db) is newer[0]
+
+
+def test_wait_until_ready(monkeypatch):
+    state = Readiness()
+    monkeypatch.setattr("app.core.warmup.readiness", state)
+    monkeypatch.setattr("app.core.warmup.settings.WARMUP_WAIT_SECONDS", 0.05)
+
+    # 워밍업을 돌리지 않는 실행이면 바로 통과
+    asyncio.run(wait_until_ready())
+
+    state.warming = True
+
+    async def scenario():
+        with pytest.raises(HTTPException) as excinfo:
+            await wait_until_ready()
+        assert excinfo.value.status_code == 503
+        asyncio.get_running_loop().call_later(0.01, state.mark_ready)
+        await wait_until_ready()
+
+    asyncio.run(scenario())
+    assert state.ready